@@ -13,7 +13,7 @@ class Entity():
             root = os.getcwd()
             with open(os.path.join(root, 'minecorg.json'), 'r') as file:
                 data = json.load(file)
-                self.namespace = data.get('namespace', '')
+                self.namespace = data.get('mod', {}).get('namespace', data.get('namespace', ''))
             self.entity_id = f"{self.namespace}:{self.name}"
         except FileNotFoundError:
             raise FileNotFoundError("Initialization failed due to missing 'minecorg.json' file.")
@@ -1,16 +1,43 @@
 import click
-from pathlib import Path
-from .commands import create_mod
-from .commands import scan
-from .commands import entity
-from .commands import project
+import importlib
+
+
+class LazyGroup(click.Group):
+    """
+    Group that imports the module of a subcommand only when it is used.
+    Keeps shell completion and simple commands from importing every command module.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.lazy_commands = {}
+
+    def add_lazy_command(self, import_path: str, name: str):
+        """
+        Registers a subcommand by the import path of its click command.
+        Args:
+            import_path (str): '.module.attribute', relative to this package.
+            name (str): The name of the subcommand.
+        """
+        self.lazy_commands[name] = import_path
+
+    def list_commands(self, ctx):
+        return sorted(set(super().list_commands(ctx)) | self.lazy_commands.keys())
+
+    def get_command(self, ctx, name):
+        if name in self.lazy_commands and name not in self.commands:
+            module_name, attribute = self.lazy_commands[name].rsplit(".", 1)
+            module = importlib.import_module(module_name, __package__)
+            self.add_command(getattr(module, attribute), name)
+        return super().get_command(ctx, name)
+
 
 #Add groups
-@click.group()
+@click.group(cls=LazyGroup)
 def cli()->None:
     ...
 
-@click.group()
+@click.group(cls=LazyGroup)
 def new()->None:
     """
     Create new objects: Entities, Items and Blocks
@@ -18,23 +45,123 @@ def new()->None:
     ...
 
 
-@click.group()
+@click.group(cls=LazyGroup)
 def list()->None:
     """
     List entities, blocks and items in the project
     """
     ...
 
+@click.group(cls=LazyGroup)
+def lint()->None:
+    """
+    Check the project files for mistakes that are only caught in game
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def daemon()->None:
+    """
+    Keep the project loaded in a background process to answer commands faster
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def rename()->None:
+    """
+    Rename entities and every file and reference that belongs to them
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def remove()->None:
+    """
+    Remove entities and every file that belongs to them
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def analyze()->None:
+    """
+    Measure the runtime cost of the project assets
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def workspace()->None:
+    """
+    Run commands across every project of a workspace
+    """
+    ...
+
+@click.group(cls=LazyGroup)
+def textures()->None:
+    """
+    Keep the texture registries in sync
+    """
+    ...
+
 #cli Group
-cli.add_command(scan.scan)
-cli.add_command(project.init,"init")
+cli.add_lazy_command(".commands.scan.scan", "scan")
+cli.add_lazy_command(".commands.project.init", "init")
 cli.add_command(list,"list")
 cli.add_command(new)
+cli.add_lazy_command(".commands.addon.inspect", "inspect")
+cli.add_lazy_command(".commands.addon.diff", "diff")
+cli.add_command(lint)
+cli.add_command(daemon)
+cli.add_command(rename)
+cli.add_command(remove)
+cli.add_command(analyze)
+cli.add_command(workspace)
+cli.add_command(textures)
+cli.add_lazy_command(".commands.snapshot.snapshot", "snapshot")
+cli.add_lazy_command(".commands.snapshot.restore", "restore")
+cli.add_lazy_command(".commands.snapshot.undo", "undo")
+cli.add_lazy_command(".commands.validate.validate", "validate")
+cli.add_lazy_command(".commands.fingerprint.fingerprint", "fingerprint")
+cli.add_lazy_command(".commands.query.query", "query")
 
 #new Group
-new.add_command(entity.create,"entity")
+new.add_lazy_command(".commands.entity.create", "entity")
 
 
 #list Group
-list.add_command(project.listEntity,"entity")
-list.add_command(project.listBlock, "block")
\ No newline at end of file
+list.add_lazy_command(".commands.project.listEntity", "entity")
+list.add_lazy_command(".commands.project.listBlock", "block")
+
+
+#lint Group
+lint.add_lazy_command(".commands.lint.references", "refs")
+lint.add_lazy_command(".commands.lint.molang_expressions", "molang")
+
+
+#daemon Group
+daemon.add_lazy_command(".commands.daemon.start", "start")
+daemon.add_lazy_command(".commands.daemon.stop", "stop")
+daemon.add_lazy_command(".commands.daemon.status", "status")
+
+
+#rename Group
+rename.add_lazy_command(".commands.entity.rename", "entity")
+
+
+#remove Group
+remove.add_lazy_command(".commands.entity.remove", "entity")
+remove.add_lazy_command(".commands.entity.recover", "recover")
+
+
+#analyze Group
+analyze.add_lazy_command(".commands.analyze.models", "models")
+analyze.add_lazy_command(".commands.analyze.ticks", "ticks")
+
+
+#workspace Group
+workspace.add_lazy_command(".commands.workspace.projects", "projects")
+workspace.add_lazy_command(".commands.workspace.run", "run")
+workspace.add_lazy_command(".commands.workspace.build", "build")
+workspace.add_lazy_command(".commands.workspace.deploy", "deploy")
+
+
+#textures Group
+textures.add_lazy_command(".commands.textures.sync", "sync")
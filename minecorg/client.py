@@ -0,0 +1,102 @@
+"""
+Entry point of the 'minecorg' script.
+Forwards the command to the project daemon when one is running and runs it
+in process otherwise. Only the standard library is imported on the
+forwarding path, click and rich are loaded by the daemon once.
+"""
+import json
+import os
+import socket
+import sys
+
+STATE_FOLDER = ".minecorg"
+SOCKET_FILE = "daemon.sock"
+
+# Commands that prompt the user, manage the daemon itself or span several
+# projects always run in process
+LOCAL_COMMANDS = {"init", "new", "remove", "daemon", "workspace"}
+
+
+def find_project_root(start: str | None = None) -> str | None:
+    """
+    Returns the nearest folder holding minecorg.json or .minecorg, from start upward.
+    Args:
+        start (str | None): The folder to search from, defaults to the current directory.
+    Returns:
+        str | None: The project directory, None outside of a project.
+    """
+    folder = os.path.abspath(start or os.getcwd())
+    while True:
+        if os.path.isfile(os.path.join(folder, "minecorg.json")) or os.path.isdir(os.path.join(folder, STATE_FOLDER)):
+            return folder
+        parent = os.path.dirname(folder)
+        if parent == folder:
+            return None
+        folder = parent
+
+
+def socket_path(start: str | None = None) -> str | None:
+    """
+    Returns the daemon socket of the project around a folder, None outside of a project.
+    The path is relative to the current directory so deep project folders fit in sun_path.
+    """
+    root = find_project_root(start)
+    if root is None:
+        return None
+    return os.path.relpath(os.path.join(root, STATE_FOLDER, SOCKET_FILE))
+
+
+def forward(argv: list):
+    """
+    Sends a command to the daemon of the project around the current directory.
+    Args:
+        argv (list): The command line arguments, without the program name.
+    Returns:
+        int | None: The exit code of the command, or None if no daemon answered.
+    """
+    path = socket_path()
+    if not hasattr(socket, "AF_UNIX") or path is None or not os.path.exists(path):
+        return None
+    client = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        client.connect(path)
+    except OSError:
+        # Stale socket left by a daemon that is gone
+        client.close()
+        return None
+    try:
+        with client, client.makefile("rb") as stream:
+            # Relative paths on the command line are resolved from where the user is
+            request = {"argv": argv, "columns": _columns(), "cwd": os.getcwd()}
+            client.sendall(json.dumps(request).encode() + b"\n")
+            reply = json.loads(stream.readline())
+    except (OSError, ValueError) as e:
+        # The command may have run already, so it must not be run a second time
+        sys.stderr.write(f"Lost connection to the MINECORG daemon: {e}\n")
+        return 1
+    sys.stdout.write(reply.get("output", ""))
+    sys.stdout.flush()
+    return reply.get("exit_code", 0)
+
+
+def _columns() -> int:
+    try:
+        return os.get_terminal_size().columns
+    except OSError:
+        return 80
+
+
+def main():
+    argv = sys.argv[1:]
+    if argv and argv[0] not in LOCAL_COMMANDS and "_MINECORG_COMPLETE" not in os.environ:
+        exit_code = forward(argv)
+        if exit_code is not None:
+            sys.exit(exit_code)
+
+    from .cli import cli
+
+    cli(prog_name="minecorg")
+
+
+if __name__ == "__main__":
+    main()
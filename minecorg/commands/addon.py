@@ -0,0 +1,140 @@
+import click
+import json
+import zipfile
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from ..utils import archive
+
+console = Console()
+
+
+def open_or_abort(path: str):
+    """
+    Opens a built archive or a source directory, aborting on unreadable archives.
+    Args:
+        path (str): Path to an .mcaddon/.mcpack/.zip file or to a folder.
+    Returns:
+        The source opened with archive.open_source().
+    Raises:
+        click.Abort: If the file is not a valid zip archive.
+    """
+    try:
+        return archive.open_source(Path(path))
+    except zipfile.BadZipFile as e:
+        console.print(f"[bold red]Error: {path} is not a valid archive ({e}).[/bold red]")
+        raise click.Abort()
+
+
+@click.command()
+@click.argument("path", type=click.Path(exists=True))
+@click.option("--entries", is_flag=True, help="List every entry with its size and CRC")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+def inspect(path: str, entries: bool, as_json: bool):
+    """
+    Inspect a built add-on without extracting it.
+    """
+    with open_or_abort(path) as source:
+        summary = archive.summarize_source(source)
+        listing = []
+        if entries:
+            listing = [
+                {
+                    "file": key,
+                    "size": size,
+                    "compressed_size": source.compressed_size(key),
+                    "crc": f"{source.crc(key):08x}",
+                }
+                for key, size in sorted(source.entries().items())
+            ]
+
+    if as_json:
+        report = {"path": path, "packs": summary}
+        if entries:
+            report["entries"] = listing
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    table = Table(title=f"Packs in {path}")
+    table.add_column("Pack", style="cyan", no_wrap=True)
+    table.add_column("Name", style="bright_white")
+    table.add_column("Version")
+    table.add_column("Files", justify="right")
+    table.add_column("Size", justify="right")
+    table.add_column("Compressed", justify="right")
+    for label, pack in summary.items():
+        version = pack.get("version")
+        table.add_row(
+            label or "(root)",
+            str(pack.get("name") or ""),
+            ".".join(map(str, version)) if isinstance(version, list) else str(version or ""),
+            str(pack["files"]),
+            str(pack["size"]),
+            str(pack["compressed_size"]),
+        )
+    console.print(table)
+
+    if entries:
+        table = Table(title="Entries")
+        table.add_column("File", style="cyan")
+        table.add_column("Size", justify="right")
+        table.add_column("CRC", style="magenta")
+        for entry in listing:
+            table.add_row(entry["file"], str(entry["size"]), entry["crc"])
+        console.print(table)
+
+
+@click.command()
+@click.argument("old", type=click.Path(exists=True))
+@click.argument("new", type=click.Path(exists=True))
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+def diff(old: str, new: str, as_json: bool):
+    """
+    Compare two built add-ons, or a build and the source tree.
+    """
+    with open_or_abort(old) as old_source, open_or_abort(new) as new_source:
+        report = archive.diff_sources(old_source, new_source)
+    report = {"old": old, "new": new, **report}
+
+    if as_json:
+        click.echo(json.dumps(report, indent=2))
+        return
+
+    files = report["files"]
+    console.rule(f"[bold blue]{old} -> {new}[/bold blue]")
+    console.print(
+        f"[bold green]+{len(files['added'])}[/bold green] "
+        f"[bold red]-{len(files['removed'])}[/bold red] "
+        f"[bold yellow]~{len(files['changed'])}[/bold yellow] "
+        f"files, {files['unchanged']} unchanged"
+    )
+    for key in files["added"]:
+        console.print(f"[green]+ {key}[/green]")
+    for key in files["removed"]:
+        console.print(f"[red]- {key}[/red]")
+    for key in files["changed"]:
+        console.print(f"[yellow]~ {key}[/yellow]")
+
+    definitions = report["definitions"]
+    if not any(definitions.values()):
+        return
+    table = Table(title="Definitions")
+    table.add_column("Change", no_wrap=True)
+    table.add_column("Identifier", style="bright_white")
+    table.add_column("Details")
+    table.add_column("File", style="cyan")
+    for item in definitions["added"]:
+        table.add_row("[green]added[/green]", item["identifier"], "", item["file"])
+    for item in definitions["removed"]:
+        table.add_row("[red]removed[/red]", item["identifier"], "", item["file"])
+    for item in definitions["renamed"]:
+        table.add_row("[magenta]renamed[/magenta]", item["new"], f"was {item['old']}", item["file"])
+    for item in definitions["changed"]:
+        components = item["components"]
+        details = ", ".join(
+            [f"+{name}" for name in components["added"]]
+            + [f"-{name}" for name in components["removed"]]
+            + [f"~{name}" for name in components["changed"]]
+        )
+        table.add_row("[yellow]changed[/yellow]", item["identifier"], details, item["file"])
+    console.print(table)
@@ -0,0 +1,277 @@
+import click
+import functools
+import hashlib
+import json
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from . import project
+from ..utils import asset_index
+from ..utils import file_utils
+from ..utils import geometry
+from ..utils import json_handler
+from ..utils import state
+from ..utils import tick_cost
+from ..utils import workers
+
+console = Console()
+
+# Defaults for the 'budgets.models' section of minecorg.json
+DEFAULT_MODEL_BUDGETS = {
+    "bones": 64,
+    "cubes": 256,
+    "uv_faces": 1536,
+    "depth": 8,
+    "texture_pixels": 512 * 512,
+}
+
+# Defaults for the 'budgets.ticks' section of minecorg.json
+DEFAULT_TICK_BUDGETS = {
+    "score": 100,
+}
+
+MODEL_CACHE_VERSION = 1
+
+
+def analyze_model_file(file_path: str) -> dict:
+    """
+    Parses a .geo.json file and measures its geometries.
+    Runs on the worker processes.
+    Args:
+        file_path (str): The model file.
+    Returns:
+        dict: {"geometries": [...], "error": str | None}
+    """
+    try:
+        with open(file_path, "rb") as file:
+            data = json_handler.loads_lenient(file.read())
+        return {"geometries": geometry.geometry_metrics(data), "error": None}
+    except (OSError, ValueError) as e:
+        return {"geometries": [], "error": str(e)}
+
+
+def load_budgets(section: str, defaults: dict, overrides: dict) -> dict:
+    """
+    Merges the budgets of minecorg.json and of the command line over the defaults.
+    Args:
+        section (str): The key under 'budgets' in minecorg.json.
+        defaults (dict): The built-in budgets.
+        overrides (dict): Budgets given on the command line, None values are ignored.
+    Returns:
+        dict: The budgets to enforce.
+    """
+    budgets = dict(defaults)
+    budgets.update(project.load_config().get("budgets", {}).get(section, {}))
+    budgets.update({key: value for key, value in overrides.items() if value is not None})
+    return budgets
+
+
+def find_model_texture(assets, model_path: str) -> str | None:
+    """
+    Returns the texture named after a model, preferring the entity textures.
+    'models/entity/cow.geo.json' is textured by 'textures/entity/cow.png'.
+    """
+    stem = model_path.rsplit("/", 1)[-1].split(".", 1)[0]
+    textures = assets.find(stem, "texture")
+    folder = model_path.rsplit("/", 2)[-2] if model_path.count("/") >= 2 else ""
+    for texture in textures:
+        if f"/textures/{folder}/" in texture:
+            return texture
+    return textures[0] if textures else None
+
+
+@click.command()
+@click.option("--max-bones", type=int, help="Bone budget per geometry")
+@click.option("--max-cubes", type=int, help="Cube budget per geometry")
+@click.option("--max-uv-faces", type=int, help="UV mapped face budget per geometry")
+@click.option("--max-depth", type=int, help="Bone hierarchy depth budget")
+@click.option("--max-texture-pixels", type=int, help="Texture size budget, width x height")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def models(
+    ctx: click.Context,
+    max_bones: int | None,
+    max_cubes: int | None,
+    max_uv_faces: int | None,
+    max_depth: int | None,
+    max_texture_pixels: int | None,
+    as_json: bool,
+):
+    """
+    Report the cost of every .geo.json model and enforce budgets.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    budgets = load_budgets(
+        "models",
+        DEFAULT_MODEL_BUDGETS,
+        {
+            "bones": max_bones,
+            "cubes": max_cubes,
+            "uv_faces": max_uv_faces,
+            "depth": max_depth,
+            "texture_pixels": max_texture_pixels,
+        },
+    )
+    assets = asset_index.get_index(root)
+    model_files = [path for path in assets.files("model") if path.lower().endswith(".json")]
+
+    # Results are cached by content hash, only new or edited models are parsed
+    cache_path = state.state_path(root, "cache", "models.json")
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+        if cache.get("version") != MODEL_CACHE_VERSION:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    entries = cache.get("entries", {})
+
+    hashes = {}
+    for path in model_files:
+        with open(root / path, "rb") as file:
+            hashes[path] = hashlib.sha256(file.read()).hexdigest()
+    pending = [path for path in model_files if hashes[path] not in entries]
+    for path, result in zip(pending, workers.map_parallel(analyze_model_file, [str(root / p) for p in pending])):
+        entries[hashes[path]] = result
+    entries = {digest: entries[digest] for digest in set(hashes.values())}
+    state.write_atomic(cache_path, json.dumps({"version": MODEL_CACHE_VERSION, "entries": entries}))
+
+    report, errors = [], []
+    for path in model_files:
+        result = entries[hashes[path]]
+        if result["error"]:
+            errors.append({"file": path, "error": result["error"]})
+            continue
+        texture = find_model_texture(assets, path)
+        size = file_utils.image_size(root / texture) if texture else None
+        for metrics in result["geometries"]:
+            item = {"file": path, **metrics, "texture": texture, "texture_size": size, "warnings": []}
+            if size:
+                item["texture_pixels"] = size[0] * size[1]
+                declared = (metrics["texture_width"], metrics["texture_height"])
+                # A higher resolution texture is fine as long as the aspect ratio matches
+                if all(declared) and declared[0] * size[1] != declared[1] * size[0]:
+                    item["warnings"].append(
+                        f"texture is {size[0]}x{size[1]} but the model declares {declared[0]}x{declared[1]}"
+                    )
+            item["over_budget"] = {
+                metric: item[metric]
+                for metric, budget in budgets.items()
+                if budget is not None and item.get(metric) is not None and item[metric] > budget
+            }
+            report.append(item)
+
+    over_budget = [item for item in report if item["over_budget"]]
+    if as_json:
+        click.echo(json.dumps({"budgets": budgets, "models": report, "errors": errors}, indent=2))
+    else:
+        table = Table(title=f"Models ({len(report)} geometries)")
+        table.add_column("Geometry", style="bright_white")
+        table.add_column("Bones", justify="right")
+        table.add_column("Cubes", justify="right")
+        table.add_column("UV faces", justify="right")
+        table.add_column("Depth", justify="right")
+        table.add_column("Texture", justify="right")
+        table.add_column("File", style="cyan")
+
+        def cell(item, metric, text=None):
+            text = str(item.get(metric)) if text is None else text
+            return f"[bold red]{text}[/bold red]" if metric in item["over_budget"] else text
+
+        for item in sorted(report, key=lambda i: (not i["over_budget"], -i["cubes"])):
+            size = item["texture_size"]
+            table.add_row(
+                item["identifier"],
+                cell(item, "bones"),
+                cell(item, "cubes"),
+                cell(item, "uv_faces"),
+                cell(item, "depth"),
+                cell(item, "texture_pixels", f"{size[0]}x{size[1]}" if size else "-"),
+                item["file"],
+            )
+        console.print(table)
+        for item in report:
+            for warning in item["warnings"]:
+                console.print(f"[bold yellow]Warning: {item['identifier']}: {warning}[/bold yellow]")
+        for error in errors:
+            console.print(f"[bold red]Could not read {error['file']}: {error['error']}[/bold red]")
+        if over_budget:
+            console.print(f"[bold red]{len(over_budget)} geometries are over budget.[/bold red]")
+        else:
+            console.print("[bold green]Every model is within budget![/bold green]")
+
+    if over_budget or errors:
+        ctx.exit(1)
+
+
+@click.command()
+@click.option("--rules", "rules_path", type=click.Path(exists=True, dir_okay=False), help="Tick cost rule table to use")
+@click.option("--max-score", type=float, help="Tick cost budget per entity")
+@click.option("--top", type=int, default=20, show_default=True, help="Number of entities to list, 0 lists all")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def ticks(ctx: click.Context, rules_path: str | None, max_score: float | None, top: int, as_json: bool):
+    """
+    Rank the behavior entities by estimated server tick cost and enforce a budget.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    budgets = load_budgets("ticks", DEFAULT_TICK_BUDGETS, {"score": max_score})
+    # A rule table named in minecorg.json is relative to the project
+    configured = project.load_config().get("tick_rules")
+    if rules_path is None and configured:
+        rules_path = root / configured
+    try:
+        table = tick_cost.load_rules(rules_path)
+    except (OSError, ValueError) as e:
+        console.print(f"[bold red]Error: Could not load the tick cost rules: {e}[/bold red]")
+        raise click.Abort()
+
+    assets = asset_index.get_index(root)
+    entity_files = [path for path in assets.files("behavior_entity") if path.lower().endswith(".json")]
+    results = workers.map_parallel(
+        functools.partial(tick_cost.score_entity_file, table=table),
+        [str(root / path) for path in entity_files],
+    )
+
+    report, errors = [], []
+    for path, result in zip(entity_files, results):
+        if result["error"]:
+            errors.append({"file": path, "error": result["error"]})
+            continue
+        result = {"file": path, **result}
+        result["over_budget"] = budgets["score"] is not None and result["score"] > budgets["score"]
+        report.append(result)
+    report.sort(key=lambda item: -item["score"])
+    over_budget = [item for item in report if item["over_budget"]]
+
+    if as_json:
+        click.echo(json.dumps({"budgets": budgets, "entities": report, "errors": errors}, indent=2))
+    else:
+        shown = report[:top] if top else report
+        table_view = Table(title=f"Entity tick cost ({len(report)} entities)")
+        table_view.add_column("#", justify="right")
+        table_view.add_column("Entity", style="bright_white")
+        table_view.add_column("Score", justify="right")
+        table_view.add_column("Top components", style="yellow")
+        table_view.add_column("File", style="cyan")
+        for rank, item in enumerate(shown, start=1):
+            score = f"{item['score']:g}"
+            table_view.add_row(
+                str(rank),
+                item["identifier"] or "-",
+                f"[bold red]{score}[/bold red]" if item["over_budget"] else score,
+                ", ".join(f"{c['component'].removeprefix('minecraft:')} {c['cost']:g}" for c in item["components"][:3]),
+                item["file"],
+            )
+        console.print(table_view)
+        for error in errors:
+            console.print(f"[bold red]Could not read {error['file']}: {error['error']}[/bold red]")
+        if over_budget:
+            console.print(
+                f"[bold red]{len(over_budget)} entities are over the tick budget of {budgets['score']:g}.[/bold red]"
+            )
+        else:
+            console.print("[bold green]Every entity is within the tick budget![/bold green]")
+
+    if over_budget or errors:
+        ctx.exit(1)
@@ -0,0 +1,102 @@
+import click
+import json
+import socket
+import subprocess
+import sys
+import time
+from pathlib import Path
+from rich.console import Console
+from . import project
+from .. import client
+from .. import server
+from ..utils import state
+
+console = Console()
+
+
+def send(message: dict):
+    """
+    Sends a control message to the daemon of the project around the current directory.
+    Args:
+        message (dict): The message, such as {"ping": True} or {"stop": True}.
+    Returns:
+        dict | None: The reply, or None if no daemon is running.
+    """
+    path = client.socket_path()
+    if not hasattr(socket, "AF_UNIX") or path is None:
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as connection:
+            connection.connect(path)
+            connection.sendall(json.dumps(message).encode() + b"\n")
+            with connection.makefile("rb") as stream:
+                return json.loads(stream.readline())
+    except (OSError, ValueError):
+        return None
+
+
+@click.command()
+@click.option("--foreground", is_flag=True, help="Serve from this process instead of a background one")
+def start(foreground: bool):
+    """
+    Start the project daemon in the current directory.
+    """
+    if not hasattr(socket, "AF_UNIX"):
+        console.print("[bold red]Error: Unix domain sockets are not available on this system.[/bold red]")
+        raise click.Abort()
+    reply = send({"ping": True})
+    if reply is not None:
+        console.print(f"[bold yellow]Daemon already running (pid {reply.get('pid')})[/bold yellow]")
+        return
+
+    root = Path(project.PROJECT_DIRECTORY).resolve()
+    if foreground:
+        console.print(f"[bold green]Serving[/bold green] [bold white]{root}[/bold white]")
+        server.serve(root)
+        return
+
+    log_path = state.state_path(root, "daemon.log")
+    with open(log_path, "ab") as log:
+        subprocess.Popen(
+            [sys.executable, "-m", "minecorg.server", str(root)],
+            cwd=root,
+            stdin=subprocess.DEVNULL,
+            stdout=log,
+            stderr=log,
+            start_new_session=True,
+        )
+    # Wait for the socket so the next command is already forwarded
+    for _ in range(50):
+        reply = send({"ping": True})
+        if reply is not None:
+            console.print(f"[bold green]Daemon started[/bold green] (pid {reply.get('pid')})")
+            return
+        time.sleep(0.1)
+    console.print(f"[bold red]Error: Daemon did not start, see {log_path}[/bold red]")
+    raise click.Abort()
+
+
+@click.command()
+def stop():
+    """
+    Stop the project daemon.
+    """
+    if send({"stop": True}) is None:
+        console.print("[bold yellow]No daemon running[/bold yellow]")
+        return
+    console.print("[bold green]Daemon stopped[/bold green]")
+
+
+@click.command()
+def status():
+    """
+    Show whether the project daemon is running.
+    """
+    reply = send({"ping": True})
+    if reply is None:
+        console.print("[bold yellow]No daemon running[/bold yellow]")
+    else:
+        console.print(
+            f"[bold green]Daemon running[/bold green] (pid {reply.get('pid')}) "
+            f"for [bold white]{client.find_project_root()}[/bold white]"
+        )
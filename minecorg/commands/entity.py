@@ -1,21 +1,48 @@
 import click
+import fnmatch
+import hashlib
+import os
+import re
+from contextlib import ExitStack
 from pathlib import Path
 from ..utils import file_utils
 from . import project
+from . import validate
 from ..classes import entity as e
 import json
-from rich.console import Console
-from rich.table import Table
 from ..utils import json_handler
-
-console = Console()
+from ..utils import lang
+from ..utils.console import console
+from ..utils import completion
+from ..utils import asset_index
+from ..utils import jobs
+from ..utils import locks
+from ..utils import packs
+from ..utils import reference_index
+from ..utils import snapshot
+from ..utils import state
+from ..utils import transaction
 
 
 @click.command()
-def create():
+@click.option("--name", help="Name of the entity, skips the name prompt")
+@click.option(
+    "--model",
+    shell_complete=completion.complete("model"),
+    help="Model file already in the entity models folder, skips the model prompt",
+)
+@click.option(
+    "--texture",
+    shell_complete=completion.complete("texture"),
+    help="Texture file already in the entity textures folder, skips the texture prompt",
+)
+@click.pass_context
+def create(ctx: click.Context, name: str | None, model: str | None, texture: str | None):
     """
     Create a new entity.
     """
+    # Held shared for the whole wizard, a rename or remove can not move the files it picks
+    ctx.with_resource(locks.project_lock(project.PROJECT_DIRECTORY))
     console.rule("[bold blue]Entity Creation[/bold blue]")
     console.print("[bold green]Welcome to the Entity Creation Wizard![/bold green]")
     console.print(
@@ -24,7 +51,8 @@ def create():
     console.print("[bold yellow]Step 1:[/bold yellow] Enter the name of the entity.\n")
 
     ## Take Name
-    name = console.input("[bold blue]Name: [/bold blue]")
+    if name is None:
+        name = console.input("[bold blue]Name: [/bold blue]")
 
     ## Verify Name
     if name is (None or ""):
@@ -34,36 +62,65 @@ def create():
     ## Creating entity with the input name
     entity = e.Entity(name.lower().replace(" ", "_"))
 
-    ## Request the Model
-    console.print("\n[bold yellow]Step 2:[/bold yellow] Add entity model file.\n")
-    model_root = Path(f"{project.PROJECT_DIRECTORY}/resource_packs/models/entity")
-    model_file_name = file_utils.file_request(model_root, "model file")
-    entity_model_request(entity=entity, folder=model_root, file_name=model_file_name)
-
-    ## Request the Texture
-    console.print("\n[bold yellow]Step 3:[/bold yellow] Add entity texture file.\n")
-    texture_root = Path(f"{project.PROJECT_DIRECTORY}/resource_packs/textures/entity")
-    texture_file_name = file_utils.file_request(texture_root, "texture file")
-    entity_texture_request(
-        entity=entity, folder=texture_root, file_name=texture_file_name
-    )
+    # Every file the wizard renames, rewrites or creates can be put back with 'minecorg undo'
+    with snapshot.Snapshot(project.PROJECT_DIRECTORY, f"new entity {entity.name}") as snap:
+        ## Request the Model
+        console.print("\n[bold yellow]Step 2:[/bold yellow] Add entity model file.\n")
+        model_root = Path(f"{project.PROJECT_DIRECTORY}/resource_packs/models/entity")
+        model_file_name = model or file_utils.file_request(model_root, "model file")
+        snap.record(model_root / model_file_name, model_root / f"{entity.name}.geo.json")
+        entity_model_request(entity=entity, folder=model_root, file_name=model_file_name)
+
+        ## Request the Texture
+        console.print("\n[bold yellow]Step 3:[/bold yellow] Add entity texture file.\n")
+        texture_root = Path(f"{project.PROJECT_DIRECTORY}/resource_packs/textures/entity")
+        texture_file_name = texture or file_utils.file_request(texture_root, "texture file")
+        snap.record(texture_root / texture_file_name, texture_root / f"{entity.name}.png")
+        entity_texture_request(
+            entity=entity, folder=texture_root, file_name=texture_file_name
+        )
 
-    ## Create the RenderController
-    console.print(
-        "\n[bold yellow]Step 4:[/bold yellow] Creating entity render controller.\n"
-    )
-    entity_render_control(entity)
-    ## Create the Entity RP
-    console.print(
-        "\n[bold yellow]Step 5:[/bold yellow] Creating entity resource pack file.\n"
-    )
-    entity_resource_pack(entity=entity)
+        ## Create the RenderController
+        console.print(
+            "\n[bold yellow]Step 4:[/bold yellow] Creating entity render controller.\n"
+        )
+        snap.record(
+            f"resource_packs/render_controllers/{entity.name}.render_controller.json",
+            f"resource_packs/entity/{entity.name}.entity.json",
+            f"behavior_packs/entities/{entity.name}.json",
+        )
+        entity_render_control(entity)
+        ## Create the Entity RP
+        console.print(
+            "\n[bold yellow]Step 5:[/bold yellow] Creating entity resource pack file.\n"
+        )
+        entity_resource_pack(entity=entity)
 
-    ## Create the Entity BP
-    console.print(
-        "\n[bold yellow]Step 6:[/bold yellow] Creating entity behavior pack file.\n"
+        ## Create the Entity BP
+        console.print(
+            "\n[bold yellow]Step 6:[/bold yellow] Creating entity behavior pack file.\n"
+        )
+        entity_behavior_pack(entity)
+
+        ## Add the names to the language files
+        languages = lang.LangManager(project.PROJECT_DIRECTORY, project.MOD_NAME)
+        namespace = entity_namespace(
+            Path(project.PROJECT_DIRECTORY),
+            [f"behavior_packs/entities/{entity.name}.json", f"resource_packs/entity/{entity.name}.entity.json"],
+        )
+        languages.add_entity(namespace, entity.name)
+        snap.record(*languages.changed_paths())
+        for path in languages.commit():
+            console.print(f"[bold green]Names added to:[/bold green][bold white]{path}[/bold white]")
+    validate.warn_schema_errors(
+        project.PROJECT_DIRECTORY,
+        [
+            f"resource_packs/models/entity/{entity.name}.geo.json",
+            f"resource_packs/render_controllers/{entity.name}.render_controller.json",
+            f"resource_packs/entity/{entity.name}.entity.json",
+            f"behavior_packs/entities/{entity.name}.json",
+        ],
     )
-    entity_behavior_pack(entity)
     click.echo("Entity Created")
 
 
@@ -79,8 +136,7 @@ def entity_behavior_pack(entity: e.Entity):
     entity_data = json_handler.rename_values_from_json_data(
         entity_data, old_values=old_values, new_values=new_values
     )
-    with open(entity_behavior_pack, "w") as file:
-        json.dump(entity_data, file, indent=2)
+    locks.write_locked(project.PROJECT_DIRECTORY, entity_behavior_pack, json.dumps(entity_data, indent=2))
     console.print(
         f"[bold green]Behavior created at:[/bold green][bold white]{entity_behavior_pack}[/bold white]"
     )
@@ -113,8 +169,7 @@ def entity_resource_pack(entity: e.Entity):
     entity_data = json_handler.rename_values_from_json_data(
         entity_data, old_values=old_values, new_values=new_values
     )
-    with open(entity_resource_path, "w") as file:
-        json.dump(entity_data, file, indent=2)
+    locks.write_locked(project.PROJECT_DIRECTORY, entity_resource_path, json.dumps(entity_data, indent=2))
     console.print(
         f"[bold green]Resource created at:[/bold green][bold white]{entity_resource_path}[/bold white]"
     )
@@ -145,8 +200,9 @@ def entity_render_control(entity: e.Entity):
         )
 
         # Write the updated data to the new render controller file
-        with open(render_controller_path, "w") as file:
-            json.dump(render_controller_data, file, indent=2)
+        locks.write_locked(
+            project.PROJECT_DIRECTORY, render_controller_path, json.dumps(render_controller_data, indent=2)
+        )
         console.print(
             f"[bold green]Render controller created at:[/bold green][bold white]{render_controller_path}[/bold white]"
         )
@@ -195,23 +251,24 @@ def update_geo_json_identifier_component(file_path: Path, entity_name: str):
         entity_name (str): Name of the entity to set as the identifier.
     """
     try:
-        # Load the JSON file
-        with open(file_path, "r") as file:
-            data = json.load(file)
-
-        identifier_update = False
-        # Update the identifier
-        for geometry in data.get("minecraft:geometry", []):
-            if "description" in geometry and "identifier" in geometry["description"]:
-                geometry["description"]["identifier"] = f"geometry.{entity_name}"
-                identifier_update = True
-        if not identifier_update:
-            console.print("[bold red]Json file structure not recognized[/bold red]")
-            raise click.Abort()
-
-        # Save the updated JSON back to the file
-        with open(file_path, "w") as file:
-            json.dump(data, file, indent=2)
+        # Locked from the read to the write, so a concurrent edit of the model is not lost
+        with locks.asset_lock(project.PROJECT_DIRECTORY, file_path):
+            # Load the JSON file
+            with open(file_path, "r") as file:
+                data = json.load(file)
+
+            identifier_update = False
+            # Update the identifier
+            for geometry in data.get("minecraft:geometry", []):
+                if "description" in geometry and "identifier" in geometry["description"]:
+                    geometry["description"]["identifier"] = f"geometry.{entity_name}"
+                    identifier_update = True
+            if not identifier_update:
+                console.print("[bold red]Json file structure not recognized[/bold red]")
+                raise click.Abort()
+
+            # Save the updated JSON back to the file
+            state.write_atomic(file_path, json.dumps(data, indent=2))
 
         console.print(
             f"\n[bold blue]Updated identifier to: [/bold blue][bold white]geometry.{entity_name}[/bold white]"
@@ -235,16 +292,20 @@ def update_file_name(file_path: Path, new_name: str):
     """
 
     old_name = file_path.name
+    new_file_path = file_path.with_name(new_name)
     try:
-        if file_path.exists():
-            new_file_path = file_path.with_name(new_name)
-            file_path.rename(new_file_path)
-            console.print(
-                f"[bold blue]Renamed file[/bold blue] to:[bold white] {new_file_path.name}[/bold white]  "
-            )
-        else:
-            console.print("[bold red]Error: Added file not found.[/bold red]")
-            raise click.Abort()
+        with ExitStack() as stack:
+            # Both names are locked, in a fixed order so two renames can not wait on each other
+            for path in sorted({str(file_path), str(new_file_path)}):
+                stack.enter_context(locks.asset_lock(project.PROJECT_DIRECTORY, path))
+            if file_path.exists():
+                file_path.rename(new_file_path)
+                console.print(
+                    f"[bold blue]Renamed file[/bold blue] to:[bold white] {new_file_path.name}[/bold white]  "
+                )
+            else:
+                console.print("[bold red]Error: Added file not found.[/bold red]")
+                raise click.Abort()
     except FileNotFoundError:
         console.print(f"[bold red]Error: File {old_name} not found.[/bold red]")
         raise click.Abort()
@@ -326,11 +387,430 @@ def list(
         click.echo(click.style("Quick! Call the Minecraft engineers!", fg="bright_red"))
 
 
-def remove():
+# Kinds of the files that belong to one entity and are named after it
+ENTITY_FILE_KINDS = (
+    "behavior_entity",
+    "client_entity",
+    "render_controller",
+    "model",
+    "texture",
+    "animation",
+    "animation_controller",
+)
+
+
+# Journal of the rename jobs, one rename can be pending at a time
+RENAME_JOB = "rename-entity"
+
+
+def parse_entity_name(value: str) -> tuple:
     """
-    Remove an existing entity.
+    Splits 'namespace:name' or 'name' into its parts.
+    Args:
+        value (str): The entity name, with or without namespace.
+    Returns:
+        tuple: (namespace, name), the namespace is empty when the value has none.
     """
-    ...
+    namespace, _, name = value.rpartition(":")
+    return namespace.strip(), name.lower().replace(" ", "_")
+
+
+def entity_namespace(root: Path, paths) -> str:
+    """
+    Returns the namespace of the identifier an entity's behavior or resource file defines.
+    Args:
+        root (Path): The project directory.
+        paths: Files of the entity, relative to the project root.
+    Returns:
+        str: The namespace, or the project namespace when no file defines one,
+             empty when minecorg.json has none either.
+    """
+    for path in paths:
+        if packs.classify(path) not in ("behavior_entity", "client_entity"):
+            continue
+        try:
+            with open(root / path, "rb") as file:
+                data = json_handler.loads_lenient(file.read())
+        except (OSError, ValueError):
+            continue
+        for identifier in packs.definitions(data):
+            namespace, separator, _ = identifier.partition(":")
+            if separator and namespace:
+                return namespace
+    return str(project.NAMESPACE or "").strip()
+
+
+def entity_owned_files(assets, name: str) -> list:
+    """
+    Returns the files named after an entity: behavior, resource, render
+    controller, model, animations and texture.
+    Args:
+        assets (asset_index.AssetIndex): The project asset index.
+        name (str): The entity name, without namespace.
+    Returns:
+        list: Paths relative to the project root.
+    """
+    owned = []
+    for path in assets.find(name):
+        kind = packs.classify(path)
+        if kind not in ENTITY_FILE_KINDS:
+            continue
+        # Block and item models/textures can share the name of an entity
+        if kind in ("model", "texture") and "/entity/" not in path:
+            continue
+        owned.append(path)
+    return owned
+
+
+def rename_entity_references(text: str, renames: dict) -> tuple:
+    """
+    Rewrites every string of a JSON text that refers to a renamed entity.
+    Covers the identifier, 'geometry.<name>', 'controller.render.<name>',
+    'textures/entity/<name>', 'animation.<name>.*' and
+    'controller.animation.<name>.*'. Formatting and comments are preserved.
+    Args:
+        text (str): The content of a JSON file.
+        renames (dict): Maps old name to (old namespace, new namespace, new name).
+    Returns:
+        tuple: (new text, number of replacements)
+    """
+    names = "|".join(sorted(map(re.escape, renames), key=len, reverse=True))
+    pattern = re.compile(
+        rf'(?<=")(?:(?P<namespace>[\w.\-]+):(?P<identifier>{names})(?=")'
+        rf'|(?P<prefix>geometry\.|controller\.render\.|textures/entity/)(?P<name>{names})(?=")'
+        rf'|(?P<scope>animation\.|controller\.animation\.)(?P<scoped>{names})(?=\.))'
+    )
+
+    count = 0
+
+    def replace(match):
+        nonlocal count
+        if match.group("identifier"):
+            old_namespace, new_namespace, new_name = renames[match.group("identifier")]
+            # Same name in another namespace, such as a vanilla mob
+            if match.group("namespace") != old_namespace:
+                return match.group(0)
+            count += 1
+            return f"{new_namespace}:{new_name}"
+        count += 1
+        if match.group("name"):
+            return match.group("prefix") + renames[match.group("name")][2]
+        return match.group("scope") + renames[match.group("scoped")][2]
+
+    text = pattern.sub(replace, text)
+    return text, count
+
+
+def rewrite_entity_references(file_path: Path, renames: dict) -> int:
+    """
+    Applies rename_entity_references() to a file, replacing it atomically.
+    Args:
+        file_path (Path): The JSON file to rewrite.
+        renames (dict): Maps old name to (old namespace, new namespace, new name).
+    Returns:
+        int: The number of replacements, the file is untouched when 0.
+    """
+    with open(file_path, "r", encoding="utf-8") as file:
+        text = file.read()
+    text, count = rename_entity_references(text, renames)
+    if count:
+        state.write_atomic(file_path, text)
+    return count
+
+
+def plan_entity_renames(root: Path, pairs: list) -> tuple:
+    """
+    Resolves the namespaces, file moves and referencing files of a rename.
+    Args:
+        root (Path): The project directory.
+        pairs (list): (old, new) entity names, with or without namespace.
+    Returns:
+        tuple: (renames, file moves, affected files). renames maps each old name to
+               (old namespace, new namespace, new name), file moves are
+               (source, target) pairs and affected files reference an old name.
+    Raises:
+        click.Abort: If an entity is missing, renamed twice, has no known
+        namespace, or a move would overwrite a file.
+    """
+    assets = asset_index.get_index(root)
+    renames, file_moves = {}, []
+    for old_value, new_value in pairs:
+        old_namespace, old_name = parse_entity_name(old_value)
+        new_namespace, new_name = parse_entity_name(new_value)
+        if old_name in renames:
+            console.print(f"[bold red]Error: {old_name} is renamed twice.[/bold red]")
+            raise click.Abort()
+        owned = entity_owned_files(assets, old_name)
+        if not owned:
+            console.print(f"[bold red]Error: Entity {old_name} not found.[/bold red]")
+            raise click.Abort()
+        # The identifier in the entity's own files wins over the project namespace
+        old_namespace = old_namespace or entity_namespace(root, owned)
+        if not old_namespace:
+            console.print(
+                f"[bold red]Error: The namespace of {old_name} is unknown, its files define no "
+                f"'namespace:name' identifier and minecorg.json has none. Give it as namespace:{old_name}.[/bold red]"
+            )
+            raise click.Abort()
+        renames[old_name] = (old_namespace, new_namespace or old_namespace, new_name)
+        for path in owned:
+            file_name = path.rsplit("/", 1)[-1]
+            target = path[: -len(file_name)] + new_name + file_name[len(old_name) :]
+            file_moves.append((path, target))
+
+    targets = [target for _, target in file_moves]
+    sources = {source for source, _ in file_moves}
+    conflicts = [t for t in targets if (root / t).exists() and t not in sources]
+    if conflicts or len(set(targets)) != len(targets):
+        console.print("[bold red]Error: Renaming would overwrite existing files:[/bold red]")
+        for conflict in conflicts or targets:
+            console.print(f"  {conflict}")
+        raise click.Abort()
+
+    references = reference_index.get_index(root)
+    affected = sorted({path for name in renames for path in references.files_referencing(name)})
+    return renames, file_moves, affected
+
+
+@click.command()
+@click.argument("old", required=False, shell_complete=completion.complete("entity"))
+@click.argument("new", required=False)
+@click.option("--batch", type=click.File("r"), help="File with one 'old new' pair per line")
+@click.option("--dry-run", is_flag=True, help="Show what would change without writing anything")
+@click.option("--resume", is_flag=True, help="Finish the rename that was interrupted")
+@click.option("--discard", is_flag=True, help="Drop the record of an interrupted rename and run this one")
+@click.pass_context
+def rename(
+    ctx: click.Context, old: str | None, new: str | None, batch, dry_run: bool, resume: bool, discard: bool
+):
+    """
+    Rename an entity, its files and every reference to it.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    # Held until the command ends, the plan must not go stale before it is carried out
+    ctx.with_resource(locks.project_lock(root, exclusive=not dry_run))
+    pending = jobs.pending_job(root, RENAME_JOB)
+    pairs = []
+    if resume:
+        details = pending.get("details") if pending else None
+        if not isinstance(details, dict) or not details.get("pairs"):
+            console.print("[bold red]Error: There is no interrupted rename to resume.[/bold red]")
+            raise click.Abort()
+        pairs = [tuple(pair) for pair in details["pairs"]]
+    elif old and new:
+        pairs.append((old, new))
+    elif old or new:
+        console.print("[bold red]Error: Give both the old and the new name.[/bold red]")
+        raise click.Abort()
+    if batch is not None and not resume:
+        for line in batch:
+            if line.strip() and not line.lstrip().startswith("#"):
+                pairs.append(tuple(line.split()[:2]))
+    if not pairs:
+        console.print("[bold red]Error: Nothing to rename.[/bold red]")
+        raise click.Abort()
+
+    plan = hashlib.sha256(json.dumps(pairs).encode()).hexdigest()
+    if pending and pending["done"] and pending.get("plan") != plan and not discard:
+        # Refused before planning, the pending rename may have moved the files this one looks for
+        abort_pending_rename(jobs.PendingJobError(pending, pending["done"]))
+    stored = pending.get("details") if pending and pending.get("plan") == plan and pending["done"] else None
+    if isinstance(stored, dict) and "renames" in stored:
+        # The first attempt already rewrote part of the tree, its plan can not be derived again
+        renames = {old_name: tuple(rename) for old_name, rename in stored["renames"].items()}
+        file_moves = [tuple(move) for move in stored["file_moves"]]
+        affected = stored["affected"]
+    else:
+        renames, file_moves, affected = plan_entity_renames(root, pairs)
+    sources = {source for source, _ in file_moves}
+    targets = [target for _, target in file_moves]
+
+    languages = lang.LangManager(root, project.MOD_NAME)
+    for old_name, (old_namespace, new_namespace, new_name) in renames.items():
+        languages.rename_entity(old_namespace, old_name, new_namespace, new_name)
+
+    if dry_run:
+        for path in affected:
+            with open(root / path, "r", encoding="utf-8") as file:
+                _, count = rename_entity_references(file.read(), renames)
+            if count:
+                console.print(f"[bold yellow]~[/bold yellow] {path} ({count} references)")
+        for path in languages.changed_paths():
+            console.print(f"[bold yellow]~[/bold yellow] {path.relative_to(root)} (names)")
+        for source, target in file_moves:
+            console.print(f"[bold blue]>[/bold blue] {source} -> {target}")
+        console.print("[bold purple]Dry run, nothing was written.[/bold purple]")
+        return
+
+    label = f"rename entity {' '.join(f'{o}->{n}' for o, n in pairs)}"
+    details = {"pairs": pairs, "renames": renames, "file_moves": file_moves, "affected": affected}
+    try:
+        with jobs.Job(root, RENAME_JOB, plan=plan, label=label, details=details, discard=discard) as job:
+            if job.resumed:
+                console.print(f"[bold yellow]Resuming the interrupted rename, {len(job.done)} steps were done.[/bold yellow]")
+            else:
+                # A resumed rename keeps the snapshot of the first attempt, taken before anything changed
+                taken = snapshot.Snapshot(root, label)
+                taken.record(*affected, *sources, *targets, *languages.changed_paths())
+                taken.save()
+
+            # Rewrite the contents first, while every file is still at its old path
+            counts = job.run(
+                affected,
+                lambda path: rewrite_entity_references(root / path, renames),
+                key=lambda path: f"rewrite {path}",
+                label="Rewriting references",
+            )
+            job.run(
+                file_moves,
+                lambda move: move_file(root, *move),
+                key=lambda move: f"move {move[0]}",
+                label="Moving files",
+            )
+    except jobs.PendingJobError as error:
+        abort_pending_rename(error)
+    except jobs.JobError as error:
+        console.print(f"[bold red]Error: {error}. Run the same rename again to finish it.[/bold red]")
+        raise click.Abort()
+    counts = {path.removeprefix("rewrite "): count for path, count in counts.items()}
+
+    for path in languages.commit():
+        console.print(f"[bold green]Updated[/bold green] {path.relative_to(root)} (names)")
+    for path, count in counts.items():
+        if count:
+            console.print(f"[bold green]Updated[/bold green] {path} ({count} references)")
+    for source, target in file_moves:
+        console.print(f"[bold blue]Renamed[/bold blue] {source} -> [bold white]{target}[/bold white]")
+    console.print(f"[bold green]Renamed {len(renames)} entities.[/bold green]")
+
+
+def abort_pending_rename(error: jobs.PendingJobError):
+    """Explains how to finish or drop an interrupted rename and aborts the command."""
+    console.print(
+        f"[bold red]Error: {error}. Run 'minecorg rename entity --resume' to finish it, "
+        "or add --discard to drop it and run this rename.[/bold red]"
+    )
+    raise click.Abort()
+
+
+def move_file(root: Path, source: str, target: str):
+    """Moves a file inside the project, a move that already happened is not an error."""
+    if not (root / source).exists() and (root / target).exists():
+        return
+    os.replace(root / source, root / target)
+
+
+def entity_names(assets) -> list:
+    """
+    Returns the names of every entity with a behavior or resource file.
+    Args:
+        assets (asset_index.AssetIndex): The project asset index.
+    Returns:
+        list: The sorted entity names.
+    """
+    names = set()
+    for kind in ("behavior_entity", "client_entity"):
+        for path in assets.files(kind):
+            names.add(path.rsplit("/", 1)[-1].split(".", 1)[0])
+    return sorted(names)
+
+
+@click.command()
+@click.argument("names", nargs=-1, shell_complete=completion.complete("entity"))
+@click.option("--batch", type=click.File("r"), help="File with one entity name or glob per line")
+@click.option("--dry-run", is_flag=True, help="Show what would be deleted without deleting anything")
+@click.option("--yes", is_flag=True, help="Do not ask for confirmation")
+@click.pass_context
+def remove(ctx: click.Context, names: tuple, batch, dry_run: bool, yes: bool):
+    """
+    Remove entities and every file that belongs to them.
+    Names can be globs, such as 'zombie_*'.
+    """
+    patterns = [name for name in names]
+    if batch is not None:
+        patterns += [line.strip() for line in batch if line.strip() and not line.lstrip().startswith("#")]
+    if not patterns:
+        console.print("[bold red]Error: Nothing to remove.[/bold red]")
+        raise click.Abort()
+
+    root = Path(project.PROJECT_DIRECTORY)
+    ctx.with_resource(locks.project_lock(root, exclusive=not dry_run))
+    assets = asset_index.get_index(root)
+    known = entity_names(assets)
+    selected = set()
+    for pattern in patterns:
+        _, pattern = parse_entity_name(pattern)
+        matches = fnmatch.filter(known, pattern)
+        if not matches:
+            console.print(f"[bold red]Error: No entity matches {pattern}.[/bold red]")
+            raise click.Abort()
+        selected.update(matches)
+
+    owned = {name: entity_owned_files(assets, name) for name in sorted(selected)}
+    paths = [path for files in owned.values() for path in files]
+
+    # References left behind in entities that are not removed
+    references = reference_index.get_index(root)
+    dangling = sorted(
+        {
+            path
+            for name in selected
+            for path in references.files_referencing(name)
+            if path not in paths
+        }
+    )
+
+    for name, files in owned.items():
+        console.print(f"[bold red]-[/bold red] [bold white]{name}[/bold white] ({len(files)} files)")
+        for path in files:
+            console.print(f"    {path}")
+    for path in dangling:
+        console.print(f"[bold yellow]Warning: {path} still refers to a removed entity.[/bold yellow]")
+    if dry_run:
+        console.print("[bold purple]Dry run, nothing was deleted.[/bold purple]")
+        return
+    if not yes and not click.confirm(f"Delete {len(paths)} files of {len(owned)} entities?"):
+        raise click.Abort()
+
+    languages = lang.LangManager(root, project.MOD_NAME)
+    for name, files in owned.items():
+        # The lang keys use the namespace of the entity's identifier, not necessarily the project's
+        languages.remove_entity(entity_namespace(root, files), name)
+
+    taken = snapshot.Snapshot(root, f"remove entity {' '.join(patterns)}")
+
+    def keep(moved: dict):
+        # Only once the delete committed: the moved files never come back, so they can be hardlinked
+        try:
+            taken.record_deleted(moved)
+            taken.record(*languages.changed_paths())
+            taken.save()
+        except OSError as e:
+            console.print(f"[bold yellow]Warning: No snapshot was saved, 'undo' can not bring them back: {e}[/bold yellow]")
+
+    try:
+        transaction.DeleteTransaction(root, paths, label=f"remove entity {' '.join(patterns)}").run(committed=keep)
+    except OSError as e:
+        console.print(f"[bold red]Error: {e}\nNothing was deleted.[/bold red]")
+        raise click.Abort()
+    languages.commit()
+    console.print(f"[bold green]Removed {len(owned)} entities ({len(paths)} files).[/bold green]")
+
+
+@click.command()
+@click.pass_context
+def recover(ctx: click.Context):
+    """
+    Finish or roll back removals interrupted by a crash.
+    """
+    ctx.with_resource(locks.project_lock(project.PROJECT_DIRECTORY, exclusive=True))
+    results = transaction.recover(Path(project.PROJECT_DIRECTORY))
+    if not results:
+        console.print("[bold green]Nothing to recover.[/bold green]")
+    for transaction_id, action, restored in results:
+        console.print(f"[bold blue]{transaction_id}[/bold blue] {action}")
+        for path in restored:
+            console.print(f"    {path}")
 
 
 def scan():
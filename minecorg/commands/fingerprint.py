@@ -0,0 +1,73 @@
+import click
+import json
+from pathlib import Path
+from . import project
+from ..utils import fingerprint as fingerprints
+from ..utils import locks
+from ..utils import state
+from ..utils.console import console
+
+STATUS_STYLES = {"added": "green", "removed": "red", "changed": "yellow"}
+
+
+@click.command()
+@click.option(
+    "--since",
+    metavar="FINGERPRINT",
+    help="List what changed since an earlier fingerprint, stored in this project or exported to a file",
+)
+@click.option(
+    "--export",
+    "export_path",
+    type=click.Path(dir_okay=False, writable=True),
+    help="Write the tree to a file, to diff against it on another machine",
+)
+@click.option("-q", "--quiet", is_flag=True, help="Only print the root hash, for use as a cache key")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def fingerprint(ctx: click.Context, since: str | None, export_path: str | None, quiet: bool, as_json: bool):
+    """
+    Print a hash of the packs and scripts that changes whenever any of their files does.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    ctx.with_resource(locks.project_lock(root))
+    tree = fingerprints.build_tree(root)
+    previous = None
+    if since == tree["hash"]:
+        # An unchanged tree needs nothing stored, a CI cache key matching it is enough
+        previous = tree
+    elif since:
+        try:
+            previous = fingerprints.load_tree(root, since)
+        except ValueError as e:
+            console.print(f"[bold red]Error: {e}[/bold red]")
+            raise click.Abort()
+    fingerprints.save_tree(root, tree)
+    if export_path:
+        state.write_atomic(Path(export_path), json.dumps(tree))
+    subtrees = fingerprints.subtree_hashes(tree)
+    changes = fingerprints.diff_trees(previous, tree) if previous else None
+
+    if as_json:
+        report = {"fingerprint": tree["hash"], "subtrees": subtrees}
+        if changes is not None:
+            report["since"] = previous["hash"]
+            report["changes"] = [{"status": status, "path": path} for status, path in changes]
+        click.echo(json.dumps(report, indent=2))
+        return
+    if quiet:
+        click.echo(tree["hash"])
+        return
+
+    console.print(f"[bold blue]{tree['hash']}[/bold blue]")
+    for name, subtree_hash in subtrees.items():
+        console.print(f"  {subtree_hash[:16]}  {name}")
+    if changes is None:
+        return
+    if not changes:
+        console.print(f"[bold green]Nothing changed since {previous['hash'][:16]}.[/bold green]")
+        return
+    console.print(f"[bold]{len(changes)} changes since {previous['hash'][:16]}:[/bold]")
+    for status, path in changes:
+        style = STATUS_STYLES[status]
+        console.print(f"  [{style}]{status:<8}[/{style}] {path}")
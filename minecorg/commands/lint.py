@@ -0,0 +1,303 @@
+import click
+import functools
+import json
+from pathlib import Path
+from rich.console import Console
+from rich.table import Table
+from ..utils import json_handler
+from ..utils import molang
+from ..utils import packs
+from ..utils import vanilla
+from ..utils import workers
+
+console = Console()
+
+VANILLA_PREFIX = "minecraft:"
+
+# Files whose 'minecraft:' references are checked, the bundled index only
+# covers the entity vocabulary, blocks, items and spawn rules would all be unknown
+REFERENCE_KINDS = ("behavior_entity", "client_entity")
+
+# Files that carry Molang expressions
+MOLANG_KINDS = ("client_entity", "render_controller", "animation", "animation_controller")
+
+# Cost above which a per frame expression is reported, see molang.analyze()
+DEFAULT_MOLANG_MAX_COST = 60
+
+
+def split_reference(value: str):
+    """
+    Splits a reference into the identifiers it names.
+    'minecraft:zombie<minecraft:entity_born>' names an entity and a spawn
+    event, and 'minecraft:log[...]' carries block states after the identifier.
+    Args:
+        value (str): A JSON string starting with 'minecraft:'.
+    Returns:
+        list: The identifiers named by the string.
+    """
+    identifier, _, event = value.partition("<")
+    identifiers = [identifier.split("[", 1)[0].strip()]
+    event = event.rstrip(">").strip()
+    if event.startswith(VANILLA_PREFIX):
+        identifiers.append(event)
+    return identifiers
+
+
+def find_references(data, path: str = "$"):
+    """
+    Recursively finds every key and string value that references a vanilla identifier.
+    Args:
+        data: The parsed JSON document.
+        path (str): The JSON path of data inside the document.
+    Yields:
+        tuple: (json path, identifier) for each reference.
+    """
+    if isinstance(data, dict):
+        for key, value in data.items():
+            child = f"{path}.{key}"
+            if key.startswith(VANILLA_PREFIX):
+                for identifier in split_reference(key):
+                    yield child, identifier
+            yield from find_references(value, child)
+    elif isinstance(data, list):
+        for index, item in enumerate(data):
+            yield from find_references(item, f"{path}[{index}]")
+    elif isinstance(data, str) and data.startswith(VANILLA_PREFIX):
+        for identifier in split_reference(data):
+            yield path, identifier
+
+
+def check_file_references(file_path: Path) -> dict:
+    """
+    Checks every vanilla reference of one file against the bundled index.
+    Runs on the worker processes, each of them opens the index once.
+    Args:
+        file_path (Path): The JSON file to check.
+    Returns:
+        dict: The file, its reference count, unknown references and parse error if any.
+    """
+    result = {"file": str(file_path), "references": 0, "unknown": [], "error": None}
+    try:
+        with open(file_path, "rb") as file:
+            data = json_handler.loads_lenient(file.read())
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+
+    index = vanilla.load_index()
+    for path, identifier in find_references(data):
+        result["references"] += 1
+        if identifier not in index:
+            result["unknown"].append({"path": path, "identifier": identifier})
+    return result
+
+
+@click.command()
+@click.argument("target_path", default=".", type=click.Path(exists=True, file_okay=False))
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def references(ctx: click.Context, target_path: str, as_json: bool):
+    """
+    Check every 'minecraft:' reference of the entity files against the vanilla identifiers.
+    """
+    files = [
+        path
+        for path in packs.iter_pack_files(Path(target_path))
+        if packs.classify(str(path)) in REFERENCE_KINDS
+    ]
+    results = list(workers.map_parallel(check_file_references, files))
+
+    index = vanilla.load_index()
+    unknown = [
+        {"file": result["file"], **item, "suggestion": index.suggest(item["identifier"])}
+        for result in results
+        for item in result["unknown"]
+    ]
+    errors = [{"file": result["file"], "error": result["error"]} for result in results if result["error"]]
+    total = sum(result["references"] for result in results)
+
+    if as_json:
+        click.echo(
+            json.dumps(
+                {
+                    "index_version": index.version,
+                    "files": len(files),
+                    "references": total,
+                    "unknown": unknown,
+                    "errors": errors,
+                },
+                indent=2,
+            )
+        )
+    else:
+        console.print(
+            f"[bold blue]Checked {total} references in {len(files)} files "
+            f"against vanilla {index.version}[/bold blue]"
+        )
+        for error in errors:
+            console.print(f"[bold red]Could not read {error['file']}: {error['error']}[/bold red]")
+        if unknown:
+            table = Table(title="Unknown vanilla identifiers")
+            table.add_column("Identifier", style="bold red")
+            table.add_column("Did you mean", style="green")
+            table.add_column("File", style="cyan")
+            table.add_column("Path", style="white")
+            for item in unknown:
+                table.add_row(item["identifier"], item["suggestion"] or "", item["file"], item["path"])
+            console.print(table)
+        else:
+            console.print("[bold green]All vanilla references are known![/bold green]")
+
+    if unknown or errors:
+        ctx.exit(1)
+
+
+def check_file_molang(file_path: Path, max_cost: int = DEFAULT_MOLANG_MAX_COST) -> dict:
+    """
+    Parses and measures every Molang expression of one file.
+    Runs on the worker processes, each of them keeps its own parse cache.
+    Args:
+        file_path (Path): The client entity, render controller, animation or animation controller.
+        max_cost (int): Cost above which a per frame expression is reported.
+    Returns:
+        dict: The file, its expression count, the issues found, the variables
+              it reads, writes and declares, its per frame cost and parse error if any.
+    """
+    result = {
+        "file": str(file_path),
+        "expressions": 0,
+        "issues": [],
+        "reads": {},
+        "writes": [],
+        "declared": [],
+        "frame_cost": 0,
+        "error": None,
+    }
+    try:
+        with open(file_path, "rb") as file:
+            data = json_handler.loads_lenient(file.read())
+    except (OSError, ValueError) as e:
+        result["error"] = str(e)
+        return result
+
+    kind = packs.classify(str(file_path))
+    if kind == "client_entity" and isinstance(data, dict):
+        scripts = data.get("minecraft:client_entity", {}).get("description", {}).get("scripts", {})
+        if isinstance(scripts, dict) and isinstance(scripts.get("variables"), dict):
+            result["declared"] = sorted(molang.normalize_name(name) for name in scripts["variables"])
+
+    index = vanilla.load_index()
+    writes = set()
+
+    def issue(severity, path, expression, message):
+        result["issues"].append(
+            {"severity": severity, "path": path, "expression": expression, "message": message}
+        )
+
+    for path, expression, per_frame in molang.expressions(kind, data):
+        result["expressions"] += 1
+        try:
+            analysis = molang.analyze(molang.parse(expression))
+        except molang.MolangError as e:
+            issue("error", path, expression, f"syntax error: {e}")
+            continue
+        for name in sorted(analysis["reads"]):
+            result["reads"].setdefault(name, path)
+        writes |= analysis["writes"]
+        for name in sorted(analysis["calls"]):
+            if name.startswith(("query.", "math.")) and name not in index:
+                suggestion = index.suggest(name)
+                hint = f", did you mean '{suggestion}'?" if suggestion else ""
+                issue("error", path, expression, f"unknown {name.split('.', 1)[0]} '{name}'{hint}")
+        if not per_frame:
+            continue
+        result["frame_cost"] += analysis["cost"]
+        for name in sorted(analysis["calls"] & molang.EXPENSIVE_QUERIES.keys()):
+            issue("warning", path, expression, f"'{name}' is expensive and evaluated every frame")
+        if analysis["loops"]:
+            issue("warning", path, expression, "loop evaluated every frame")
+        if analysis["random"]:
+            issue("warning", path, expression, "random number drawn every frame, the result flickers")
+        if analysis["cost"] > max_cost:
+            issue("warning", path, expression, f"cost {analysis['cost']} is over {max_cost} and evaluated every frame")
+
+    result["writes"] = sorted(writes)
+    return result
+
+
+@click.command()
+@click.argument("target_path", default=".", type=click.Path(exists=True, file_okay=False))
+@click.option(
+    "--max-cost",
+    type=int,
+    default=DEFAULT_MOLANG_MAX_COST,
+    show_default=True,
+    help="Cost above which a per frame expression is reported",
+)
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def molang_expressions(ctx: click.Context, target_path: str, max_cost: int, as_json: bool):
+    """
+    Parse every Molang expression and report syntax errors, unknown names and per frame cost.
+    """
+    files = [
+        path
+        for path in packs.iter_pack_files(Path(target_path))
+        if packs.classify(str(path)) in MOLANG_KINDS
+    ]
+    results = list(workers.map_parallel(functools.partial(check_file_molang, max_cost=max_cost), files))
+
+    # Variables are shared by every file of an entity, so they are checked project wide
+    defined = set(molang.BUILTIN_VARIABLES)
+    for result in results:
+        defined.update(result["writes"], result["declared"])
+    issues = [{"file": result["file"], **item} for result in results for item in result["issues"]]
+    for result in results:
+        for name, path in sorted(result["reads"].items()):
+            if name not in defined:
+                issues.append(
+                    {
+                        "file": result["file"],
+                        "severity": "error",
+                        "path": path,
+                        "expression": name,
+                        "message": f"'{name}' is read but never assigned",
+                    }
+                )
+    errors = [{"file": result["file"], "error": result["error"]} for result in results if result["error"]]
+    failed = [item for item in issues if item["severity"] == "error"]
+    total = sum(result["expressions"] for result in results)
+
+    if as_json:
+        click.echo(
+            json.dumps(
+                {
+                    "files": len(files),
+                    "expressions": total,
+                    "frame_cost": {result["file"]: result["frame_cost"] for result in results},
+                    "issues": issues,
+                    "errors": errors,
+                },
+                indent=2,
+            )
+        )
+    else:
+        console.print(f"[bold blue]Checked {total} Molang expressions in {len(files)} files[/bold blue]")
+        for error in errors:
+            console.print(f"[bold red]Could not read {error['file']}: {error['error']}[/bold red]")
+        if issues:
+            table = Table(title="Molang issues")
+            table.add_column("Severity")
+            table.add_column("Message", style="bright_white")
+            table.add_column("Expression", style="green")
+            table.add_column("File", style="cyan")
+            table.add_column("Path", style="white")
+            for item in sorted(issues, key=lambda i: (i["severity"] != "error", i["file"], i["path"])):
+                severity = "[bold red]error[/bold red]" if item["severity"] == "error" else "[yellow]warning[/yellow]"
+                table.add_row(severity, item["message"], item["expression"], item["file"], item["path"])
+            console.print(table)
+        else:
+            console.print("[bold green]Every Molang expression is valid![/bold green]")
+
+    if failed or errors:
+        ctx.exit(1)
@@ -1,4 +1,5 @@
 import click
+import hashlib
 import os
 import json
 from pathlib import Path
@@ -6,16 +7,33 @@ import shutil
 from ..utils import file_utils
 from ..templates import script_template
 from ..utils import json_handler
+from ..utils import completion
+from ..utils import jobs
+from ..utils import locks
+from ..utils import snapshot
+from ..utils import state
 
 PROJECT_DIRECTORY: str = os.getcwd()
 
+# Files written by 'minecorg init' at the project root
+GENERATED_FILES = (
+    "minecorg.json",
+    ".env",
+    "package.json",
+    "just.config.ts",
+    "tsconfig.json",
+    "eslint.config.mjs",
+)
 
-def get_mod_info():
+
+def get_mod_info(directory: str | None = None):
     try:
-        with open(Path(os.getcwd()) / "minecorg.json") as f:
+        with open(Path(directory or os.getcwd()) / "minecorg.json") as f:
             data = json.load(f)
-            mod_name = data.get("mod_name")
-            namespace = data.get("namespace")
+            # 'minecorg init' stores them under "mod", older projects at the top level
+            mod = data.get("mod", {})
+            mod_name = mod.get("name", data.get("mod_name"))
+            namespace = mod.get("namespace", data.get("namespace"))
             return mod_name, namespace  # Return the values as a tuple
     except (FileNotFoundError, json.JSONDecodeError):
         a = " "
@@ -23,13 +41,77 @@ def get_mod_info():
 
 
 # Usage
-MOD_NAME, NAMESPACE = get_mod_info()
+if "_MINECORG_COMPLETE" in os.environ:
+    # Shell completion never needs the mod info, skip reading minecorg.json on every key press
+    MOD_NAME, NAMESPACE = " ", " "
+else:
+    MOD_NAME, NAMESPACE = get_mod_info()
+
+
+def load_config(directory: str | None = None) -> dict:
+    """
+    Returns the content of minecorg.json, or an empty dict if it is missing or invalid.
+    Args:
+        directory (str | None): The project directory, defaults to PROJECT_DIRECTORY.
+    """
+    try:
+        with open(Path(directory or PROJECT_DIRECTORY) / "minecorg.json") as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+
+def load_project_context(directory: str | None = None):
+    """
+    Points the commands at another project directory and reloads its minecorg.json.
+    Long running processes (the daemon) call this instead of re-importing the module.
+    Args:
+        directory (str | None): The project directory, defaults to the current directory.
+    """
+    global PROJECT_DIRECTORY, MOD_NAME, NAMESPACE
+    PROJECT_DIRECTORY = directory or os.getcwd()
+    MOD_NAME, NAMESPACE = get_mod_info(PROJECT_DIRECTORY)
 
 
 # Help Functions
+def folder_structure_entries(base_structure, variables, parent: str = "") -> list:
+    """
+    Flattens a folder structure template into the paths it creates, parents first.
+    Args:
+        base_structure (dict): See create_folder_structure().
+        variables (dict): A dictionary of variables to replace placeholders in folder and file names.
+        parent (str): The folder the structure is inside of, relative to the target path.
+    Returns:
+        list: (relative path, "file" or "directory") tuples.
+    """
+    entries = []
+    for name, content in base_structure.items():
+        # Replace placeholders in names
+        path = f"{parent}{name.format(**variables)}"
+        if content == "file":
+            entries.append((path, "file"))
+        elif isinstance(content, dict):
+            entries.append((path, "directory"))
+            entries += folder_structure_entries(content, variables, f"{path}/")
+    return entries
+
+
+def create_structure_entry(task: tuple):
+    """Creates one file or directory of a folder structure, doing nothing if it exists."""
+    target_path, (relative, entry_type) = task
+    new_path = Path(target_path) / relative
+    if entry_type == "file":
+        new_path.parent.mkdir(parents=True, exist_ok=True)
+        new_path.touch()
+    else:
+        new_path.mkdir(parents=True, exist_ok=True)
+
+
 def create_folder_structure(base_structure, target_path, variables):
     """
-    Recursively creates a folder and file structure based on a given template.
+    Creates a folder and file structure based on a given template.
+    Entries are created on a thread pool as a resumable job, so an init
+    interrupted halfway continues where it stopped when it is run again.
     Args:
         base_structure (dict): A dictionary representing the folder and file structure.
                                Keys are folder or file names, and values are either "file"
@@ -37,19 +119,15 @@ def create_folder_structure(base_structure, target_path, variables):
         target_path (Path): The base path where the folder structure will be created.
         variables (dict): A dictionary of variables to replace placeholders in folder and file names.
     """
-
-    for name, content in base_structure.items():
-        # Replace placeholders in names
-        formatted_name = name.format(**variables)
-        new_path = target_path / formatted_name
-
-        if content == "file":
-            new_path.touch()
-            click.echo(f"Created file: {new_path}")
-        elif isinstance(content, dict):
-            new_path.mkdir(parents=True, exist_ok=True)
-            click.echo(f"Created directory: {new_path}")
-            create_folder_structure(content, new_path, variables)
+    entries = folder_structure_entries(base_structure, variables)
+    plan = hashlib.sha256(json.dumps(entries).encode()).hexdigest()
+    # Every init entry can be written again, a journal left by other settings is simply replaced
+    with jobs.Job(target_path, "init", plan=plan, label="Creating project files", discard=True) as job:
+        if job.resumed:
+            click.echo(f"Resuming: {len(job.done)} of {len(entries)} entries were already created")
+        job.run([(str(target_path), entry) for entry in entries], create_structure_entry, key=lambda task: task[1][0])
+    files = sum(entry_type == "file" for _, entry_type in entries)
+    click.echo(f"Created {len(entries) - files} directories and {files} files in {target_path}")
 
 
 # Commands
@@ -77,30 +155,35 @@ def init():
     project_root = Path(os.getcwd()) / metadata["project"]["name"]
     project_root.mkdir(parents=True, exist_ok=True)
 
-    # Save metadata
-    metadata_path = Path(os.getcwd())/metadata["project"]["name"]  / "minecorg.json"
-    with open(metadata_path, "w") as f:
-        json.dump(metadata, f, indent=2)
-    # Load folder structure template
-    structure_template = json_handler.import_data_from_json_file_template("folder_structure.json")
-    structure_template = json_handler.rename_key_from_json_data(structure_template,"mod_name",metadata["mod"]["name"])
-    
-    # Create folder structure
-    create_folder_structure(structure_template, project_root, metadata)
-    # Create scripts
-    generate_just_config(metadata["project"]["name"])
-    # Create env.
-    create_env(metadata["project"]["name"])
-    # Create package.json
-    generate_package(metadata["project"]["name"])
-    # Generate tfconfig
-    generate_tf_config(metadata["project"]["name"])
-
-    generate_eslint_config(metadata["project"]["name"])
+    # Other minecorg processes on this project wait until it is complete
+    with locks.project_lock(project_root, exclusive=True):
+        # Running init over an existing project overwrites these, 'minecorg undo' puts them back
+        with snapshot.Snapshot(project_root, "init") as snap:
+            snap.record(*GENERATED_FILES)
+
+            # Save metadata
+            metadata_path = Path(os.getcwd())/metadata["project"]["name"]  / "minecorg.json"
+            state.write_atomic(metadata_path, json.dumps(metadata, indent=2))
+            # Load folder structure template
+            structure_template = json_handler.import_data_from_json_file_template("folder_structure.json")
+            structure_template = json_handler.rename_key_from_json_data(structure_template,"mod_name",metadata["mod"]["name"])
+
+            # Create folder structure
+            create_folder_structure(structure_template, project_root, metadata)
+            # Create scripts
+            generate_just_config(metadata["project"]["name"])
+            # Create env.
+            create_env(metadata["project"]["name"])
+            # Create package.json
+            generate_package(metadata["project"]["name"])
+            # Generate tfconfig
+            generate_tf_config(metadata["project"]["name"])
+
+            generate_eslint_config(metadata["project"]["name"])
     click.echo(f"\nProject created successfully at {project_root}", color="green")
 
 
-def list(model: bool, texture: bool, object: str):
+def list(model: bool, texture: bool, object: str, name: str | None = None):
     files = []
     packs = []
     if model:
@@ -122,6 +205,8 @@ def list(model: bool, texture: bool, object: str):
             )
 
             files_dir = file_utils.find_files(dir)
+            if name:
+                files_dir = [f for f in files_dir if f.split(".", 1)[0].startswith(name)]
 
             if not files:
                 click.echo(
@@ -177,18 +262,20 @@ def list(model: bool, texture: bool, object: str):
 
 
 @click.command()
+@click.argument("name", required=False, shell_complete=completion.complete("entity"))
 @click.option("-m", "--model", is_flag=True)
 @click.option("-t", "--texture", is_flag=True)
-def listEntity(model: bool, texture: bool):
-    list(model=model, texture=texture, object="entity")
+def listEntity(name: str | None, model: bool, texture: bool):
+    list(model=model, texture=texture, object="entity", name=name)
     ...
 
 
 @click.command()
+@click.argument("name", required=False, shell_complete=completion.complete("block"))
 @click.option("-m", "--model", is_flag=True)
 @click.option("-t", "--texture", is_flag=True)
-def listBlock(model: bool, texture: bool):
-    list(model=model, texture=texture, object="blocks")
+def listBlock(name: str | None, model: bool, texture: bool):
+    list(model=model, texture=texture, object="blocks", name=name)
     ...
 
 
@@ -236,7 +323,7 @@ def create_env(project_name: str):
         'CUSTOM_DEPLOYMENT_PATH=""\n'
     )
     env_path = Path(f"{project_name}/.env")
-    env_path.write_text(env_content)
+    state.write_atomic(env_path, env_content)
     click.echo(f"Created {env_path}")
     ...
 
@@ -244,8 +331,7 @@ def create_env(project_name: str):
 def generate_package(project_name:str):
     package = json_handler.import_data_from_json_file_template("package.json")
     package_path = Path(os.getcwd())/ project_name / "package.json"
-    with open(package_path, "w") as f:
-        json.dump(package, f, indent=2)
+    state.write_atomic(package_path, json.dumps(package, indent=2))
     click.echo(f"Created {package_path}")
 
 
@@ -253,21 +339,21 @@ def generate_just_config(project_name):
     """Generate just.config.ts file."""
     content = script_template.JUST_CONFIG_TEMPLATE.format(project_name=project_name)
     output_file = Path(f"{project_name}/just.config.ts")
-    output_file.write_text(content)
+    state.write_atomic(output_file, content)
     click.echo(f"Created {output_file}")
 
 
 def generate_eslint_config(project_name):
     content = script_template.ESLINT_CONFIG_TEMPLATE
     output_file = Path(f"{project_name}/eslint.config.mjs")
-    output_file.write_text(content)
+    state.write_atomic(output_file, content)
     click.echo(f"Created {output_file}")
 
 
 def generate_tf_config(project_name):
     content = script_template.TS_CONFIG_TEMPLATE
     output_file = Path(f"{project_name}/tsconfig.json")
-    output_file.write_text(content)
+    state.write_atomic(output_file, content)
     click.echo(f"Created {output_file}")
 
     
@@ -0,0 +1,200 @@
+import click
+import hashlib
+import json
+import marshal
+import os
+from pathlib import Path
+from . import project
+from ..utils import asset_index
+from ..utils import json_handler
+from ..utils import jsonpath
+from ..utils import locks
+from ..utils import packs
+from ..utils import state
+from ..utils import workers
+
+CACHE_FOLDER = "query"
+CACHE_VERSION = 1
+
+# Result files of older expressions are dropped beyond this many
+MAX_CACHED_QUERIES = 16
+
+# packs.classify() kinds that are not JSON documents
+NON_JSON_KINDS = ("texture", "lang", "script", "other")
+
+
+def namespaces_of(data) -> list:
+    """Returns the namespaces of the identifiers a document defines."""
+    return sorted({identifier.split(":", 1)[0] for identifier in packs.definitions(data) if ":" in identifier})
+
+
+def query_file(task: tuple) -> dict:
+    """
+    Hashes, parses and queries one file, on the worker processes.
+    Args:
+        task (tuple): (file path, path expression)
+    Returns:
+        dict: The sha256 of the file, the parsed document, its namespaces,
+              the matches as (path, value) lists and the parse error if any.
+    """
+    file_path, expression = task
+    try:
+        with open(file_path, "rb") as file:
+            content = file.read()
+        digest = hashlib.sha256(content).hexdigest()
+        data = json_handler.loads_lenient(content)
+    except (OSError, ValueError) as e:
+        return {"sha256": None, "data": None, "namespaces": [], "matches": [], "error": str(e)}
+    return {
+        "sha256": digest,
+        "data": data,
+        "namespaces": namespaces_of(data),
+        "matches": [list(match) for match in jsonpath.find(expression, data)],
+        "error": None,
+    }
+
+
+class QueryCache:
+    """
+    Everything a query run reuses from the previous ones, in .minecorg/cache/query:
+    files.json maps each file to its mtime, size, sha256 and namespaces,
+    documents.marshal holds the parsed documents by sha256, and
+    results-<hash>.marshal holds the matches of one expression by sha256.
+    An unchanged file is only stat'ed, a repeated expression does not even
+    load the documents.
+    """
+
+    def __init__(self, project_root, expression: str):
+        self.folder = state.state_path(project_root, "cache", CACHE_FOLDER, "files.json").parent
+        key = hashlib.sha256(f"{CACHE_VERSION}:{expression}".encode()).hexdigest()[:16]
+        self.results_path = self.folder / f"results-{key}.marshal"
+        self.files = self._load_json("files.json")
+        self.results = self._load_marshal(self.results_path)
+        self._documents = None
+        self.changed_documents = False
+        self.changed_results = False
+
+    def _load_json(self, name: str) -> dict:
+        try:
+            with open(self.folder / name, "r") as file:
+                data = json.load(file)
+            return data["files"] if data.get("version") == CACHE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            return {}
+
+    @staticmethod
+    def _load_marshal(path: Path) -> dict:
+        try:
+            with open(path, "rb") as file:
+                data = marshal.load(file)
+            return data if isinstance(data, dict) else {}
+        except (OSError, EOFError, ValueError, TypeError):
+            return {}
+
+    @property
+    def documents(self) -> dict:
+        if self._documents is None:
+            self._documents = self._load_marshal(self.folder / "documents.marshal")
+        return self._documents
+
+    def add_document(self, digest: str, data):
+        self.documents[digest] = data
+        self.changed_documents = True
+
+    def add_results(self, digest: str, matches: list):
+        self.results[digest] = matches
+        self.changed_results = True
+
+    def save(self, files: dict):
+        """Writes the caches back, keeping only the content of the current files."""
+        live = {record[2] for record in files.values()}
+        if files != self.files:
+            state.write_atomic(self.folder / "files.json", json.dumps({"version": CACHE_VERSION, "files": files}))
+        if self.changed_documents or (self._documents is not None and self._documents.keys() - live):
+            documents = {digest: data for digest, data in self.documents.items() if digest in live}
+            state.write_atomic(self.folder / "documents.marshal", marshal.dumps(documents))
+        if self.changed_results or self.results.keys() - live:
+            results = {digest: matches for digest, matches in self.results.items() if digest in live}
+            state.write_atomic(self.results_path, marshal.dumps(results))
+        stored = sorted(self.folder.glob("results-*.marshal"), key=lambda path: path.stat().st_mtime_ns)
+        for old in stored[: max(0, len(stored) - MAX_CACHED_QUERIES)]:
+            old.unlink(missing_ok=True)
+
+
+@click.command()
+@click.argument("expression")
+@click.option("-k", "--kind", "kinds", multiple=True, help="Only query files of this kind, e.g. behavior_entity")
+@click.option("-n", "--namespace", "namespaces", multiple=True, help="Only query files defining identifiers in this namespace")
+@click.pass_context
+def query(ctx: click.Context, expression: str, kinds: tuple, namespaces: tuple):
+    """
+    Find values in every pack JSON file with a JSONPath-like expression.
+
+    Each match is printed as one JSON line with the file, its kind, the path
+    of the value and the value. Examples:
+
+        minecorg query "$..components[?(@['minecraft:health'].value > 100)]" -k behavior_entity
+
+        minecorg query "$.render_controllers.*.textures[?(@ =~ 'zombie')]"
+    """
+    try:
+        jsonpath.compile_path(expression)
+    except jsonpath.JsonPathError as e:
+        click.echo(f"Error: {e}", err=True)
+        ctx.exit(2)
+
+    root = Path(project.PROJECT_DIRECTORY)
+    ctx.with_resource(locks.project_lock(root))
+    cache = QueryCache(root, expression)
+    assets = asset_index.get_index(root)
+    present = assets.files()
+    # Records of files outside the kind filter are kept for the next run
+    files = {relative: cache.files[relative] for relative in present if relative in cache.files}
+    candidates, pending = [], []
+    for relative in present:
+        kind = assets.kind(relative)
+        if kind in NON_JSON_KINDS or not relative.lower().endswith(".json") or (kinds and kind not in kinds):
+            continue
+        try:
+            stat = os.stat(os.path.join(root, relative))
+        except FileNotFoundError:
+            continue
+        record = files.get(relative)
+        if record is None or record[:2] != [stat.st_mtime_ns, stat.st_size]:
+            # Changed or new: hashed, parsed and queried on the worker pool
+            files.pop(relative, None)
+            pending.append(relative)
+        candidates.append((relative, kind, stat))
+
+    computed = workers.map_parallel(query_file, [(str(root / relative), expression) for relative in pending])
+    for relative, kind, stat in candidates:
+        record = files.get(relative)
+        if record is None:
+            result = next(computed)
+            if result["error"]:
+                click.echo(f"Warning: {relative}: {result['error']}", err=True)
+                continue
+            record = files[relative] = [stat.st_mtime_ns, stat.st_size, result["sha256"], result["namespaces"]]
+            if result["sha256"] not in cache.documents:
+                cache.add_document(result["sha256"], result["data"])
+            cache.add_results(result["sha256"], result["matches"])
+        elif record[2] not in cache.results:
+            data = cache.documents.get(record[2])
+            if data is None:
+                # The document cache was lost, parse the file again
+                result = query_file((str(root / relative), expression))
+                if result["error"]:
+                    click.echo(f"Warning: {relative}: {result['error']}", err=True)
+                    files.pop(relative)
+                    continue
+                record = files[relative] = [stat.st_mtime_ns, stat.st_size, result["sha256"], result["namespaces"]]
+                cache.add_document(result["sha256"], result["data"])
+                data = result["data"]
+            cache.add_results(record[2], [list(match) for match in jsonpath.find(expression, data)])
+
+        if namespaces and not set(namespaces) & set(record[3]):
+            continue
+        for path, value in cache.results[record[2]]:
+            click.echo(json.dumps({"file": relative, "kind": kind, "path": path, "value": value}))
+
+    cache.save(files)
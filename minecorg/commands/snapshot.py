@@ -0,0 +1,101 @@
+import click
+import time
+from pathlib import Path
+from . import project
+from ..utils import locks
+from ..utils import packs
+from ..utils import snapshot as snapshots
+from ..utils.console import console
+
+
+def _describe(manifest: dict) -> str:
+    created = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(manifest.get("created", 0)))
+    return f"[bold blue]{manifest['id']}[/bold blue] {created} {manifest.get('label', '')} ({len(manifest['files'])} files)"
+
+
+def _print_restore(restored: list, deleted: list):
+    for path in restored:
+        console.print(f"[bold green]Restored[/bold green] {path}")
+    for path in deleted:
+        console.print(f"[bold red]Deleted[/bold red] {path}")
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option("-m", "--message", default="manual snapshot", help="Label of the snapshot")
+@click.option("--list", "list_only", is_flag=True, help="List the snapshots instead of taking one")
+def snapshot(paths: tuple, message: str, list_only: bool):
+    """
+    Save the current state of files, by default of the whole project.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    if list_only:
+        manifests = snapshots.list_snapshots(root)
+        if not manifests:
+            console.print("[bold yellow]No snapshots yet.[/bold yellow]")
+        for manifest in reversed(manifests):
+            console.print(_describe(manifest))
+        return
+
+    files = []
+    for path in paths or [root / "minecorg.json", *(root / folder for folder in packs.PACK_FOLDERS)]:
+        path = Path(path)
+        if path.is_dir():
+            files += [file for file in path.rglob("*") if file.is_file() and ".minecorg" not in file.parts]
+        elif path.is_file():
+            files.append(path)
+    taken = snapshots.Snapshot(root, message)
+    taken.record(*files)
+    snapshot_id = taken.save()
+    if snapshot_id is None:
+        console.print("[bold yellow]Nothing to snapshot.[/bold yellow]")
+    else:
+        console.print(f"[bold green]Saved snapshot {snapshot_id} ({len(taken.files)} files).[/bold green]")
+
+
+@click.command()
+@click.argument("snapshot_id")
+@click.pass_context
+def restore(ctx: click.Context, snapshot_id: str):
+    """
+    Put the files of a snapshot back. The files it overwrites are snapshotted first.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    ctx.with_resource(locks.project_lock(root, exclusive=True))
+    try:
+        manifest = snapshots.load_snapshot(root, snapshot_id)
+    except FileNotFoundError:
+        console.print(f"[bold red]Error: Snapshot {snapshot_id} not found.[/bold red]")
+        raise click.Abort()
+    with snapshots.Snapshot(root, f"restore {snapshot_id}") as before:
+        before.record(*manifest["files"])
+        try:
+            restored, deleted = snapshots.restore(root, manifest)
+        except FileNotFoundError as e:
+            console.print(f"[bold red]Error: The snapshot store is damaged: {e}[/bold red]")
+            raise click.Abort()
+    _print_restore(restored, deleted)
+    console.print(f"[bold green]Restored snapshot {snapshot_id}.[/bold green]")
+
+
+@click.command()
+@click.pass_context
+def undo(ctx: click.Context):
+    """
+    Undo the last operation that took a snapshot.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    ctx.with_resource(locks.project_lock(root, exclusive=True))
+    manifests = snapshots.list_snapshots(root)
+    if not manifests:
+        console.print("[bold yellow]Nothing to undo.[/bold yellow]")
+        return
+    manifest = manifests[-1]
+    try:
+        restored, deleted = snapshots.restore(root, manifest)
+    except FileNotFoundError as e:
+        console.print(f"[bold red]Error: The snapshot store is damaged: {e}[/bold red]")
+        raise click.Abort()
+    snapshots.delete_snapshot(root, manifest["id"])
+    _print_restore(restored, deleted)
+    console.print(f"[bold green]Undid {manifest.get('label', manifest['id'])}.[/bold green]")
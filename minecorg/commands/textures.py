@@ -0,0 +1,41 @@
+import click
+import json
+from pathlib import Path
+from . import project
+from ..utils import snapshot
+from ..utils import texture_registry
+from ..utils.console import console
+
+
+@click.command()
+@click.option("--dry-run", is_flag=True, help="Show what would change without writing anything")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+def sync(dry_run: bool, as_json: bool):
+    """
+    Add and remove the item_texture.json and terrain_texture.json entries of new and deleted textures.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    try:
+        changes = texture_registry.sync_registries(root, dry_run=True)
+        if changes and not dry_run:
+            with snapshot.Snapshot(root, "textures sync") as snap:
+                snap.record(*(change["registry"] for change in changes))
+                changes = texture_registry.sync_registries(root)
+    except ValueError as e:
+        console.print(f"[bold red]Error: {e}[/bold red]")
+        raise click.Abort()
+
+    if as_json:
+        click.echo(json.dumps({"dry_run": dry_run, "changes": changes}, indent=2))
+        return
+    if not changes:
+        console.print("[bold green]Texture registries are up to date![/bold green]")
+        return
+    for change in changes:
+        console.print(f"[bold blue]{change['registry']}[/bold blue]")
+        for name in change["added"]:
+            console.print(f"  [green]+ {name}[/green]")
+        for name in change["removed"]:
+            console.print(f"  [red]- {name}[/red]")
+    if dry_run:
+        console.print("[bold purple]Dry run, nothing was written.[/bold purple]")
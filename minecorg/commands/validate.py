@@ -0,0 +1,158 @@
+import click
+import hashlib
+import json
+import os
+from pathlib import Path
+from . import project
+from ..utils import asset_index
+from ..utils import json_handler
+from ..utils import locks
+from ..utils import packs
+from ..utils import schema
+from ..utils import state
+from ..utils import workers
+from ..utils.console import console
+
+CACHE_FILE = "validate.json"
+CACHE_VERSION = 1
+
+
+def validate_file(task: tuple) -> dict:
+    """
+    Validates one pack file against its compiled schema.
+    Runs on the worker processes, each of them loads every validator once.
+    Args:
+        task (tuple): (file path, schema kind, sha256 of the last validated
+                      content or None)
+    Returns:
+        dict: The sha256 of the file, whether it is unchanged since the last
+              run, the schema errors and the parse error if any.
+    """
+    file_path, kind, known_digest = task
+    try:
+        with open(file_path, "rb") as file:
+            content = file.read()
+    except OSError as e:
+        return {"sha256": None, "unchanged": False, "errors": [], "error": str(e)}
+    digest = hashlib.sha256(content).hexdigest()
+    if digest == known_digest:
+        return {"sha256": digest, "unchanged": True, "errors": [], "error": None}
+    try:
+        data = json_handler.loads_lenient(content)
+    except ValueError as e:
+        return {"sha256": digest, "unchanged": False, "errors": [], "error": str(e)}
+    errors = schema.get_validator(kind)(data)
+    return {"sha256": digest, "unchanged": False, "errors": [list(error) for error in errors], "error": None}
+
+
+def warn_schema_errors(project_root, paths) -> int:
+    """
+    Prints the schema errors of files a command just wrote.
+    Args:
+        project_root (str or Path): The project directory.
+        paths: The written files, absolute or relative to the project.
+    Returns:
+        int: The number of errors found.
+    """
+    root = Path(project_root)
+    count = 0
+    for path in paths:
+        path = root / path
+        kind = schema.schema_kind(str(path), packs.classify(str(path)))
+        if kind is None:
+            continue
+        result = validate_file((str(path), kind, None))
+        for json_path, message in result["errors"]:
+            console.print(f"[bold yellow]Warning: {path.name} {json_path}: {message}[/bold yellow]")
+        count += len(result["errors"]) + bool(result["error"])
+    return count
+
+
+@click.command()
+@click.option("--all", "check_all", is_flag=True, help="Validate every file, ignoring the results of the last run")
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+@click.pass_context
+def validate(ctx: click.Context, check_all: bool, as_json: bool):
+    """
+    Validate the pack files against the bundled schemas.
+    """
+    root = Path(project.PROJECT_DIRECTORY)
+    # Shared, validating runs alongside generation but not during a rename or removal
+    ctx.with_resource(locks.project_lock(root))
+    cache_path = state.state_path(root, "cache", CACHE_FILE)
+    schemas_digest = schema.schemas_digest()
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+        if cache.get("version") != CACHE_VERSION or cache.get("schemas") != schemas_digest or check_all:
+            cache = {}
+    except (OSError, ValueError):
+        cache = {}
+    records = cache.get("files", {})
+
+    # Compile the validators once here, the workers then only unmarshal them
+    for kind in schema.SCHEMA_KINDS:
+        schema.get_validator(kind)
+
+    assets = asset_index.get_index(root)
+    files, tasks, current = [], [], {}
+    for relative in assets.files():
+        kind = schema.schema_kind(relative, packs.classify(relative))
+        if kind is None or not relative.lower().endswith(".json"):
+            continue
+        try:
+            stat = os.stat(root / relative)
+        except FileNotFoundError:
+            continue
+        record = records.get(relative)
+        # Same size and mtime: the file is not even read again
+        if record is not None and record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+            current[relative] = record
+            continue
+        files.append((relative, stat))
+        tasks.append((str(root / relative), kind, record[2] if record else None))
+
+    validated = 0
+    for (relative, stat), result in zip(files, workers.map_parallel(validate_file, tasks)):
+        validated += not result["unchanged"]
+        if result["unchanged"]:
+            current[relative] = [stat.st_mtime_ns, stat.st_size, *records[relative][2:]]
+        else:
+            current[relative] = [stat.st_mtime_ns, stat.st_size, result["sha256"], result["errors"], result["error"]]
+    state.write_atomic(
+        cache_path,
+        json.dumps({"version": CACHE_VERSION, "schemas": schemas_digest, "files": current}),
+    )
+
+    invalid = {relative: record for relative, record in sorted(current.items()) if record[3] or record[4]}
+    if as_json:
+        click.echo(
+            json.dumps(
+                {
+                    "files": len(current),
+                    "validated": validated,
+                    "invalid": {
+                        relative: {"errors": [{"path": p, "message": m} for p, m in record[3]], "error": record[4]}
+                        for relative, record in invalid.items()
+                    },
+                },
+                indent=2,
+            )
+        )
+    else:
+        console.print(
+            f"[bold blue]Checked {len(current)} files, {validated} new or edited since the last run[/bold blue]"
+        )
+        for relative, record in invalid.items():
+            console.print(f"[bold red]{relative}[/bold red]")
+            if record[4]:
+                console.print(f"    Could not read: {record[4]}")
+            for path, message in record[3]:
+                console.print(f"    [white]{path}[/white]: {message}")
+        if invalid:
+            console.print(f"[bold red]{len(invalid)} files do not match their schema.[/bold red]")
+        else:
+            console.print("[bold green]Every file matches its schema![/bold green]")
+
+    if invalid:
+        ctx.exit(1)
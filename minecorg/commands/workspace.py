@@ -0,0 +1,291 @@
+import click
+import json
+import os
+import shutil
+import subprocess
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+from ..utils import json_handler
+from ..utils import workspace
+from ..utils.console import console
+
+# Templates parsed once per worker and shared by every project it runs
+WARM_TEMPLATES = ("entity.json", "entity.entity.json", "entity.render_controllers.json", "folder_structure.json")
+
+# 'npm run local-deploy' watches the sources and never exits, so the
+# workspace deploys with the one shot 'package' task of just-scripts
+BUILD_COMMAND = ("npm", "run", "build")
+DEPLOY_COMMAND = ("npx", "just-scripts", "package")
+
+
+def _warm_caches():
+    """Worker initializer, loads the caches every project uses."""
+    for template in WARM_TEMPLATES:
+        json_handler.import_data_from_json_file_template(template)
+    from ..utils import vanilla
+
+    vanilla.load_index()
+
+
+def run_in_project(task: tuple) -> dict:
+    """
+    Runs a minecorg command line against one project, on a worker process.
+    Args:
+        task (tuple): (project directory, argument list, terminal width)
+    Returns:
+        dict: The project, the captured output, the exit code and the duration.
+    """
+    from .. import server
+    from . import project
+
+    directory, argv, columns = task
+    started = time.perf_counter()
+    os.chdir(directory)
+    project.load_project_context(directory)
+    output, exit_code = server.run_command(argv, columns)
+    return {
+        "project": directory,
+        "output": output,
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def run_process_in_project(task: tuple) -> dict:
+    """
+    Runs an external program in one project directory, on a worker process.
+    Args:
+        task (tuple): (project directory, command line, terminal width)
+    Returns:
+        dict: The project, the captured output, the exit code and the duration.
+    """
+    directory, command, _ = task
+    started = time.perf_counter()
+    executable = shutil.which(command[0])
+    if executable is None:
+        output, exit_code = f"'{command[0]}' was not found on PATH\n", 127
+    else:
+        completed = subprocess.run(
+            [executable, *command[1:]],
+            cwd=directory,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+        )
+        output, exit_code = completed.stdout, completed.returncode
+    return {
+        "project": directory,
+        "output": output,
+        "exit_code": exit_code,
+        "seconds": round(time.perf_counter() - started, 2),
+    }
+
+
+def build_project(task: tuple) -> dict:
+    """
+    Syncs the texture registries of one project, then builds it.
+    Args:
+        task (tuple): (project directory, command line, terminal width)
+    Returns:
+        dict: See run_process_in_project().
+    """
+    from ..utils import texture_registry
+
+    try:
+        changes = texture_registry.sync_registries(task[0])
+    except ValueError as e:
+        return {"project": task[0], "output": f"{e}\n", "exit_code": 1, "seconds": 0}
+    result = run_process_in_project(task)
+    synced = "".join(
+        f"{change['registry']}: {len(change['added'])} added, {len(change['removed'])} removed\n" for change in changes
+    )
+    result["output"] = synced + result["output"]
+    return result
+
+
+def _columns() -> int:
+    try:
+        return os.get_terminal_size().columns
+    except OSError:
+        return 80
+
+
+def _failure(directory: str, error: BaseException) -> dict:
+    """The result of a project whose task raised instead of returning."""
+    if isinstance(error, BrokenProcessPool):
+        message = "The worker process running this project crashed"
+    else:
+        message = f"{type(error).__name__}: {error}"
+    return {"project": directory, "output": f"{message}\n", "exit_code": 1, "seconds": 0}
+
+
+def _run_isolated(function, task: tuple) -> dict:
+    """Runs one task in a worker process of its own, so a crash only breaks this task."""
+    with ProcessPoolExecutor(max_workers=1, initializer=_warm_caches) as pool:
+        return pool.submit(function, task).result()
+
+
+def _run_tasks(function, tasks: list, jobs: int | None):
+    """
+    Yields (project directory, result) as the tasks finish.
+    Every task runs on one shared pool first. A worker that dies (a segfault,
+    os._exit) breaks that pool and every task still on it, so the unfinished
+    ones are run again, each in a process of its own: the crashing project
+    fails alone and the others still get their real result.
+    """
+    broken = []
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_caches) as pool:
+        futures = {}
+        for task in tasks:
+            try:
+                futures[pool.submit(function, task)] = task
+            except BrokenProcessPool:
+                broken.append(task)
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                yield task[0], future.result()
+            except BrokenProcessPool:
+                broken.append(task)
+            except Exception as e:
+                yield task[0], _failure(task[0], e)
+    if not broken:
+        return
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count() or 1) as threads:
+        futures = {threads.submit(_run_isolated, function, task): task for task in broken}
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                yield task[0], future.result()
+            except Exception as e:
+                yield task[0], _failure(task[0], e)
+
+
+def run_across_projects(function, payload, jobs: int | None, as_json: bool, quiet: bool) -> list:
+    """
+    Runs a task in every workspace project on a process pool.
+    A failing project, even one that crashes its worker, only fails its own result,
+    see _run_tasks().
+    Args:
+        function: run_in_project or run_process_in_project.
+        payload: The argument list or command line given to every project.
+        jobs (int | None): Number of worker processes, defaults to the CPU count.
+        as_json (bool): Print the results as JSON instead of as they complete.
+        quiet (bool): Only print the output of failed projects.
+    Returns:
+        list: The results, in project order.
+    """
+    try:
+        root, projects = workspace.load_workspace()
+    except ValueError as e:
+        console.print(f"[bold red]Error: {e}[/bold red]")
+        raise click.Abort()
+    if not projects:
+        console.print(f"[bold red]Error: No MINECORG project found in {root}[/bold red]")
+        raise click.Abort()
+
+    def name(directory):
+        return Path(directory).relative_to(root).as_posix() or "."
+
+    columns = _columns()
+    results = {}
+    tasks = [(str(directory), payload, columns) for directory in projects]
+    for directory, result in _run_tasks(function, tasks, jobs):
+        result["project"] = name(directory)
+        results[directory] = result
+        if as_json:
+            continue
+        failed = result["exit_code"] != 0
+        status = "[bold red]failed[/bold red]" if failed else "[bold green]ok[/bold green]"
+        console.rule(f"{result['project']} {status} ({result['seconds']}s)")
+        if result["output"] and (failed or not quiet):
+            click.echo(result["output"].rstrip("\n"))
+
+    ordered = [results[str(directory)] for directory in projects]
+    failed = [result for result in ordered if result["exit_code"] != 0]
+    if as_json:
+        click.echo(json.dumps({"workspace": str(root), "results": ordered}, indent=2))
+    elif failed:
+        console.print(
+            f"[bold red]{len(failed)} of {len(ordered)} projects failed: "
+            f"{', '.join(result['project'] for result in failed)}[/bold red]"
+        )
+    else:
+        console.print(f"[bold green]All {len(ordered)} projects succeeded![/bold green]")
+    return ordered
+
+
+_POOL_OPTIONS = (
+    click.option("-j", "--jobs", type=int, help="Number of worker processes, defaults to the CPU count"),
+    click.option("-q", "--quiet", is_flag=True, help="Only print the output of failed projects"),
+    click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report"),
+)
+
+
+def pool_options(command):
+    for option in reversed(_POOL_OPTIONS):
+        command = option(command)
+    return command
+
+
+@click.command()
+@click.option("--json", "as_json", is_flag=True, help="Print a machine-readable report")
+def projects(as_json: bool):
+    """
+    List the projects of the workspace.
+    """
+    try:
+        root, found = workspace.load_workspace()
+    except ValueError as e:
+        console.print(f"[bold red]Error: {e}[/bold red]")
+        raise click.Abort()
+    names = [path.relative_to(root).as_posix() or "." for path in found]
+    if as_json:
+        click.echo(json.dumps({"workspace": str(root), "projects": names}, indent=2))
+        return
+    source = "listed in" if workspace.find_workspace_file() else "found below"
+    console.print(f"[bold blue]{len(names)} projects {source} {root}[/bold blue]")
+    for project_name in names:
+        console.print(f"  {project_name}")
+
+
+@click.command(context_settings={"ignore_unknown_options": True, "allow_interspersed_args": False})
+@click.argument("command", nargs=-1, required=True, type=click.UNPROCESSED)
+@pool_options
+@click.pass_context
+def run(ctx: click.Context, command: tuple, jobs: int | None, quiet: bool, as_json: bool):
+    """
+    Run a minecorg command in every project, e.g. 'workspace run scan .'.
+    """
+    if command[0] in ("workspace", "init", "new", "remove"):
+        console.print(f"[bold red]Error: '{command[0]}' can not run across a workspace[/bold red]")
+        raise click.Abort()
+    results = run_across_projects(run_in_project, list(command), jobs, as_json, quiet)
+    if any(result["exit_code"] != 0 for result in results):
+        ctx.exit(1)
+
+
+@click.command()
+@pool_options
+@click.pass_context
+def build(ctx: click.Context, jobs: int | None, quiet: bool, as_json: bool):
+    """
+    Sync the texture registries and run 'npm run build' in every project.
+    """
+    results = run_across_projects(build_project, BUILD_COMMAND, jobs, as_json, quiet)
+    if any(result["exit_code"] != 0 for result in results):
+        ctx.exit(1)
+
+
+@click.command()
+@pool_options
+@click.pass_context
+def deploy(ctx: click.Context, jobs: int | None, quiet: bool, as_json: bool):
+    """
+    Copy the built packs of every project into the game folders.
+    """
+    results = run_across_projects(run_process_in_project, DEPLOY_COMMAND, jobs, as_json, quiet)
+    if any(result["exit_code"] != 0 for result in results):
+        ctx.exit(1)
@@ -0,0 +1,159 @@
+"""
+Project daemon answering the commands forwarded by minecorg.client.
+Run with 'minecorg daemon start', one daemon serves one project directory.
+"""
+import contextlib
+import io
+import json
+import os
+import socketserver
+import sys
+import threading
+from pathlib import Path
+
+import click
+from rich.console import Console
+
+from .utils import asset_index
+from .utils import state
+from .commands import project
+
+SOCKET_FILE = "daemon.sock"
+PID_FILE = "daemon.pid"
+
+# Seconds between two checks of the project files
+POLL_INTERVAL = 1.0
+
+
+class ProjectState:
+    """
+    Everything the daemon keeps hot between commands.
+    The asset index and minecorg.json are polled by a background thread, the
+    parsed templates are cached by json_handler for the life of the process.
+    """
+
+    def __init__(self, project_root: Path):
+        self.root = project_root
+        self.lock = threading.Lock()
+        self.config_mtime = None
+        self.refresh()
+
+    def refresh(self):
+        with self.lock:
+            try:
+                config_mtime = os.stat(self.root / "minecorg.json").st_mtime_ns
+            except FileNotFoundError:
+                config_mtime = None
+            if config_mtime != self.config_mtime:
+                project.load_project_context(str(self.root))
+                self.config_mtime = config_mtime
+            asset_index.get_index(self.root)
+
+    def watch(self, stop: threading.Event):
+        while not stop.wait(POLL_INTERVAL):
+            try:
+                self.refresh()
+            except OSError:
+                # The project is being rewritten, try again on the next tick
+                pass
+
+
+def run_command(argv: list, columns: int = 80, cwd: str | None = None) -> tuple:
+    """
+    Runs a command line in this process and captures what it prints.
+    Args:
+        argv (list): The command line arguments, without the program name.
+        columns (int): Width of the client terminal, used by rich tables.
+        cwd (str | None): Directory of the client, relative paths are resolved from it.
+                          The project directory stays the one the daemon serves.
+    Returns:
+        tuple: (output, exit code)
+    """
+    from .cli import cli
+
+    buffer = io.StringIO()
+    exit_code = 0
+    home = os.getcwd()
+    with contextlib.redirect_stdout(buffer), contextlib.redirect_stderr(buffer):
+        previous = os.environ.get("COLUMNS")
+        os.environ["COLUMNS"] = str(columns)
+        try:
+            if cwd:
+                os.chdir(cwd)
+            result = cli.main(args=argv, prog_name="minecorg", standalone_mode=False)
+            if isinstance(result, int):
+                exit_code = result
+        except click.ClickException as e:
+            e.show()
+            exit_code = e.exit_code
+        except click.Abort:
+            click.echo("Aborted!", err=True)
+            exit_code = 1
+        except SystemExit as e:
+            exit_code = e.code if isinstance(e.code, int) else 1
+        except Exception as e:
+            Console(file=buffer).print(f"[bold red]Unexpected error: {e}[/bold red]")
+            exit_code = 1
+        finally:
+            os.chdir(home)
+            if previous is None:
+                os.environ.pop("COLUMNS", None)
+            else:
+                os.environ["COLUMNS"] = previous
+    return buffer.getvalue(), exit_code
+
+
+class CommandHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline())
+        except ValueError:
+            return
+        if request.get("stop"):
+            reply = {"output": "", "exit_code": 0}
+            threading.Thread(target=self.server.shutdown).start()
+        elif request.get("ping"):
+            reply = {"output": "", "exit_code": 0, "pid": os.getpid()}
+        else:
+            project_state = self.server.project_state
+            with project_state.lock:
+                output, exit_code = run_command(
+                    request.get("argv", []), request.get("columns", 80), request.get("cwd")
+                )
+            reply = {"output": output, "exit_code": exit_code}
+        self.wfile.write(json.dumps(reply).encode() + b"\n")
+
+
+def serve(project_root: Path):
+    """
+    Serves the project until a stop request arrives.
+    Args:
+        project_root (Path): The project directory.
+    """
+    os.chdir(project_root)
+    socket_path = state.state_path(project_root, SOCKET_FILE)
+    pid_path = state.state_path(project_root, PID_FILE)
+    with contextlib.suppress(FileNotFoundError):
+        socket_path.unlink()
+
+    project_state = ProjectState(Path(project_root))
+    # Commands share module state (stdout, project context), so they run one at a time
+    server = socketserver.UnixStreamServer(os.path.relpath(socket_path), CommandHandler)
+    server.project_state = project_state
+    stop = threading.Event()
+    watcher = threading.Thread(target=project_state.watch, args=(stop,), daemon=True)
+    watcher.start()
+    state.write_atomic(pid_path, str(os.getpid()))
+    try:
+        server.serve_forever()
+    finally:
+        stop.set()
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            socket_path.unlink()
+        with contextlib.suppress(FileNotFoundError):
+            pid_path.unlink()
+
+
+if __name__ == "__main__":
+    serve(Path(sys.argv[1] if len(sys.argv) > 1 else os.getcwd()).resolve())
@@ -0,0 +1,416 @@
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+import zipfile
+import zlib
+from collections import Counter
+from pathlib import Path, PurePosixPath
+
+from . import json_handler
+from . import packs
+
+# Archives that may be nested inside an .mcaddon
+NESTED_ARCHIVE_EXTENSIONS = (".mcpack", ".zip")
+
+# Deflated nested packs are inflated in memory up to this size, on disk above it
+NESTED_SPOOL_SIZE = 32 * 1024 * 1024
+
+# Fixed part of a zip local file header, see APPNOTE 4.3.7
+_LOCAL_HEADER = struct.Struct("<4s2B4HL2L2H")
+
+
+class _Window:
+    """
+    Read-only file object over a slice of a memory map.
+    Used to open a stored (uncompressed) nested archive without copying it.
+    """
+
+    def __init__(self, buffer: mmap.mmap, start: int, size: int):
+        self._buffer = buffer
+        self._start = start
+        self._size = size
+        self._position = 0
+
+    def seekable(self) -> bool:
+        return True
+
+    def tell(self) -> int:
+        return self._position
+
+    def seek(self, offset: int, whence: int = os.SEEK_SET) -> int:
+        if whence == os.SEEK_CUR:
+            offset += self._position
+        elif whence == os.SEEK_END:
+            offset += self._size
+        self._position = max(0, min(offset, self._size))
+        return self._position
+
+    def read(self, size: int = -1) -> bytes:
+        end = self._size if size is None or size < 0 else min(self._size, self._position + size)
+        data = self._buffer[self._start + self._position : self._start + end]
+        self._position = end
+        return data
+
+
+def _pack_kind(root: str, manifest: bytes | None) -> str:
+    """
+    Guesses whether a pack root holds a behavior or a resource pack.
+    The manifest module type wins, the folder name is the fallback because
+    projects created by 'minecorg init' start with an empty manifest.
+    """
+    try:
+        modules = json_handler.loads_lenient(manifest or b"").get("modules")
+    except (ValueError, AttributeError):
+        modules = None
+    if isinstance(modules, list):
+        types = {
+            module.get("type") for module in modules if isinstance(module, dict) and isinstance(module.get("type"), str)
+        }
+        if "resources" in types:
+            return "resource"
+        if types & {"data", "script", "javascript"}:
+            return "behavior"
+    lowered = root.lower()
+    if "resource" in lowered:
+        return "resource"
+    if "behavior" in lowered or "behaviour" in lowered:
+        return "behavior"
+    if lowered.endswith("rp"):
+        return "resource"
+    if lowered.endswith("bp"):
+        return "behavior"
+    return PurePosixPath(root).name or "pack"
+
+
+def _pack_keys(names, read) -> dict:
+    """
+    Maps raw entry names to keys that are stable between a build and the source tree.
+    Every file below a folder holding a manifest.json is keyed as
+    '<pack kind>/<path inside the pack>', so 'My Addon BP/entities/cow.json'
+    and 'behavior_packs/my_addon/entities/cow.json' compare as the same file.
+    Args:
+        names: The raw entry names, using '/' as separator.
+        read: A callable returning the bytes of a raw entry name.
+    Returns:
+        dict: A mapping of raw name to key.
+    """
+    roots = {
+        str(PurePosixPath(name).parent)
+        for name in names
+        if PurePosixPath(name).name.lower() == "manifest.json"
+    }
+    roots = sorted(("" if root == "." else root for root in roots), key=len, reverse=True)
+    kinds = {root: _pack_kind(root, read(f"{root}/manifest.json" if root else "manifest.json")) for root in roots}
+    counts = Counter(kinds.values())
+    labels = {
+        root: kind if counts[kind] == 1 else f"{kind}:{PurePosixPath(root).name}"
+        for root, kind in kinds.items()
+    }
+    # Packs of one kind in folders of the same name, numbered in path order so their files never collide
+    seen = Counter()
+    for root in sorted(labels):
+        label = labels[root]
+        seen[label] += 1
+        if seen[label] > 1:
+            labels[root] = f"{label}#{seen[label]}"
+
+    keys = {}
+    for name in names:
+        keys[name] = name
+        for root in roots:
+            if not root:
+                keys[name] = f"{labels[root]}/{name}"
+                break
+            if name.startswith(root + "/"):
+                keys[name] = f"{labels[root]}/{name[len(root) + 1:]}"
+                break
+    return keys
+
+
+class ArchiveSource:
+    """
+    Reads an .mcaddon/.mcpack/.zip through its central directory.
+    The archive is memory mapped, listing it never decompresses anything and
+    only the entries passed to read() are inflated. Nested packs are opened
+    in place when they are stored. A deflated nested pack, the usual case
+    inside an .mcaddon, can only be listed after inflating it up to its
+    central directory, as deflate streams can not be read from the middle.
+    It is inflated once, into a temporary file spilling to disk above
+    NESTED_SPOOL_SIZE, so its entries are still only inflated on read().
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise zipfile.BadZipFile(f"{self.path} is empty")
+        self._members = {}
+        self._spools = []
+        try:
+            root = _Window(self._map, 0, len(self._map))
+            self._open(zipfile.ZipFile(root), root, "")
+            self._keys = _pack_keys(self._members, self._read_raw)
+            self._entries = {self._keys[name]: name for name in self._members}
+        except BaseException:
+            # Not a zip, or a broken one: the map and the handle would outlive the failed source
+            self.close()
+            raise
+
+    def _open(self, archive: zipfile.ZipFile, window: _Window | None, prefix: str):
+        for info in archive.infolist():
+            if info.is_dir():
+                continue
+            name = prefix + info.filename
+            if info.filename.lower().endswith(NESTED_ARCHIVE_EXTENSIONS):
+                nested, nested_window = self._nested(archive, window, info)
+                if nested is not None:
+                    self._open(nested, nested_window, name + "/")
+                    continue
+            self._members[name] = (archive, info)
+
+    def _nested(self, archive: zipfile.ZipFile, window: _Window | None, info: zipfile.ZipInfo):
+        nested_window = None
+        if info.compress_type == zipfile.ZIP_STORED and window is not None:
+            offset = window._start + info.header_offset
+            header = _LOCAL_HEADER.unpack_from(self._map, offset)
+            start = offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+            fp = nested_window = _Window(self._map, start, info.file_size)
+        else:
+            fp = tempfile.SpooledTemporaryFile(max_size=NESTED_SPOOL_SIZE)
+            self._spools.append(fp)
+            with archive.open(info) as member:
+                shutil.copyfileobj(member, fp)
+            fp.seek(0)
+        try:
+            return zipfile.ZipFile(fp), nested_window
+        except zipfile.BadZipFile:
+            return None, None
+
+    def _read_raw(self, name: str):
+        member = self._members.get(name)
+        if member is None:
+            return None
+        archive, info = member
+        return archive.read(info)
+
+    def entries(self) -> dict:
+        """Returns a mapping of entry key to uncompressed size."""
+        return {key: self._members[name][1].file_size for key, name in self._entries.items()}
+
+    def compressed_size(self, key: str) -> int:
+        return self._members[self._entries[key]][1].compress_size
+
+    def crc(self, key: str) -> int:
+        """Returns the CRC-32 stored in the central directory."""
+        return self._members[self._entries[key]][1].CRC
+
+    def read(self, key: str) -> bytes:
+        return self._read_raw(self._entries[key])
+
+    def close(self):
+        self._members.clear()
+        for spool in self._spools:
+            spool.close()
+        self._spools.clear()
+        self._map.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class DirectorySource:
+    """
+    Reads a source tree with the same interface as ArchiveSource.
+    When the directory is a MINECORG project only the pack folders are read.
+    CRCs are computed lazily, so files whose sizes differ are never read.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        roots = [self.path / folder for folder in packs.PACK_FOLDERS if (self.path / folder).is_dir()]
+        files = {}
+        for root in roots or [self.path]:
+            for dirpath, dirnames, filenames in os.walk(root):
+                dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
+                for filename in filenames:
+                    full = os.path.join(dirpath, filename)
+                    files[Path(full).relative_to(self.path).as_posix()] = full
+        self._files = files
+        keys = _pack_keys(files, self._read_raw)
+        self._entries = {keys[name]: name for name in files}
+        self._crcs = {}
+
+    def _read_raw(self, name: str):
+        full = self._files.get(name)
+        if full is None:
+            return None
+        with open(full, "rb") as file:
+            return file.read()
+
+    def entries(self) -> dict:
+        return {key: os.path.getsize(self._files[name]) for key, name in self._entries.items()}
+
+    def compressed_size(self, key: str) -> int:
+        return os.path.getsize(self._files[self._entries[key]])
+
+    def crc(self, key: str) -> int:
+        if key not in self._crcs:
+            crc = 0
+            with open(self._files[self._entries[key]], "rb") as file:
+                for chunk in iter(lambda: file.read(1 << 20), b""):
+                    crc = zlib.crc32(chunk, crc)
+            self._crcs[key] = crc
+        return self._crcs[key]
+
+    def read(self, key: str) -> bytes:
+        return self._read_raw(self._entries[key])
+
+    def close(self):
+        ...
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def open_source(path: Path):
+    """
+    Opens a built archive or a source directory for inspection.
+    Args:
+        path (Path): Path to an .mcaddon/.mcpack/.zip file or to a folder.
+    Returns:
+        ArchiveSource | DirectorySource: The opened source, usable as a context manager.
+    Raises:
+        zipfile.BadZipFile: If the file is not a zip archive.
+    """
+    path = Path(path)
+    if path.is_dir():
+        return DirectorySource(path)
+    return ArchiveSource(path)
+
+
+def _load_definitions(source, key: str) -> dict:
+    try:
+        return packs.definitions(json_handler.loads_lenient(source.read(key)))
+    except ValueError:
+        return {}
+
+
+def _component_diff(old: dict, new: dict) -> dict:
+    old_components, new_components = packs.components(old), packs.components(new)
+    return {
+        "added": sorted(new_components.keys() - old_components.keys()),
+        "removed": sorted(old_components.keys() - new_components.keys()),
+        "changed": sorted(
+            name
+            for name in old_components.keys() & new_components.keys()
+            if old_components[name] != new_components[name]
+        ),
+    }
+
+
+def diff_sources(old, new) -> dict:
+    """
+    Compares two sources, decompressing only the JSON entries that differ.
+    Entries are matched by key and compared by size first and CRC second.
+    Definitions (entities, geometries, render controllers...) are then
+    extracted from the differing JSON files to describe the change.
+    Args:
+        old: The source opened with open_source() to compare from.
+        new: The source opened with open_source() to compare to.
+    Returns:
+        dict: A JSON serialisable report with 'files' and 'definitions' sections.
+    """
+    old_entries, new_entries = old.entries(), new.entries()
+    added = sorted(new_entries.keys() - old_entries.keys())
+    removed = sorted(old_entries.keys() - new_entries.keys())
+    changed = sorted(
+        key
+        for key in old_entries.keys() & new_entries.keys()
+        if old_entries[key] != new_entries[key] or old.crc(key) != new.crc(key)
+    )
+
+    report = {
+        "files": {
+            "added": added,
+            "removed": removed,
+            "changed": changed,
+            "unchanged": len(old_entries.keys() & new_entries.keys()) - len(changed),
+        },
+        "definitions": {"added": [], "removed": [], "renamed": [], "changed": []},
+    }
+    definitions = report["definitions"]
+
+    def is_json(key: str) -> bool:
+        return key.lower().endswith(".json") and packs.classify(key) != "manifest"
+
+    for key in filter(is_json, added):
+        for identifier in _load_definitions(new, key):
+            definitions["added"].append({"identifier": identifier, "file": key})
+    for key in filter(is_json, removed):
+        for identifier in _load_definitions(old, key):
+            definitions["removed"].append({"identifier": identifier, "file": key})
+
+    for key in filter(is_json, changed):
+        before, after = _load_definitions(old, key), _load_definitions(new, key)
+        gone = sorted(before.keys() - after.keys())
+        new_ids = sorted(after.keys() - before.keys())
+        if len(gone) == 1 and len(new_ids) == 1:
+            definitions["renamed"].append({"file": key, "old": gone[0], "new": new_ids[0]})
+            delta = _component_diff(before[gone[0]], after[new_ids[0]])
+            if any(delta.values()):
+                definitions["changed"].append({"identifier": new_ids[0], "file": key, "components": delta})
+            continue
+        definitions["removed"] += [{"identifier": i, "file": key} for i in gone]
+        definitions["added"] += [{"identifier": i, "file": key} for i in new_ids]
+        for identifier in sorted(before.keys() & after.keys()):
+            if before[identifier] != after[identifier]:
+                definitions["changed"].append(
+                    {
+                        "identifier": identifier,
+                        "file": key,
+                        "components": _component_diff(before[identifier], after[identifier]),
+                    }
+                )
+    return report
+
+
+def summarize_source(source) -> dict:
+    """
+    Summarizes a source per pack without decompressing anything but manifests.
+    Args:
+        source: The source opened with open_source().
+    Returns:
+        dict: A JSON serialisable mapping of pack label to its statistics.
+    """
+    summary = {}
+    for key, size in sorted(source.entries().items()):
+        label = key.split("/", 1)[0] if "/" in key else ""
+        pack = summary.setdefault(
+            label, {"files": 0, "size": 0, "compressed_size": 0, "kinds": {}}
+        )
+        pack["files"] += 1
+        pack["size"] += size
+        pack["compressed_size"] += source.compressed_size(key)
+        kind = packs.classify(key)
+        pack["kinds"][kind] = pack["kinds"].get(kind, 0) + 1
+        if kind == "manifest":
+            try:
+                header = json_handler.loads_lenient(source.read(key)).get("header", {})
+                pack["name"] = header.get("name")
+                pack["uuid"] = header.get("uuid")
+                pack["version"] = header.get("version")
+            except (ValueError, AttributeError):
+                pass
+    return summary
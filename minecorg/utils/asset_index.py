@@ -0,0 +1,135 @@
+import json
+import os
+from pathlib import Path
+from . import packs
+from . import state
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+# Folders indexed besides the packs
+EXTRA_FOLDERS = ("scripts",)
+
+
+class AssetIndex:
+    """
+    Index of every file in the project packs, kept up to date by directory mtimes.
+    Adding, removing or renaming a file changes the mtime of its directory,
+    so a refresh only lists the directories whose mtime moved and costs one
+    stat per directory otherwise. The index is saved under .minecorg so a new
+    process starts from the previous state instead of walking the tree.
+    """
+
+    def __init__(self, project_root):
+        self.root = Path(project_root)
+        self._directories = {}
+        self._files = {}
+        self._load()
+
+    def _load(self):
+        try:
+            with open(state.state_path(self.root, INDEX_FILE), "r") as file:
+                data = json.load(file)
+            if data.get("version") == INDEX_VERSION:
+                self._directories = data["directories"]
+        except (OSError, ValueError, KeyError):
+            self._directories = {}
+
+    def save(self):
+        """Saves the index so the next process can reuse it."""
+        state.write_atomic(
+            state.state_path(self.root, INDEX_FILE),
+            json.dumps({"version": INDEX_VERSION, "directories": self._directories}),
+        )
+
+    def refresh(self) -> bool:
+        """
+        Brings the index up to date with the file system.
+        Returns:
+            bool: True if any directory changed since the last refresh.
+        """
+        seen = {}
+        changed = False
+        pending = [folder for folder in packs.PACK_FOLDERS + EXTRA_FOLDERS]
+        while pending:
+            relative = pending.pop()
+            try:
+                mtime = os.stat(self.root / relative).st_mtime_ns
+            except (FileNotFoundError, NotADirectoryError):
+                changed = changed or relative in self._directories
+                continue
+            record = self._directories.get(relative)
+            if record is None or record["mtime"] != mtime:
+                changed = True
+                files, folders = [], []
+                for entry in os.scandir(self.root / relative):
+                    if entry.name.startswith(".") or entry.name == "node_modules":
+                        continue
+                    (folders if entry.is_dir() else files).append(entry.name)
+                record = {"mtime": mtime, "files": sorted(files), "dirs": sorted(folders)}
+            seen[relative] = record
+            pending.extend(f"{relative}/{folder}" for folder in record["dirs"])
+
+        changed = changed or seen.keys() != self._directories.keys()
+        self._directories = seen
+        if changed or not self._files:
+            self._files = {
+                f"{relative}/{name}": packs.classify(f"{relative}/{name}")
+                for relative, record in seen.items()
+                for name in record["files"]
+            }
+        return changed
+
+    def files(self, kind: str | None = None) -> list:
+        """
+        Returns the project relative paths of the indexed files.
+        Args:
+            kind (str | None): Only return files of this packs.classify() kind.
+        Returns:
+            list: Sorted POSIX style paths relative to the project root.
+        """
+        return sorted(path for path, file_kind in self._files.items() if kind in (None, file_kind))
+
+    def kind(self, path: str) -> str | None:
+        """Returns the packs.classify() kind of an indexed file, None if it is not indexed."""
+        return self._files.get(path)
+
+    def find(self, name: str, kind: str | None = None) -> list:
+        """
+        Returns the files named after an asset, whatever their extension.
+        'cow' matches 'cow.json', 'cow.entity.json', 'cow.geo.json' and 'cow.png'.
+        Args:
+            name (str): The asset name, without extension.
+            kind (str | None): Only return files of this packs.classify() kind.
+        Returns:
+            list: Sorted POSIX style paths relative to the project root.
+        """
+        return [
+            path
+            for path in self.files(kind)
+            if path.rsplit("/", 1)[-1].split(".", 1)[0] == name
+        ]
+
+    def directories(self) -> dict:
+        """Returns a mapping of indexed directory to its mtime in nanoseconds."""
+        return {relative: record["mtime"] for relative, record in self._directories.items()}
+
+
+_indexes = {}
+
+
+def get_index(project_root) -> AssetIndex:
+    """
+    Returns the refreshed index of a project, shared by everything in this process.
+    Args:
+        project_root (str or Path): The project directory.
+    Returns:
+        AssetIndex: The up to date index.
+    """
+    root = Path(project_root).resolve()
+    index = _indexes.get(root)
+    if index is None:
+        index = _indexes[root] = AssetIndex(root)
+    if index.refresh():
+        index.save()
+    return index
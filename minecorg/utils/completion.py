@@ -0,0 +1,125 @@
+"""
+Shell completion of asset names.
+Everything here runs on every key press, so it only imports the standard
+library and never parses JSON: the names are kept in a plain text cache
+under .minecorg that is rebuilt when a pack directory mtime changes.
+"""
+import os
+from pathlib import Path
+from . import packs
+from . import state
+
+CACHE_FILE = "completion.cache"
+_HEADER = "# minecorg-completion 1"
+
+
+def _scan(project_root: Path):
+    """Walks the packs once, returning directory mtimes and completion values."""
+    directories, values = {}, set()
+    pending = [folder for folder in packs.PACK_FOLDERS]
+    while pending:
+        relative = pending.pop()
+        try:
+            directories[relative] = os.stat(project_root / relative).st_mtime_ns
+            entries = list(os.scandir(project_root / relative))
+        except (FileNotFoundError, NotADirectoryError):
+            continue
+        for entry in entries:
+            if entry.name.startswith(".") or entry.name == "node_modules":
+                continue
+            path = f"{relative}/{entry.name}"
+            if entry.is_dir():
+                pending.append(path)
+                continue
+            folders = relative.split("/")
+            kind = packs.classify(path)
+            stem = entry.name.split(".", 1)[0]
+            if kind in ("behavior_entity", "client_entity"):
+                values.add(("entity", stem))
+            if kind == "model":
+                values.add(("model", entry.name))
+            if kind == "texture":
+                values.add(("texture", entry.name))
+            if "blocks" in folders:
+                values.add(("block", stem))
+            if "items" in folders:
+                values.add(("item", stem))
+    return directories, values
+
+
+def _read_cache(cache_path: Path):
+    try:
+        with open(cache_path, "r", encoding="utf-8") as file:
+            lines = file.read().splitlines()
+    except OSError:
+        return None
+    if not lines or lines[0] != _HEADER:
+        return None
+    directories, values = {}, {}
+    for line in lines[1:]:
+        kind, _, value = line.partition("\t")
+        if kind == "d":
+            relative, _, mtime = value.rpartition("\t")
+            directories[relative] = int(mtime)
+        else:
+            values.setdefault(kind, []).append(value)
+    return directories, values
+
+
+def _is_fresh(project_root: Path, directories: dict) -> bool:
+    for relative, mtime in directories.items():
+        try:
+            if os.stat(project_root / relative).st_mtime_ns != mtime:
+                return False
+        except OSError:
+            return False
+    # A pack folder created after the cache was built
+    return all(folder in directories or not (project_root / folder).exists() for folder in packs.PACK_FOLDERS)
+
+
+def load_values(project_root) -> dict:
+    """
+    Returns the completion values of a project, rebuilding the cache if it is stale.
+    Args:
+        project_root (str or Path): The project directory.
+    Returns:
+        dict: A mapping of kind ('entity', 'block', 'item', 'model', 'texture')
+              to the sorted list of names.
+    """
+    project_root = Path(project_root)
+    cache_path = project_root / state.STATE_FOLDER / CACHE_FILE
+    cached = _read_cache(cache_path)
+    if cached is not None and _is_fresh(project_root, cached[0]):
+        return cached[1]
+
+    directories, found = _scan(project_root)
+    values = {}
+    for kind, value in sorted(found):
+        values.setdefault(kind, []).append(value)
+    lines = [_HEADER]
+    lines += [f"d\t{relative}\t{mtime}" for relative, mtime in directories.items()]
+    lines += [f"{kind}\t{value}" for kind, names in values.items() for value in names]
+    try:
+        state.write_atomic(state.state_path(project_root, CACHE_FILE), "\n".join(lines) + "\n")
+    except OSError:
+        # Read-only checkout, complete from the fresh scan anyway
+        pass
+    return values
+
+
+def complete(kind: str):
+    """
+    Builds a click shell_complete callback for one kind of asset.
+    Args:
+        kind (str): 'entity', 'block', 'item', 'model' or 'texture'.
+    Returns:
+        A callback for the shell_complete argument of click parameters.
+    Example:
+        >>> @click.argument("name", shell_complete=complete("entity"))
+    """
+
+    def callback(ctx, param, incomplete: str):
+        names = load_values(os.getcwd()).get(kind, [])
+        return [name for name in names if name.startswith(incomplete)]
+
+    return callback
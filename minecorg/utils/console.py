@@ -0,0 +1,20 @@
+class LazyConsole:
+    """
+    Stand-in for rich.console.Console that imports rich on first use.
+    Modules on the shell completion path print nothing, so they should not
+    pay for importing rich at import time.
+    """
+
+    def __init__(self, **kwargs):
+        self._kwargs = kwargs
+        self._console = None
+
+    def __getattr__(self, name):
+        if self._console is None:
+            from rich.console import Console
+
+            self._console = Console(**self._kwargs)
+        return getattr(self._console, name)
+
+
+console = LazyConsole()
@@ -1,10 +1,8 @@
 
 import os
 from pathlib import Path
-from rich.console import Console
-from rich.table import Table
 import click
-console = Console()
+from .console import console
 
 def find_file(folder_path:Path, file_name:str):
     """
@@ -73,6 +71,8 @@ def file_request(folder: Path, msg: str) -> str:
         console.print(
             "[bold red]Error: Multiple new files detected. Only add one.[/bold red]\n"
         )
+        from rich.table import Table
+
         table = Table(title="Detected Files")
         table.add_column("File Name", style="cyan", no_wrap=True)
         for file in files:
@@ -100,4 +100,27 @@ def find_files(folder_path):
         return [f for f in os.listdir(folder_path) if os.path.isfile(os.path.join(folder_path, f))]
     except FileNotFoundError:
         print(f"Folder {folder_path} not found")
-        return []
\ No newline at end of file
+        return []
+
+def image_size(file_path) -> tuple | None:
+    """
+    Reads the width and height of a PNG or TGA image from its header.
+    Only the first bytes are read, the image is not decoded.
+    Args:
+        file_path (str or Path): The path to the image.
+    Returns:
+        tuple | None: (width, height), or None if the format is not recognized.
+    Example:
+        >>> image_size('/path/to/texture.png')
+        (64, 32)
+    """
+    try:
+        with open(file_path, "rb") as file:
+            header = file.read(24)
+    except OSError:
+        return None
+    if header[:8] == b"\x89PNG\r\n\x1a\n" and header[12:16] == b"IHDR":
+        return int.from_bytes(header[16:20], "big"), int.from_bytes(header[20:24], "big")
+    if str(file_path).lower().endswith(".tga") and len(header) >= 16:
+        return int.from_bytes(header[12:14], "little"), int.from_bytes(header[14:16], "little")
+    return None
@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+from pathlib import Path
+from . import asset_index
+from . import state
+from . import workers
+
+CACHE_FILE = "fingerprint.json"
+CACHE_VERSION = 1
+TREES_FOLDER = "fingerprints"
+
+# Stored trees kept for --since, older ones are dropped
+MAX_TREES = 20
+
+
+def hash_file(file_path: str) -> str:
+    """Returns the sha256 of a file, runs on the worker processes for large batches."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _node_hash(files: dict, folders: dict) -> str:
+    """Hashes a directory from the names and hashes of its files and subfolders."""
+    digest = hashlib.sha256()
+    for name, file_hash in sorted(files.items()):
+        digest.update(f"f {name} {file_hash}\n".encode())
+    for name, node in sorted(folders.items()):
+        digest.update(f"d {name} {node['hash']}\n".encode())
+    return digest.hexdigest()
+
+
+def build_tree(project_root) -> dict:
+    """
+    Computes the Merkle tree of the packs and scripts of a project.
+    The file list comes from the asset index, which only lists directories
+    whose mtime moved. File hashes are cached by mtime and size, so only
+    edited files are read again, and every directory hash is the hash of its
+    children, so any edit changes the hashes on its path up to the root.
+    Args:
+        project_root (str or Path): The project directory.
+    Returns:
+        dict: The root node, each node has a 'hash', 'files' {name: hash} and 'dirs' {name: node}.
+    """
+    root = Path(project_root)
+    cache_path = state.state_path(root, "cache", CACHE_FILE)
+    try:
+        with open(cache_path, "r") as file:
+            cache = json.load(file)
+        records = cache["files"] if cache.get("version") == CACHE_VERSION else {}
+    except (OSError, ValueError, KeyError):
+        records = {}
+
+    paths = asset_index.get_index(root).files()
+    hashes, stale, stats = {}, [], {}
+    for path in paths:
+        try:
+            stat = os.stat(root / path)
+        except FileNotFoundError:
+            continue
+        stats[path] = [stat.st_mtime_ns, stat.st_size]
+        record = records.get(path)
+        if record is not None and record[:2] == stats[path]:
+            hashes[path] = record[2]
+        else:
+            stale.append(path)
+    for path, file_hash in zip(stale, workers.map_parallel(hash_file, [str(root / path) for path in stale])):
+        hashes[path] = file_hash
+
+    if stale or len(records) != len(hashes):
+        state.write_atomic(
+            cache_path,
+            json.dumps({"version": CACHE_VERSION, "files": {path: [*stats[path], hashes[path]] for path in hashes}}),
+        )
+
+    tree = {"files": {}, "dirs": {}}
+    for path, file_hash in hashes.items():
+        *folders, name = path.split("/")
+        node = tree
+        for folder in folders:
+            node = node["dirs"].setdefault(folder, {"files": {}, "dirs": {}})
+        node["files"][name] = file_hash
+
+    def finish(node):
+        for child in node["dirs"].values():
+            finish(child)
+        node["hash"] = _node_hash(node["files"], node["dirs"])
+
+    finish(tree)
+    return tree
+
+
+def subtree_hashes(tree: dict) -> dict:
+    """
+    Returns the hash of every pack folder and of the scripts folder.
+    Example:
+        >>> subtree_hashes(tree)
+        {'behavior_packs/mod': '3f2a...', 'resource_packs/mod': '9c01...', 'scripts': '77be...'}
+    """
+    hashes = {}
+    for top, node in sorted(tree["dirs"].items()):
+        if top == "scripts":
+            hashes[top] = node["hash"]
+            continue
+        for name, pack in sorted(node["dirs"].items()):
+            hashes[f"{top}/{name}"] = pack["hash"]
+        for name, file_hash in sorted(node["files"].items()):
+            hashes[f"{top}/{name}"] = file_hash
+    return hashes
+
+
+def save_tree(project_root, tree: dict):
+    """Stores a tree under its root hash so later runs can diff against it."""
+    path = state.state_path(project_root, TREES_FOLDER, f"{tree['hash']}.json")
+    folder = path.parent
+    if path.exists():
+        # Touched so the tree counts as recently used
+        os.utime(path)
+        return
+    state.write_atomic(path, json.dumps(tree))
+    stored = sorted(folder.glob("*.json"), key=lambda stored_path: stored_path.stat().st_mtime_ns)
+    for old in stored[: max(0, len(stored) - MAX_TREES)]:
+        old.unlink(missing_ok=True)
+
+
+def _is_node(node) -> bool:
+    """Whether a parsed JSON value has the shape of a tree node built by build_tree()."""
+    return (
+        isinstance(node, dict)
+        and isinstance(node.get("hash"), str)
+        and isinstance(node.get("files"), dict)
+        and all(isinstance(file_hash, str) for file_hash in node["files"].values())
+        and isinstance(node.get("dirs"), dict)
+        and all(_is_node(child) for child in node["dirs"].values())
+    )
+
+
+def read_tree(path) -> dict:
+    """
+    Reads a tree written by 'minecorg fingerprint --export', possibly on another machine.
+    Raises:
+        ValueError: If the file can not be read or does not hold a tree.
+    """
+    try:
+        with open(path, "r") as file:
+            tree = json.load(file)
+    except OSError as e:
+        raise ValueError(f"Could not read {path}: {e.strerror}")
+    except ValueError:
+        tree = None
+    if not _is_node(tree):
+        raise ValueError(f"{path} is not a fingerprint tree")
+    return tree
+
+
+def load_tree(project_root, fingerprint: str) -> dict:
+    """
+    Returns an earlier tree: the tree file at a path, or a tree stored by this
+    project under its root hash or an unambiguous prefix of it.
+    Only trees are diffable, a bare hash from another machine (a CI cache key)
+    is not, export the tree along with it and pass the file instead.
+    Raises:
+        ValueError: If the file is not a tree, or no stored tree, or more than one, matches.
+    """
+    if os.path.isfile(fingerprint):
+        return read_tree(fingerprint)
+    folder = Path(project_root, state.STATE_FOLDER, TREES_FOLDER)
+    matches = sorted(folder.glob(f"{fingerprint}*.json")) if folder.is_dir() and fingerprint.isalnum() else []
+    if len(matches) != 1:
+        problem = (
+            "matches several stored fingerprints"
+            if matches
+            else "is not a stored fingerprint, give the tree file written by --export on the machine that made it"
+        )
+        raise ValueError(f"{fingerprint} {problem}")
+    with open(matches[0], "r") as file:
+        return json.load(file)
+
+
+def diff_trees(old: dict, new: dict, prefix: str = "") -> list:
+    """
+    Lists what changed between two trees, only descending into directories
+    whose hash differs, so the cost follows the size of the change.
+    Returns:
+        list: (status, path) tuples, status is 'added', 'removed' or 'changed'.
+              A whole added or removed directory is one entry.
+    """
+    if old["hash"] == new["hash"]:
+        return []
+    changes = []
+    for name in sorted(old["files"].keys() | new["files"].keys()):
+        before, after = old["files"].get(name), new["files"].get(name)
+        if before != after:
+            status = "added" if before is None else "removed" if after is None else "changed"
+            changes.append((status, prefix + name))
+    for name in sorted(old["dirs"].keys() | new["dirs"].keys()):
+        before, after = old["dirs"].get(name), new["dirs"].get(name)
+        if before is None:
+            changes.append(("added", prefix + name + "/"))
+        elif after is None:
+            changes.append(("removed", prefix + name + "/"))
+        else:
+            changes += diff_trees(before, after, prefix + name + "/")
+    return changes
@@ -0,0 +1,97 @@
+from . import packs
+
+
+def bone_depth(bones: list) -> int:
+    """
+    Returns the length of the longest parent chain of a bone list.
+    Args:
+        bones (list): The 'bones' array of a geometry.
+    Returns:
+        int: 0 without bones, 1 when every bone is a root.
+    """
+    # A bone named with another type is skipped, a parent of another type makes a root
+    parents = {
+        bone.get("name"): bone.get("parent") if isinstance(bone.get("parent"), str) else None
+        for bone in bones
+        if isinstance(bone, dict) and isinstance(bone.get("name"), (str, type(None)))
+    }
+    depths = {}
+
+    def depth(name, seen=()):
+        if name in depths:
+            return depths[name]
+        parent = parents.get(name)
+        # A missing or cyclic parent makes the bone a root
+        if parent is None or parent not in parents or parent in seen:
+            value = 1
+        else:
+            value = depth(parent, seen + (name,)) + 1
+        depths[name] = value
+        return value
+
+    return max((depth(name) for name in parents), default=0)
+
+
+def cube_uv_faces(cube: dict) -> int:
+    """
+    Returns the number of faces a cube maps onto the texture.
+    Box UV (a [u, v] pair) maps all six faces, per-face UV maps the listed ones.
+    """
+    uv = cube.get("uv")
+    if isinstance(uv, dict):
+        return len(uv)
+    return 6
+
+
+def _typed(container: dict, key: str, kind: type, owner: str):
+    """Returns a member of a geometry, empty when missing, and rejects one of another type."""
+    if key not in container:
+        return kind()
+    value = container[key]
+    if not isinstance(value, kind):
+        raise ValueError(f"'{key}' of {owner} must be a {'list' if kind is list else 'object'}")
+    return value
+
+
+def _size(value):
+    """Returns a declared texture size, None when it is not a number."""
+    return value if isinstance(value, (int, float)) and not isinstance(value, bool) else None
+
+
+def geometry_metrics(data) -> list:
+    """
+    Measures every geometry defined in a .geo.json document.
+    Both the current ('minecraft:geometry' array) and the legacy
+    ('geometry.<name>' keys) formats are supported.
+    Args:
+        data: The parsed .geo.json document.
+    Returns:
+        list: One dict per geometry with its identifier, declared texture size,
+              bone, cube and UV face counts and bone hierarchy depth.
+    Raises:
+        ValueError: If a description, bone list or cube list has the wrong type.
+    """
+    metrics = []
+    for identifier, geometry in packs.definitions(data).items():
+        if not identifier.startswith("geometry.") or not isinstance(geometry, dict):
+            continue
+        description = _typed(geometry, "description", dict, identifier)
+        bones = [bone for bone in _typed(geometry, "bones", list, identifier) if isinstance(bone, dict)]
+        cubes = [
+            cube
+            for bone in bones
+            for cube in _typed(bone, "cubes", list, f"{identifier} bone {bone.get('name')}")
+            if isinstance(cube, dict)
+        ]
+        metrics.append(
+            {
+                "identifier": identifier,
+                "texture_width": _size(description.get("texture_width", geometry.get("texturewidth"))),
+                "texture_height": _size(description.get("texture_height", geometry.get("textureheight"))),
+                "bones": len(bones),
+                "cubes": len(cubes),
+                "uv_faces": sum(cube_uv_faces(cube) for cube in cubes),
+                "depth": bone_depth(bones),
+            }
+        )
+    return metrics
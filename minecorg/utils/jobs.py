@@ -0,0 +1,249 @@
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from pathlib import Path
+from . import state
+from . import workers
+
+JOBS_FOLDER = "jobs"
+
+# The progress line is redrawn at most this often, in seconds
+PROGRESS_INTERVAL = 0.1
+
+# Items submitted to the pool ahead of the ones being checkpointed
+WINDOW_PER_WORKER = 8
+
+
+class JobError(Exception):
+    """Raised when items of a job failed, the completed ones stay checkpointed."""
+
+    def __init__(self, failures: dict):
+        self.failures = failures
+        first_key, first_error = next(iter(failures.items()))
+        super().__init__(f"{len(failures)} items failed, first {first_key}: {first_error}")
+
+
+class PendingJobError(Exception):
+    """
+    Raised when the journal of a job holds items done by a run with another
+    plan, which was interrupted and never finished.
+    Attributes:
+        header (dict): The journal header, with the 'label' and 'details' of the pending run.
+        done (int): The number of items that run finished.
+    """
+
+    def __init__(self, header: dict, done: int):
+        self.header = header
+        self.done = done
+        super().__init__(f"An interrupted '{header.get('label') or header.get('name')}' is pending, {done} items were done")
+
+
+def pending_job(project_root, name: str) -> dict | None:
+    """
+    Returns the journal header of an unfinished job, with its 'done' count, or None.
+    The header keeps the 'details' the job was started with, so the command
+    can rebuild the same plan and resume it.
+    """
+    try:
+        with open(state.state_path(project_root, JOBS_FOLDER, f"{name}.jsonl"), "r") as file:
+            header = json.loads(file.readline())
+            header["done"] = sum(1 for line in file if line.strip())
+    except (OSError, ValueError, TypeError):
+        return None
+    return header
+
+
+class ProgressLine:
+    """
+    One self-updating status line with the item rate and the time left.
+    On a terminal it is redrawn in place, otherwise only the final state is printed,
+    so logs of CI runs get one line per job instead of one per item.
+    """
+
+    def __init__(self, label: str, total: int, done: int = 0, stream=None):
+        self.label = label
+        self.total = total
+        self.done = done
+        self.start_done = done
+        self.started = time.monotonic()
+        self.drawn = 0.0
+        self.stream = stream or sys.stderr
+        self.live = self.stream.isatty()
+
+    def advance(self, count: int = 1):
+        self.done += count
+        now = time.monotonic()
+        if self.live and now - self.drawn >= PROGRESS_INTERVAL:
+            self.drawn = now
+            self._draw("\r", "\x1b[K")
+
+    def text(self) -> str:
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        rate = (self.done - self.start_done) / elapsed
+        left = (self.total - self.done) / rate if rate else 0
+        percent = 100 * self.done // self.total if self.total else 100
+        return (
+            f"{self.label} {self.done}/{self.total} ({percent}%) "
+            f"{rate:.1f} items/s ETA {int(left) // 60}:{int(left) % 60:02d}"
+        )
+
+    def _draw(self, prefix: str, suffix: str):
+        self.stream.write(f"{prefix}{self.text()}{suffix}")
+        self.stream.flush()
+
+    def close(self):
+        if self.live:
+            self._draw("\r", "\x1b[K\n")
+        else:
+            self._draw("", "\n")
+
+
+class Job:
+    """
+    A bulk operation whose completed items are checkpointed to a journal,
+    .minecorg/jobs/<name>.jsonl, as they finish. If the operation crashes or
+    is interrupted, running it again with the same plan skips every item the
+    journal lists, so a failure at 95% only leaves 5% of the work. The journal
+    is deleted once the job completes.
+    A journal left by a run with another plan is never dropped silently:
+    entering raises PendingJobError unless discard is set, so the command can
+    offer to resume that run (see pending_job()) or to discard it.
+    Usage:
+        with Job(root, "init", plan=digest) as job:
+            job.run(items, function, key=str)
+    """
+
+    def __init__(
+        self,
+        project_root,
+        name: str,
+        plan: str = "",
+        label: str | None = None,
+        details=None,
+        discard: bool = False,
+    ):
+        self.root = Path(project_root)
+        self.name = name
+        self.plan = plan
+        self.label = label or name
+        self.details = details
+        self.discard = discard
+        self.path = state.state_path(self.root, JOBS_FOLDER, f"{name}.jsonl")
+        self.done = set()
+        self.resumed = False
+        self._journal = None
+
+    def __enter__(self):
+        header, lines = None, []
+        try:
+            with open(self.path, "r") as file:
+                header = json.loads(file.readline())
+                lines = [line for line in file if line.strip()]
+        except (OSError, ValueError):
+            pass
+        if isinstance(header, dict) and header.get("plan") == self.plan:
+            for line in lines:
+                try:
+                    self.done.add(json.loads(line)["done"])
+                except (ValueError, KeyError, TypeError):
+                    # The last line of a crashed run can be cut short
+                    break
+        elif isinstance(header, dict) and lines and not self.discard:
+            raise PendingJobError(header, len(lines))
+        self.resumed = bool(self.done)
+        if not self.resumed:
+            header = {
+                "name": self.name,
+                "plan": self.plan,
+                "label": self.label,
+                "details": self.details,
+                "created": time.time(),
+            }
+            state.write_atomic(self.path, json.dumps(header) + "\n")
+        self._journal = open(self.path, "a")
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self._journal.close()
+        if exc_type is None:
+            self.path.unlink(missing_ok=True)
+        return False
+
+    def _checkpoint(self, key: str):
+        self.done.add(key)
+        # Flushed per item, a crash of this process loses nothing already done
+        self._journal.write(json.dumps({"done": key}) + "\n")
+        self._journal.flush()
+
+    def run(
+        self, items, function, key=str, processes: bool = False, jobs: int | None = None, label: str | None = None
+    ) -> dict:
+        """
+        Applies a function to every item not done yet, on a worker pool.
+        Args:
+            items: The work items.
+            function: Called with each item. Must be picklable when processes is True,
+                      and safe to run again on an item interrupted halfway.
+            key: Returns the journal key of an item, unique within the job.
+            processes (bool): Use worker processes for CPU bound work, threads otherwise.
+                              Below workers.PROCESS_POOL_THRESHOLD items threads are used.
+            jobs (int | None): Number of workers, defaults to the CPU count.
+            label (str | None): Text of the progress line, defaults to the job label.
+        Returns:
+            dict: The result of each item run now, by key. Skipped items are not included.
+        Raises:
+            JobError: If items failed, after every other item ran.
+            KeyboardInterrupt: On Ctrl-C, after the finished items were checkpointed.
+        """
+        items = [(key(item), item) for item in items]
+        pending = [(item_key, item) for item_key, item in items if item_key not in self.done]
+        progress = ProgressLine(label or self.label, len(items), len(items) - len(pending))
+        results, failures = {}, {}
+        if not pending:
+            progress.close()
+            return results
+
+        workers_count = jobs or os.cpu_count() or 1
+        use_processes = processes and len(pending) >= workers.PROCESS_POOL_THRESHOLD
+        executor = (ProcessPoolExecutor if use_processes else ThreadPoolExecutor)(max_workers=workers_count)
+        window = workers_count * WINDOW_PER_WORKER
+        queue = iter(pending)
+        running = {}
+        try:
+            # A bounded window of submitted items, so Ctrl-C does not wait for 20k queued ones
+            for item_key, item in queue:
+                running[executor.submit(function, item)] = item_key
+                if len(running) >= window:
+                    break
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    item_key = running.pop(future)
+                    error = future.exception()
+                    if error is None:
+                        results[item_key] = future.result()
+                        self._checkpoint(item_key)
+                    else:
+                        failures[item_key] = error
+                    progress.advance()
+                    for next_key, next_item in queue:
+                        running[executor.submit(function, next_item)] = next_key
+                        break
+        except KeyboardInterrupt:
+            for future in running:
+                future.cancel()
+            executor.shutdown(wait=True)
+            # Items that finished while shutting down are done too
+            for future, item_key in running.items():
+                if future.done() and not future.cancelled() and future.exception() is None:
+                    self._checkpoint(item_key)
+            progress.close()
+            raise
+        executor.shutdown(wait=True)
+        progress.close()
+        if failures:
+            raise JobError(failures)
+        return results
+
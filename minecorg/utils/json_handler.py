@@ -1,7 +1,10 @@
+import copy
 import json
 import os
+import re
 from pathlib import Path
 from importlib import resources
+from . import state
 
 def rename_values_from_json_data(data: dict | list, old_values: list, new_values: list):
     """
@@ -38,6 +41,10 @@ def rename_values_from_json_data(data: dict | list, old_values: list, new_values
     return _recursive_rename(data)
 
 
+# Parsed templates, templates ship with the package so they never change at runtime
+_template_cache = {}
+
+
 def import_data_from_json_file_template(file_name: str) -> dict:
     """
     Imports data from a JSON file located in the 'templates' directory.
@@ -66,10 +73,14 @@ def import_data_from_json_file_template(file_name: str) -> dict:
     #     return {}
     # return {}
     # ...
+    if file_name in _template_cache:
+        # Callers edit the returned data in place, so hand out a copy
+        return copy.deepcopy(_template_cache[file_name])
     try:
         # Use importlib.resources to access the template file
         with resources.files("minecorg.templates").joinpath(file_name).open("r", encoding="utf-8") as file:
-            return json.load(file)
+            _template_cache[file_name] = json.load(file)
+            return copy.deepcopy(_template_cache[file_name])
     except FileNotFoundError:
         print(f"File {file_name} not found in templates directory.")
         return {}
@@ -127,6 +138,30 @@ def rename_values_from_json_file(file_path: str, old_values: list, new_values: l
     # Rename the values in the JSON data
     modified_data = rename_values_from_json_data(data, old_values, new_values)
 
-    # Write the modified JSON data back to the file
-    with open(file_path, "w") as file:
-        json.dump(modified_data, file, indent=4)
\ No newline at end of file
+    # Write the modified JSON data back to the file, readers never see it half written
+    state.write_atomic(file_path, json.dumps(modified_data, indent=4))
+
+# Matches a JSON string (kept) or a // / /* */ comment (dropped)
+_COMMENT_PATTERN = re.compile(r'("(?:\\.|[^"\\])*")|//[^\n]*|/\*.*?\*/', re.S)
+
+
+def loads_lenient(text: str | bytes):
+    """
+    Parses JSON text the way Minecraft does, allowing // and /* */ comments.
+
+    Args:
+        text: The JSON text to parse.
+
+    Returns:
+        The parsed JSON data.
+
+    Raises:
+        json.JSONDecodeError: If the text is not valid JSON once comments are removed.
+    """
+    if isinstance(text, bytes):
+        text = text.decode("utf-8-sig")
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        # Only pay for the comment stripping when the fast path fails
+        return json.loads(_COMMENT_PATTERN.sub(lambda m: m.group(1) or "", text))
@@ -0,0 +1,333 @@
+import re
+
+# Supported syntax:
+#   $                 the document
+#   .name  ['name']   a key, names may contain ':' and '-' such as minecraft:health
+#   [0]  [-1]         a list index
+#   ['a', 'b']  [0,1] several keys or indexes
+#   .*  [*]           every child
+#   ..name  ..*       a key or every child, at any depth
+#   [?(filter)]       list items for which the filter is true, an object is
+#                     kept or dropped as a whole, e.g.
+#                     [?(@.value > 100 && @.max)]  [?(@.texture =~ 'zombie')]
+# Filters compare @ (the child) or $ paths with numbers, strings, true, false
+# and null using == != < <= > >= =~ (regex search), combined with && || ! ( ).
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+    (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)
+    |(?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+    |(?P<name>[A-Za-z_][\w:\-]*)
+    |(?P<op>\.\.|==|!=|<=|>=|=~|&&|\|\||\?\(|[$@.\[\]*,()<>!])
+    )""",
+    re.VERBOSE,
+)
+
+_MISSING = object()
+_COMPARISONS = ("==", "!=", "<", "<=", ">", ">=", "=~")
+
+
+class JsonPathError(ValueError):
+    """Raised for a malformed path expression, with the offset of the problem."""
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"{message} at position {offset}")
+        self.offset = offset
+
+
+def _tokenize(text: str) -> list:
+    tokens, position = [], 0
+    while position < len(text):
+        if text[position:].strip() == "":
+            break
+        match = _TOKEN.match(text, position)
+        if match is None or match.end() == position:
+            raise JsonPathError(f"Unexpected character {text[position]!r}", position)
+        kind = match.lastgroup
+        value = match.group(kind)
+        if kind == "number":
+            value = float(value) if any(c in value for c in ".eE") else int(value)
+        elif kind == "string":
+            value = re.sub(r"\\(.)", r"\1", value[1:-1])
+        tokens.append((kind, value, match.start(kind)))
+        position = match.end()
+    tokens.append(("end", None, len(text)))
+    return tokens
+
+
+class _Parser:
+    """
+    Recursive descent parser turning an expression into nested tuples.
+    A path is a tuple of steps, each step is (descend, selector) where
+    selector is ('names', keys), ('indexes', ints), ('all',) or ('filter', node).
+    """
+
+    def __init__(self, text: str):
+        self.tokens = _tokenize(text)
+        self.position = 0
+
+    def peek(self, value=None) -> bool:
+        kind, token_value, _ = self.tokens[self.position]
+        return kind == "op" and token_value == value if value is not None else kind
+
+    def next(self):
+        token = self.tokens[self.position]
+        self.position += 1
+        return token
+
+    def expect(self, value: str):
+        kind, token_value, offset = self.next()
+        if kind != "op" or token_value != value:
+            raise JsonPathError(f"Expected {value!r}", offset)
+
+    def error(self, message: str):
+        raise JsonPathError(message, self.tokens[self.position][2])
+
+    def parse(self) -> tuple:
+        steps = ()
+        if self.peek("$"):
+            self.next()
+        elif self.peek() == "name":
+            # The leading '$.' may be left out
+            steps = ((False, self.dotted()),)
+        steps += self.steps()
+        if self.peek() != "end":
+            self.error("Unexpected token")
+        return steps
+
+    def steps(self) -> tuple:
+        steps = []
+        while True:
+            if self.peek(".."):
+                self.next()
+                steps.append((True, self.bracket() if self.peek("[") else self.dotted()))
+            elif self.peek("."):
+                self.next()
+                steps.append((False, self.dotted()))
+            elif self.peek("["):
+                steps.append((False, self.bracket()))
+            else:
+                return tuple(steps)
+
+    def dotted(self) -> tuple:
+        kind, value, _ = self.next()
+        if kind == "op" and value == "*":
+            return ("all",)
+        if kind == "name":
+            return ("names", (value,))
+        if kind == "number" and isinstance(value, int) and value >= 0:
+            # Keys such as the '1.8.0' of format versions need brackets, plain integers do not
+            return ("names", (str(value),))
+        self.position -= 1
+        self.error("Expected a key")
+
+    def bracket(self) -> tuple:
+        start = self.tokens[self.position][2]
+        self.expect("[")
+        if self.peek("*"):
+            self.next()
+            self.expect("]")
+            return ("all",)
+        if self.peek("?("):
+            self.next()
+            condition = self.condition()
+            self.expect(")")
+            self.expect("]")
+            return ("filter", condition)
+        values = []
+        while True:
+            kind, value, offset = self.next()
+            if kind == "string" or (kind == "number" and isinstance(value, int)):
+                values.append(value)
+            else:
+                raise JsonPathError("Expected a quoted key or an index", offset)
+            if self.peek("]"):
+                self.next()
+                break
+            self.expect(",")
+        if all(isinstance(value, str) for value in values):
+            return ("names", tuple(values))
+        if all(isinstance(value, int) for value in values):
+            return ("indexes", tuple(values))
+        raise JsonPathError("Keys and indexes can not be mixed", start)
+
+    def condition(self) -> tuple:
+        node = self.conjunction()
+        while self.peek("||"):
+            self.next()
+            node = ("or", node, self.conjunction())
+        return node
+
+    def conjunction(self) -> tuple:
+        node = self.negation()
+        while self.peek("&&"):
+            self.next()
+            node = ("and", node, self.negation())
+        return node
+
+    def negation(self) -> tuple:
+        if self.peek("!"):
+            self.next()
+            return ("not", self.negation())
+        left = self.operand()
+        kind, value, offset = self.tokens[self.position]
+        if kind == "op" and value in _COMPARISONS:
+            self.next()
+            right_offset = self.tokens[self.position][2]
+            right = self.operand()
+            if value == "=~":
+                if right[0] != "literal" or not isinstance(right[1], str):
+                    raise JsonPathError("'=~' needs a quoted regular expression", offset)
+                try:
+                    right = ("literal", re.compile(right[1]))
+                except re.error as e:
+                    raise JsonPathError(f"Invalid regular expression: {e.msg}", right_offset)
+            return ("compare", value, left, right)
+        return left
+
+    def operand(self) -> tuple:
+        kind, value, offset = self.next()
+        if kind == "op" and value in ("@", "$"):
+            return ("path", value == "$", self.steps())
+        if kind == "op" and value == "(":
+            node = self.condition()
+            self.expect(")")
+            return node
+        if kind in ("number", "string"):
+            return ("literal", value)
+        if kind == "name" and value in ("true", "false", "null"):
+            return ("literal", {"true": True, "false": False, "null": None}[value])
+        raise JsonPathError("Expected a value, '@' or '$'", offset)
+
+
+_compiled = {}
+
+
+def compile_path(text: str) -> tuple:
+    """
+    Parses a path expression, parses are shared by the whole process.
+    Raises:
+        JsonPathError: If the expression is malformed.
+    """
+    steps = _compiled.get(text)
+    if steps is None:
+        steps = _compiled[text] = _Parser(text).parse()
+    return steps
+
+
+def _children(value):
+    if isinstance(value, dict):
+        return value.items()
+    if isinstance(value, list):
+        return enumerate(value)
+    return ()
+
+
+def _select(selector: tuple, value, root):
+    kind = selector[0]
+    if kind == "names":
+        if isinstance(value, dict):
+            for name in selector[1]:
+                if name in value:
+                    yield name, value[name]
+    elif kind == "indexes":
+        if isinstance(value, list):
+            for index in selector[1]:
+                if -len(value) <= index < len(value):
+                    yield index % len(value), value[index]
+    elif kind == "all":
+        yield from _children(value)
+    elif isinstance(value, list):
+        for key, child in enumerate(value):
+            if _truthy(_evaluate(selector[1], child, root)):
+                yield key, child
+
+
+def _walk(steps: tuple, value, root, path: tuple):
+    if not steps:
+        yield path, value
+        return
+    (descend, selector), rest = steps[0], steps[1:]
+    if selector[0] == "filter" and isinstance(value, dict):
+        # Pack documents are mostly objects, so '..components[?(@.x)]' tests the components themselves
+        if _truthy(_evaluate(selector[1], value, root)):
+            yield from _walk(rest, value, root, path)
+    else:
+        for key, child in _select(selector, value, root):
+            yield from _walk(rest, child, root, path + (key,))
+    if descend:
+        for key, child in _children(value):
+            yield from _walk(steps, child, root, path + (key,))
+
+
+def _evaluate(node: tuple, current, root):
+    kind = node[0]
+    if kind == "literal":
+        return node[1]
+    if kind == "path":
+        for _, value in _walk(node[2], root if node[1] else current, root, ()):
+            return value
+        return _MISSING
+    if kind == "not":
+        return not _truthy(_evaluate(node[1], current, root))
+    if kind == "and":
+        return _truthy(_evaluate(node[1], current, root)) and _truthy(_evaluate(node[2], current, root))
+    if kind == "or":
+        return _truthy(_evaluate(node[1], current, root)) or _truthy(_evaluate(node[2], current, root))
+    return _compare(node[1], _evaluate(node[2], current, root), _evaluate(node[3], current, root))
+
+
+def _truthy(value) -> bool:
+    # A bare path is an existence test, so a present false or 0 still counts
+    return value is not _MISSING and value is not False
+
+
+def _compare(operator: str, left, right) -> bool:
+    if left is _MISSING or right is _MISSING:
+        return False
+    if operator == "=~":
+        return isinstance(left, str) and right.search(left) is not None
+    if isinstance(left, bool) != isinstance(right, bool):
+        # JSON true is not the number 1
+        return operator == "!="
+    if operator == "==":
+        return left == right
+    if operator == "!=":
+        return left != right
+    try:
+        if operator == "<":
+            return left < right
+        if operator == "<=":
+            return left <= right
+        if operator == ">":
+            return left > right
+        return left >= right
+    except TypeError:
+        return False
+
+
+def format_path(path: tuple) -> str:
+    """
+    Returns the normalized form of a match location.
+    Example:
+        >>> format_path(('minecraft:entity', 'components', 0))
+        "$['minecraft:entity']['components'][0]"
+    """
+    return "$" + "".join(f"[{key}]" if isinstance(key, int) else f"[{key!r}]" for key in path)
+
+
+def find(expression: str, data) -> list:
+    """
+    Returns every match of a path expression in a document.
+    Args:
+        expression (str): The path expression.
+        data: The parsed JSON document.
+    Returns:
+        list: (normalized path, value) tuples, in document order.
+    Raises:
+        JsonPathError: If the expression is malformed.
+    Example:
+        >>> find("$..['minecraft:health'].value", entity)
+        [("$['minecraft:entity']['components']['minecraft:health']['value']", 20)]
+    """
+    return [(format_path(path), value) for path, value in _walk(compile_path(expression), data, data, ())]
@@ -0,0 +1,222 @@
+import os
+from pathlib import Path
+from . import asset_index
+from . import locks
+from . import state
+
+DEFAULT_LANGUAGE = "en_US"
+
+
+def entity_keys(namespace: str, name: str) -> dict:
+    """
+    Returns the lang keys of an entity with their default text.
+    Example:
+        >>> entity_keys("ns", "zombie_king")
+        {'entity.ns:zombie_king.name': 'Zombie King', 'item.spawn_egg.entity.ns:zombie_king.name': 'Zombie King Spawn Egg'}
+    """
+    title = name.replace("_", " ").title()
+    return {
+        f"entity.{namespace}:{name}.name": title,
+        f"item.spawn_egg.entity.{namespace}:{name}.name": f"{title} Spawn Egg",
+    }
+
+
+class LangFile:
+    """
+    A .lang file kept as its original lines plus an ordered key index.
+    Untouched lines, comments and blank lines are written back byte for byte,
+    new keys are appended and removed keys drop only their own line.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.lines = []
+        self.index = {}
+        self.newline = "\n"
+        self.bom = False
+        self.changed = False
+        if self.path.is_file():
+            with open(self.path, "r", encoding="utf-8", newline="") as file:
+                text = file.read()
+            self.bom = text.startswith("\ufeff")
+            text = text.removeprefix("\ufeff")
+            if "\r\n" in text:
+                self.newline = "\r\n"
+            self.lines = text.splitlines()
+            for number, line in enumerate(self.lines):
+                key = self.key_of(line)
+                if key is not None:
+                    self.index.setdefault(key, number)
+
+    @staticmethod
+    def key_of(line: str) -> str | None:
+        stripped = line.strip()
+        if not stripped or stripped.startswith("##") or "=" not in stripped:
+            return None
+        return stripped.split("=", 1)[0].strip()
+
+    def get(self, key: str) -> str | None:
+        number = self.index.get(key)
+        if number is None:
+            return None
+        value = self.lines[number].split("=", 1)[1]
+        # Text after a tab and '##' is a comment
+        return value.split("\t##", 1)[0].rstrip()
+
+    def add(self, key: str, value: str) -> bool:
+        """Appends a key unless it exists. Returns True if the file changed."""
+        if key in self.index:
+            return False
+        self.index[key] = len(self.lines)
+        self.lines.append(f"{key}={value}")
+        self.changed = True
+        return True
+
+    def rename(self, old: str, new: str, value: str | None = None) -> bool:
+        """
+        Renames a key in place, keeping its line position and comment.
+        Args:
+            old (str): The current key.
+            new (str): The new key, nothing happens if it already exists.
+            value (str | None): A new value, None keeps the current one.
+        Returns:
+            bool: True if the file changed.
+        """
+        number = self.index.get(old)
+        if number is None or new in self.index:
+            return False
+        line = self.lines[number]
+        current = line.split("=", 1)[1]
+        comment = ""
+        if "\t##" in current:
+            current, comment = current.split("\t##", 1)
+            comment = "\t##" + comment
+        self.lines[number] = f"{new}={current.rstrip() if value is None else value}{comment}"
+        del self.index[old]
+        self.index[new] = number
+        self.changed = True
+        return True
+
+    def remove(self, key: str) -> bool:
+        """Deletes the line of a key. Returns True if the file changed."""
+        number = self.index.pop(key, None)
+        if number is None:
+            return False
+        del self.lines[number]
+        self.index = {k: n - 1 if n > number else n for k, n in self.index.items()}
+        self.changed = True
+        return True
+
+    def save(self):
+        """Writes the file through an atomic replace, only if it changed."""
+        if not self.changed:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        text = "".join(line + self.newline for line in self.lines)
+        # Bytes are written as they are, so the newlines and the BOM are kept
+        state.write_atomic(self.path, text.encode("utf-8-sig" if self.bom else "utf-8"))
+        self.changed = False
+
+
+# Parsed lang files of this process, by path, with the mtime they were read at
+_loaded = {}
+
+
+def load(path: Path) -> LangFile:
+    """
+    Returns a parsed lang file, reusing the parse while the file is unchanged on disk.
+    """
+    path = Path(path)
+    try:
+        mtime = os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        mtime = None
+    cached = _loaded.get(path)
+    if cached is not None and cached[0] == mtime and not cached[1].changed:
+        return cached[1]
+    lang_file = LangFile(path)
+    _loaded[path] = (mtime, lang_file)
+    return lang_file
+
+
+def _apply(lang_file: LangFile, operation: tuple):
+    """Applies one queued LangManager change to a file."""
+    action, *names = operation
+    if action == "add":
+        for key, value in entity_keys(*names).items():
+            lang_file.add(key, value)
+    elif action == "remove":
+        for key in entity_keys(*names):
+            lang_file.remove(key)
+    else:
+        old_namespace, old_name, new_namespace, new_name = names
+        old_keys = entity_keys(old_namespace, old_name)
+        new_keys = entity_keys(new_namespace, new_name)
+        for (old_key, old_default), (new_key, new_default) in zip(old_keys.items(), new_keys.items()):
+            # Generated text follows the new name, translated text is kept
+            value = new_default if lang_file.get(old_key) == old_default else None
+            if lang_file.rename(old_key, new_key, value):
+                continue
+            if new_key in lang_file.index:
+                lang_file.remove(old_key)
+            else:
+                lang_file.add(new_key, new_default)
+
+
+class LangManager:
+    """
+    Merges the lang keys of new, renamed and removed entities into every
+    language file of a project. Changes are queued in memory and commit()
+    writes each changed file once, so generating thousands of entities
+    rewrites each language file a single time.
+    """
+
+    def __init__(self, project_root, mod_name: str | None = None):
+        self.root = Path(project_root)
+        paths = [self.root / path for path in asset_index.get_index(self.root).files("lang")]
+        if not paths:
+            # Projects made by 'minecorg init' have resource_packs/<mod>/texts, older ones only resource_packs
+            base = self.root / "resource_packs"
+            if mod_name and mod_name.strip() and (base / mod_name).is_dir():
+                base = base / mod_name
+            paths = [base / "texts" / f"{DEFAULT_LANGUAGE}.lang"]
+        self.files = [load(path) for path in sorted(paths)]
+        self.operations = []
+
+    def add_entity(self, namespace: str, name: str):
+        self._queue("add", namespace, name)
+
+    def rename_entity(self, old_namespace: str, old_name: str, new_namespace: str, new_name: str):
+        self._queue("rename", old_namespace, old_name, new_namespace, new_name)
+
+    def remove_entity(self, namespace: str, name: str):
+        self._queue("remove", namespace, name)
+
+    def _queue(self, *operation):
+        self.operations.append(operation)
+        for lang_file in self.files:
+            _apply(lang_file, operation)
+
+    def changed_paths(self) -> list:
+        """Returns the files commit() will write."""
+        return [lang_file.path for lang_file in self.files if lang_file.changed]
+
+    def commit(self) -> list:
+        """
+        Writes every changed language file once.
+        Returns:
+            list: The written paths.
+        """
+        written = self.changed_paths()
+        for lang_file in self.files:
+            if not lang_file.changed:
+                continue
+            # Replayed on a fresh read under the lock, names another process added meanwhile are kept
+            with locks.asset_lock(self.root, lang_file.path):
+                fresh = LangFile(lang_file.path)
+                for operation in self.operations:
+                    _apply(fresh, operation)
+                fresh.save()
+            lang_file.changed = False
+        self.operations = []
+        return written
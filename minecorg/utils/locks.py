@@ -0,0 +1,112 @@
+import hashlib
+import os
+import threading
+from contextlib import ExitStack, contextmanager
+from pathlib import Path
+from . import state
+
+try:
+    import fcntl
+except ImportError:
+    # Windows has no fcntl, locking is skipped there
+    fcntl = None
+
+LOCKS_FOLDER = "locks"
+PROJECT_LOCK = "project.lock"
+
+_guard = threading.Lock()
+# Project locks held by this process, by project root: [lock file, exclusive, depth]
+_held = {}
+
+
+def _lock_file(root: Path, name: str):
+    # Lock files are never deleted, removing one while another process waits on it breaks the lock
+    return open(state.state_path(root, LOCKS_FOLDER, name), "a+")
+
+
+@contextmanager
+def project_lock(project_root, exclusive: bool = False):
+    """
+    Holds the project read/write lock.
+    Commands that move, delete or regenerate many files take it exclusive,
+    everything else that reads or writes the project takes it shared, so any
+    number of generating, validating and building processes run together and
+    a structural operation waits for them and blocks them while it runs.
+    The lock is held per process: once a command holds it, the threads it
+    starts, and nested shared requests, go through without waiting.
+    Args:
+        project_root (str or Path): The project directory.
+        exclusive (bool): Take the lock for a structural operation.
+    Raises:
+        RuntimeError: If the process holds the lock shared and asks for it exclusive.
+    """
+    if fcntl is None:
+        yield
+        return
+    root = Path(project_root).resolve()
+    with _guard:
+        held = _held.get(root)
+        if held is None:
+            file = _lock_file(root, PROJECT_LOCK)
+            # Taken under the guard, other threads of this process wait here and then nest
+            fcntl.flock(file, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            held = _held[root] = [file, exclusive, 0]
+        elif exclusive and not held[1]:
+            raise RuntimeError("The project lock is held shared and can not be upgraded")
+        held[2] += 1
+    try:
+        yield
+    finally:
+        with _guard:
+            held[2] -= 1
+            if held[2] == 0:
+                fcntl.flock(held[0], fcntl.LOCK_UN)
+                held[0].close()
+                del _held[root]
+
+
+def _asset_lock_name(relative: str) -> str:
+    return hashlib.sha1(relative.encode()).hexdigest()[:20] + ".lock"
+
+
+@contextmanager
+def asset_lock(project_root, path):
+    """
+    Holds the exclusive lock of one asset, or of a subtree when given a folder,
+    along with the shared project lock. Hold it across a read, modify, write
+    of a file so concurrent processes never lose each other's changes.
+    Every folder above the asset is locked shared on the way down, always from
+    the top, so a folder lock waits for the locks taken inside it and blocks
+    new ones, while locks of sibling assets never wait for each other.
+    Asset locks are not reentrant, a thread must not take the same one twice,
+    nor lock a folder while it holds a lock inside that folder.
+    Args:
+        project_root (str or Path): The project directory.
+        path (str or Path): The asset or folder, absolute or relative to the project.
+    """
+    if fcntl is None:
+        yield
+        return
+    root = Path(project_root).resolve()
+    relative = os.path.relpath(Path(root, path).resolve(), root).replace(os.sep, "/")
+    parts = relative.split("/")
+    with project_lock(root), ExitStack() as stack:
+        # The project itself is covered by the project lock
+        for depth in range(1, len(parts) + 1):
+            target = depth == len(parts)
+            file = stack.enter_context(_lock_file(root, _asset_lock_name("/".join(parts[:depth]))))
+            fcntl.flock(file, fcntl.LOCK_EX if target else fcntl.LOCK_SH)
+            stack.callback(fcntl.flock, file, fcntl.LOCK_UN)
+        yield
+
+
+def write_locked(project_root, path, data: str | bytes):
+    """
+    Writes a file atomically while holding its asset lock.
+    Args:
+        project_root (str or Path): The project directory.
+        path (str or Path): The file to write, absolute or relative to the project.
+        data (str or bytes): The new content, text is written as UTF-8.
+    """
+    with asset_lock(project_root, path):
+        state.write_atomic(Path(project_root, path), data)
@@ -0,0 +1,448 @@
+import re
+
+# Short forms accepted by the game for the name roots
+ALIASES = {"q": "query", "v": "variable", "t": "temp", "c": "context"}
+ROOTS = {"query", "variable", "temp", "context", "math", "geometry", "material", "texture", "array"}
+KEYWORDS = {"return", "break", "continue", "this", "loop", "for_each"}
+
+# Variables the game sets on its own, they are read without being assigned
+BUILTIN_VARIABLES = {
+    "variable.attack_time",
+    "variable.is_first_person",
+    "variable.is_paperdoll",
+    "variable.is_brandishing_spear",
+    "variable.is_holding_left",
+    "variable.is_holding_right",
+    "variable.is_using_vr",
+    "variable.swim_amount",
+    "variable.gliding_speed_value",
+    "variable.player_x_rotation",
+    "variable.short_arm_offset_left",
+    "variable.short_arm_offset_right",
+    "variable.bob_animation",
+    "variable.map_angle",
+    "variable.item_use_normalized",
+    "variable.charge_amount",
+}
+
+# Queries that walk the world or the inventory, with their relative cost
+EXPENSIVE_QUERIES = {
+    "query.get_nearby_entities": 40,
+    "query.get_nearby_entities_except_self": 40,
+    "query.block_neighbor_has_any_tag": 10,
+    "query.block_neighbor_has_all_tags": 10,
+    "query.relative_block_has_any_tag": 10,
+    "query.relative_block_has_all_tags": 10,
+    "query.has_biome_tag": 10,
+    "query.is_item_name_any": 8,
+    "query.equipped_item_any_tag": 8,
+    "query.equipped_item_all_tags": 8,
+    "query.get_equipped_item_name": 8,
+    "query.is_name_any": 5,
+    "query.get_name": 5,
+}
+RANDOM_FUNCTIONS = {"math.random", "math.random_integer", "math.die_roll", "math.die_roll_integer"}
+
+# Iterations assumed for loops whose count is not a literal, and the cap of literal counts
+UNKNOWN_ITERATIONS = 16
+MAX_ITERATIONS = 1024
+
+_TOKEN_PATTERN = re.compile(
+    r"""\s*(?:
+    (?P<number>(?:\d+(?:\.\d*)?|\.\d+)(?:[eE][+-]?\d+)?f?)
+    |(?P<string>'[^']*')
+    |(?P<name>[A-Za-z_]\w*(?:\.[A-Za-z_]\w*)*)
+    |(?P<op>->|&&|\|\||==|!=|<=|>=|\?\?|[-+*/()\[\]{},;?:!<>=])
+    )""",
+    re.VERBOSE,
+)
+
+# Left and right binding powers of the infix operators, higher binds tighter
+_INFIX = {
+    "=": (2, 1),
+    "?": (4, 3),
+    "??": (6, 5),
+    "||": (7, 8),
+    "&&": (9, 10),
+    "==": (11, 12),
+    "!=": (11, 12),
+    "<": (13, 14),
+    ">": (13, 14),
+    "<=": (13, 14),
+    ">=": (13, 14),
+    "+": (15, 16),
+    "-": (15, 16),
+    "*": (17, 18),
+    "/": (17, 18),
+    "->": (21, 22),
+}
+_PREFIX_POWER = 19
+_INDEX_POWER = 23
+
+
+class MolangError(ValueError):
+    """
+    A Molang expression that does not parse.
+    Args:
+        message (str): What is wrong.
+        offset (int): The character offset of the problem in the expression.
+    """
+
+    def __init__(self, message: str, offset: int):
+        super().__init__(f"{message} at column {offset + 1}")
+        self.offset = offset
+
+
+def normalize_name(name: str) -> str:
+    """
+    Lowercases a name and expands its short root, 'q.Is_Baby' -> 'query.is_baby'.
+    """
+    root, dot, rest = name.lower().partition(".")
+    return ALIASES.get(root, root) + dot + rest
+
+
+def tokenize(text: str) -> list:
+    """
+    Splits an expression into (kind, value, offset) tuples.
+    Kinds are 'number', 'string', 'name', 'op' and a final 'end'.
+    Raises:
+        MolangError: On a character that starts no token.
+    """
+    tokens = []
+    position = 0
+    while True:
+        match = _TOKEN_PATTERN.match(text, position)
+        if match is None or match.lastgroup is None:
+            rest = len(text) - len(text[position:].lstrip())
+            if rest == len(text):
+                tokens.append(("end", None, len(text)))
+                return tokens
+            raise MolangError(f"unexpected character {text[rest]!r}", rest)
+        tokens.append((match.lastgroup, match.group(match.lastgroup), match.start(match.lastgroup)))
+        position = match.end()
+
+
+class _Parser:
+    """
+    Pratt parser producing nested tuples:
+    ('num', value), ('str', text), ('name', name), ('this',), ('break',), ('continue',),
+    ('call', name, args), ('unary', op, operand), ('binary', op, left, right),
+    ('ternary', condition, then, otherwise), ('assign', name, value),
+    ('index', target, index), ('return', value) and ('block', statements).
+    """
+
+    def __init__(self, text: str):
+        self.tokens = tokenize(text)
+        self.position = 0
+
+    def peek(self):
+        return self.tokens[self.position]
+
+    def advance(self):
+        token = self.tokens[self.position]
+        if token[0] != "end":
+            self.position += 1
+        return token
+
+    def at(self, value) -> bool:
+        kind, token_value, _ = self.peek()
+        return kind == "op" and token_value == value
+
+    def expect(self, value):
+        kind, token_value, offset = self.advance()
+        if kind != "op" or token_value != value:
+            found = "end of expression" if kind == "end" else repr(token_value)
+            raise MolangError(f"expected {value!r} but found {found}", offset)
+
+    def program(self):
+        statements = self.statements(closing=None)
+        kind, value, offset = self.peek()
+        if kind != "end":
+            raise MolangError(f"unexpected {value!r}", offset)
+        if not statements:
+            raise MolangError("empty expression", offset)
+        return statements[0] if len(statements) == 1 else _intern(("block", tuple(statements)))
+
+    def statements(self, closing):
+        statements = []
+        while True:
+            if self.peek()[0] == "end" or (closing and self.at(closing)):
+                return statements
+            if self.at(";"):
+                self.advance()
+                continue
+            statements.append(self.statement())
+            if not (self.at(";") or self.peek()[0] == "end" or (closing and self.at(closing))):
+                raise MolangError("expected ';'", self.peek()[2])
+
+    def statement(self):
+        kind, value, _ = self.peek()
+        if kind == "name" and value.lower() == "return":
+            self.advance()
+            return _intern(("return", self.expression(0)))
+        if kind == "name" and value.lower() in ("break", "continue"):
+            self.advance()
+            return _intern((value.lower(),))
+        return self.expression(0)
+
+    def expression(self, min_power: int):
+        left = self.prefix()
+        while True:
+            kind, value, offset = self.peek()
+            if kind != "op":
+                return left
+            if value == "[":
+                if _INDEX_POWER < min_power:
+                    return left
+                self.advance()
+                index = self.expression(0)
+                self.expect("]")
+                left = _intern(("index", left, index))
+                continue
+            powers = _INFIX.get(value)
+            if powers is None or powers[0] < min_power:
+                return left
+            self.advance()
+            if value == "=":
+                if left[0] != "name" or not left[1].startswith(("variable.", "temp.", "context.")):
+                    raise MolangError("only variables can be assigned", offset)
+                left = _intern(("assign", left[1], self.expression(powers[1])))
+            elif value == "?":
+                then = self.expression(0)
+                otherwise = None
+                if self.at(":"):
+                    self.advance()
+                    # Down to '=' so a branch can assign, 'c ? v.a = 1 : v.a = 2'
+                    otherwise = self.expression(_INFIX["="][0])
+                left = _intern(("ternary", left, then, otherwise))
+            else:
+                left = _intern(("binary", value, left, self.expression(powers[1])))
+
+    def prefix(self):
+        kind, value, offset = self.advance()
+        if kind == "number":
+            return _intern(("num", float(value.rstrip("fF"))))
+        if kind == "string":
+            return _intern(("str", value[1:-1]))
+        if kind == "name":
+            name = normalize_name(value)
+            if name == "this":
+                return _intern(("this",))
+            if self.at("("):
+                self.advance()
+                arguments = []
+                while not self.at(")"):
+                    arguments.append(self.expression(0))
+                    if not self.at(")"):
+                        self.expect(",")
+                self.advance()
+                return _intern(("call", name, tuple(arguments)))
+            if name in KEYWORDS:
+                raise MolangError(f"unexpected keyword {value!r}", offset)
+            if name.split(".", 1)[0] not in ROOTS or "." not in name:
+                raise MolangError(f"unknown name {value!r}", offset)
+            return _intern(("name", name))
+        if kind == "op" and value == "(":
+            inner = self.expression(0)
+            self.expect(")")
+            return inner
+        if kind == "op" and value == "{":
+            statements = self.statements(closing="}")
+            self.expect("}")
+            return _intern(("block", tuple(statements)))
+        if kind == "op" and value in ("-", "!"):
+            return _intern(("unary", value, self.expression(_PREFIX_POWER)))
+        if kind == "end":
+            raise MolangError("unexpected end of expression", offset)
+        raise MolangError(f"unexpected {value!r}", offset)
+
+
+# Every distinct node is kept once, so repeated sub-expressions share one tuple
+_NODES = {}
+# Expression text -> root node, or the MolangError it raised
+_PARSED = {}
+# id of an interned node -> its analysis, valid because interned nodes are never freed
+_ANALYSES = {}
+
+
+def _intern(node: tuple) -> tuple:
+    return _NODES.setdefault(node, node)
+
+
+def parse(text: str) -> tuple:
+    """
+    Parses a Molang expression into an interned tuple tree.
+    The result is remembered by expression text, packs repeat the same
+    expressions thousands of times and each of them is parsed only once.
+    Args:
+        text (str): The expression, simple or with ';' separated statements.
+    Returns:
+        tuple: The root node, see _Parser for the node shapes.
+    Raises:
+        MolangError: If the expression is not valid Molang.
+    """
+    parsed = _PARSED.get(text)
+    if parsed is None:
+        try:
+            parsed = _Parser(text).program()
+        except MolangError as e:
+            parsed = e
+        _PARSED[text] = parsed
+    if isinstance(parsed, MolangError):
+        raise parsed
+    return parsed
+
+
+def analyze(node: tuple) -> dict:
+    """
+    Statically measures a parsed expression.
+    Args:
+        node (tuple): A node returned by parse().
+    Returns:
+        dict: The variables it reads and writes, the queries and functions it
+              calls, whether it loops or draws random numbers, and its cost,
+              a weighted node count where loops multiply their body.
+    """
+    known = _ANALYSES.get(id(node))
+    if known is not None:
+        return known
+
+    result = {"reads": set(), "writes": set(), "calls": set(), "loops": False, "random": False, "cost": 1}
+    kind = node[0]
+    children = ()
+    if kind == "name":
+        if node[1].startswith("variable."):
+            result["reads"].add(node[1])
+        elif node[1].startswith("query."):
+            result["calls"].add(node[1])
+            result["cost"] = 2
+    elif kind == "assign":
+        if node[1].startswith("variable."):
+            result["writes"].add(node[1])
+        children = (node[2],)
+    elif kind == "call":
+        name, children = node[1], node[2]
+        result["calls"].add(name)
+        result["random"] = name in RANDOM_FUNCTIONS
+        result["cost"] = EXPENSIVE_QUERIES.get(name, 2 if name.startswith("query.") else 1)
+    elif kind in ("unary", "return"):
+        children = (node[-1],)
+    elif kind in ("binary", "index"):
+        children = node[-2:]
+    elif kind == "ternary":
+        children = tuple(child for child in node[1:] if child is not None)
+    elif kind == "block":
+        children = node[1]
+
+    for child in children:
+        child_result = analyze(child)
+        for key in ("reads", "writes", "calls"):
+            result[key] |= child_result[key]
+        result["loops"] = result["loops"] or child_result["loops"]
+        result["random"] = result["random"] or child_result["random"]
+        result["cost"] += child_result["cost"]
+
+    if kind == "call" and node[1] in ("loop", "for_each") and node[2]:
+        result["loops"] = True
+        count = node[2][0]
+        if node[1] == "loop" and count[0] == "num":
+            iterations = min(max(int(count[1]), 0), MAX_ITERATIONS)
+        else:
+            iterations = UNKNOWN_ITERATIONS
+        result["cost"] += analyze(node[2][-1])["cost"] * (iterations - 1)
+
+    _ANALYSES[id(node)] = result
+    return result
+
+
+def _strings(value, path: str):
+    """Yields (json path, string) for the strings of a value, a list or a dict of them."""
+    if isinstance(value, str):
+        # Slash commands and '@s' events share the lists of expressions
+        if value.strip() and not value.lstrip().startswith(("/", "@")):
+            yield path, value
+    elif isinstance(value, list):
+        for index, item in enumerate(value):
+            yield from _strings(item, f"{path}[{index}]")
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key != "lerp_mode":
+                yield from _strings(item, f"{path}.{key}")
+
+
+def _conditions(items, path: str):
+    """Yields the conditions of an ['name', {'name': 'condition'}] list."""
+    for index, item in enumerate(items if isinstance(items, list) else []):
+        if isinstance(item, dict):
+            for key, condition in item.items():
+                yield from _strings(condition, f"{path}[{index}].{key}")
+
+
+def expressions(kind: str, data) -> list:
+    """
+    Finds the Molang expressions of a pack file.
+    Args:
+        kind (str): The kind returned by packs.classify().
+        data: The parsed JSON document.
+    Returns:
+        list: (json path, expression, per frame) tuples. Per frame expressions
+              are evaluated every rendered frame, the others once per event.
+    """
+    found = []
+    if not isinstance(data, dict):
+        return found
+
+    if kind == "client_entity":
+        description = data.get("minecraft:client_entity", {}).get("description", {})
+        base = "$.minecraft:client_entity.description"
+        scripts = description.get("scripts", {})
+        if isinstance(scripts, dict):
+            for key, value in scripts.items():
+                path = f"{base}.scripts.{key}"
+                if key == "initialize":
+                    found += [(p, e, False) for p, e in _strings(value, path)]
+                elif key == "animate":
+                    found += [(p, e, True) for p, e in _conditions(value, path)]
+                elif key != "variables":
+                    found += [(p, e, True) for p, e in _strings(value, path)]
+        found += [(p, e, True) for p, e in _conditions(description.get("render_controllers"), f"{base}.render_controllers")]
+
+    elif kind == "render_controller":
+        for name, controller in data.get("render_controllers", {}).items():
+            if not isinstance(controller, dict):
+                continue
+            for key, value in controller.items():
+                # Arrays list resource names, everything else is evaluated while rendering
+                if key != "arrays" and not isinstance(value, bool):
+                    found += [(p, e, True) for p, e in _strings(value, f"$.render_controllers.{name}.{key}")]
+
+    elif kind == "animation_controller":
+        for name, controller in data.get("animation_controllers", {}).items():
+            states = controller.get("states", {}) if isinstance(controller, dict) else {}
+            for state_name, state in states.items():
+                if not isinstance(state, dict):
+                    continue
+                path = f"$.animation_controllers.{name}.states.{state_name}"
+                found += [(p, e, True) for p, e in _conditions(state.get("transitions"), f"{path}.transitions")]
+                found += [(p, e, True) for p, e in _conditions(state.get("animations"), f"{path}.animations")]
+                for key in ("on_entry", "on_exit"):
+                    found += [(p, e, False) for p, e in _strings(state.get(key), f"{path}.{key}")]
+
+    elif kind == "animation":
+        for name, animation in data.get("animations", {}).items():
+            if not isinstance(animation, dict):
+                continue
+            path = f"$.animations.{name}"
+            for key in ("anim_time_update", "blend_weight"):
+                found += [(p, e, True) for p, e in _strings(animation.get(key), f"{path}.{key}")]
+            for key in ("start_delay", "loop_delay"):
+                found += [(p, e, False) for p, e in _strings(animation.get(key), f"{path}.{key}")]
+            found += [(p, e, False) for p, e in _strings(animation.get("timeline"), f"{path}.timeline")]
+            for bone_name, bone in animation.get("bones", {}).items():
+                if not isinstance(bone, dict):
+                    continue
+                for key in ("rotation", "position", "scale"):
+                    # Keyframe times are keys, so only the values are collected
+                    found += [(p, e, True) for p, e in _strings(bone.get(key), f"{path}.bones.{bone_name}.{key}")]
+
+    return found
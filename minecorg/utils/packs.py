@@ -0,0 +1,172 @@
+import os
+from pathlib import Path
+
+# Top level folders of a MINECORG project that hold add-on content
+PACK_FOLDERS = ("behavior_packs", "resource_packs")
+
+# Top level keys of the documents that define a single object
+DEFINITION_KEYS = (
+    "minecraft:entity",
+    "minecraft:client_entity",
+    "minecraft:item",
+    "minecraft:block",
+    "minecraft:attachable",
+)
+
+# Top level keys of the documents that define many objects by name
+NAMED_DEFINITION_KEYS = (
+    "render_controllers",
+    "animations",
+    "animation_controllers",
+)
+
+TEXTURE_EXTENSIONS = (".png", ".tga", ".jpg", ".jpeg")
+
+
+def classify(path: str) -> str:
+    """
+    Returns the kind of asset stored at a path inside a pack.
+    Only the path is used, so this is safe to call for archive entries
+    that have not been decompressed.
+    Args:
+        path (str): A file path, relative or absolute, using any separator.
+    Returns:
+        str: One of 'manifest', 'model', 'client_entity', 'behavior_entity',
+             'render_controller', 'animation', 'animation_controller',
+             'texture_registry', 'texture', 'lang', 'item', 'block',
+             'loot_table', 'script', 'json' or 'other'.
+    Example:
+        >>> classify('resource_packs/mod/models/entity/cow.geo.json')
+        'model'
+    """
+    # Same parts as PurePosixPath, without its cost on indexes of many thousand files
+    parts = [part for part in path.replace("\\", "/").lower().split("/") if part and part != "."]
+    if not parts:
+        return "other"
+    name, folders = parts[-1], parts[:-1]
+
+    if name == "manifest.json":
+        return "manifest"
+    if name.endswith(".geo.json"):
+        return "model"
+    if name.endswith(".entity.json"):
+        return "client_entity"
+    if name.endswith((".render_controller.json", ".render_controllers.json")):
+        return "render_controller"
+    if name in ("item_texture.json", "terrain_texture.json", "flipbook_textures.json"):
+        return "texture_registry"
+    if name.endswith(".lang"):
+        return "lang"
+    if name.endswith(TEXTURE_EXTENSIONS):
+        return "texture"
+    if name.endswith((".ts", ".js")):
+        return "script"
+    if not name.endswith(".json"):
+        return "other"
+    if "render_controllers" in folders:
+        return "render_controller"
+    if "animation_controllers" in folders:
+        return "animation_controller"
+    if "animations" in folders:
+        return "animation"
+    if "models" in folders:
+        return "model"
+    if "entities" in folders:
+        return "behavior_entity"
+    if "entity" in folders:
+        return "client_entity"
+    if "items" in folders:
+        return "item"
+    if "blocks" in folders:
+        return "block"
+    if "loot_tables" in folders:
+        return "loot_table"
+    return "json"
+
+
+def _identifier(body: dict) -> str | None:
+    """Returns the description identifier of a definition, None if it is missing or malformed."""
+    description = body.get("description")
+    identifier = description.get("identifier") if isinstance(description, dict) else None
+    return identifier if isinstance(identifier, str) else None
+
+
+def definitions(data) -> dict:
+    """
+    Collects the objects defined by a pack JSON document, keyed by identifier.
+    Args:
+        data: The parsed JSON document.
+    Returns:
+        dict: A mapping of identifier to the JSON body that defines it.
+    Example:
+        >>> definitions({"minecraft:entity": {"description": {"identifier": "ns:cow"}}})
+        {'ns:cow': {'description': {'identifier': 'ns:cow'}}}
+    """
+    found = {}
+    if not isinstance(data, dict):
+        return found
+
+    for key in DEFINITION_KEYS:
+        body = data.get(key)
+        if isinstance(body, dict):
+            identifier = _identifier(body)
+            if identifier:
+                found[identifier] = body
+
+    geometries = data.get("minecraft:geometry")
+    if isinstance(geometries, list):
+        for geometry in geometries:
+            if isinstance(geometry, dict):
+                identifier = _identifier(geometry)
+                if identifier:
+                    found[identifier] = geometry
+    # Legacy geometry files use the identifier as the key
+    for key, body in data.items():
+        if key.startswith("geometry.") and isinstance(body, dict):
+            found[key] = body
+
+    for key in NAMED_DEFINITION_KEYS:
+        bodies = data.get(key)
+        if isinstance(bodies, dict):
+            for name, body in bodies.items():
+                found[name] = body
+    return found
+
+
+def components(definition) -> dict:
+    """
+    Flattens a definition into the named parts that are compared between versions.
+    Behavior files expose their 'components', everything else exposes its
+    top level keys plus the description fields other than the identifier.
+    Args:
+        definition: A JSON body returned by definitions().
+    Returns:
+        dict: A mapping of component name to its value.
+    """
+    if not isinstance(definition, dict):
+        return {}
+    if isinstance(definition.get("components"), dict):
+        return definition["components"]
+    flat = {k: v for k, v in definition.items() if k != "description"}
+    description = definition.get("description", {})
+    if isinstance(description, dict):
+        flat.update({k: v for k, v in description.items() if k != "identifier"})
+    return flat
+
+
+def iter_pack_files(project_root: Path, suffixes=(".json",)):
+    """
+    Yields every file of the project packs whose name ends with one of the suffixes.
+    Hidden folders (such as .minecorg) and node_modules are skipped.
+    Args:
+        project_root (Path): The project directory holding behavior_packs and resource_packs.
+        suffixes (tuple): The file name endings to keep, None keeps every file.
+    Yields:
+        Path: The path of each matching file.
+    """
+    for folder in PACK_FOLDERS:
+        for dirpath, dirnames, filenames in os.walk(Path(project_root) / folder):
+            dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
+            for filename in filenames:
+                if suffixes is None or filename.lower().endswith(suffixes):
+                    yield Path(dirpath) / filename
@@ -0,0 +1,131 @@
+import json
+import os
+import re
+from pathlib import Path
+from . import asset_index
+from . import state
+from . import workers
+
+INDEX_FILE = "references.json"
+INDEX_VERSION = 1
+
+# Every JSON string literal
+_STRING_PATTERN = re.compile(r'"((?:[^"\\]|\\.)*)"')
+
+# The strings that tie a file to an entity, as written by 'minecorg new entity'
+_NAME_PATTERNS = (
+    re.compile(r"^(?!minecraft:)[\w.\-]+:([\w\-]+)$"),
+    re.compile(r"^geometry\.([\w\-]+)$"),
+    re.compile(r"^controller\.render\.([\w\-]+)$"),
+    re.compile(r"^textures/entity/([\w\-]+)$"),
+    re.compile(r"^animation\.([\w\-]+)\."),
+    re.compile(r"^controller\.animation\.([\w\-]+)\."),
+)
+
+
+def referenced_names(text: str) -> list:
+    """
+    Returns the entity names a JSON text refers to.
+    Only string literals are looked at, the text is not parsed as JSON.
+    Args:
+        text (str): The content of a JSON file.
+    Returns:
+        list: The sorted entity names.
+    Example:
+        >>> referenced_names('{"geometry": {"default": "geometry.cow"}}')
+        ['cow']
+    """
+    names = set()
+    for literal in set(_STRING_PATTERN.findall(text)):
+        for pattern in _NAME_PATTERNS:
+            match = pattern.match(literal)
+            if match:
+                names.add(match.group(1))
+                break
+    return sorted(names)
+
+
+def _scan_file(path: str) -> list:
+    try:
+        with open(path, "r", encoding="utf-8-sig") as file:
+            return referenced_names(file.read())
+    except (OSError, UnicodeDecodeError):
+        return []
+
+
+class ReferenceIndex:
+    """
+    Maps entity names to the pack files whose strings refer to them.
+    Files are rescanned only when their mtime or size changed, and the index
+    is saved under .minecorg between runs.
+    """
+
+    def __init__(self, project_root):
+        self.root = Path(project_root)
+        self._files = {}
+        self._names = None
+        try:
+            with open(state.state_path(self.root, INDEX_FILE), "r") as file:
+                data = json.load(file)
+            if data.get("version") == INDEX_VERSION:
+                self._files = data["files"]
+        except (OSError, ValueError, KeyError):
+            self._files = {}
+
+    def refresh(self):
+        """Rescans the JSON files that changed since the last refresh."""
+        assets = asset_index.get_index(self.root)
+        current, stale = {}, []
+        for relative in assets.files():
+            if not relative.lower().endswith(".json"):
+                continue
+            try:
+                stat = os.stat(self.root / relative)
+            except FileNotFoundError:
+                continue
+            record = self._files.get(relative)
+            if record is not None and record[0] == stat.st_mtime_ns and record[1] == stat.st_size:
+                current[relative] = record
+            else:
+                current[relative] = [stat.st_mtime_ns, stat.st_size, []]
+                stale.append(relative)
+
+        paths = [str(self.root / relative) for relative in stale]
+        for relative, names in zip(stale, workers.map_parallel(_scan_file, paths)):
+            current[relative][2] = names
+
+        if stale or current.keys() != self._files.keys():
+            self._files = current
+            self._names = None
+            state.write_atomic(
+                state.state_path(self.root, INDEX_FILE),
+                json.dumps({"version": INDEX_VERSION, "files": self._files}),
+            )
+
+    def files_referencing(self, name: str) -> list:
+        """
+        Returns the files that refer to an entity.
+        Args:
+            name (str): The entity name, without namespace.
+        Returns:
+            list: Sorted POSIX style paths relative to the project root.
+        """
+        if self._names is None:
+            self._names = {}
+            for relative, record in self._files.items():
+                for referenced in record[2]:
+                    self._names.setdefault(referenced, []).append(relative)
+        return sorted(self._names.get(name, []))
+
+
+def get_index(project_root) -> ReferenceIndex:
+    """
+    Returns the refreshed reference index of a project.
+    Args:
+        project_root (str or Path): The project directory.
+    Returns:
+        ReferenceIndex: The up to date index.
+    """
+    index = ReferenceIndex(project_root)
+    index.refresh()
+    return index
@@ -0,0 +1,327 @@
+import hashlib
+import json
+import marshal
+import os
+import re
+import sys
+from importlib import metadata
+from importlib import resources
+from pathlib import Path
+
+SCHEMAS_FOLDER = "schemas"
+
+# Bump whenever _Compiler emits different code, compiled validators and cached results are dropped
+COMPILER_VERSION = 1
+
+# Schemas bundled in templates/schemas, by packs.classify() kind
+SCHEMA_KINDS = ("behavior_entity", "client_entity", "render_controller", "model", "manifest", "texture_registry")
+
+# Python types of the JSON schema 'type' names, bool is excluded from the numbers by type_check()
+_TYPES = {
+    "object": "dict",
+    "array": "list",
+    "string": "str",
+    "boolean": "bool",
+    "number": "(int, float)",
+    "integer": "int",
+    "null": "type(None)",
+}
+
+_PREAMBLE = '''import re
+
+_MISSING = object()
+
+
+def _accepts(function, value, path):
+    errors = []
+    function(value, path, errors)
+    return not errors
+'''
+
+
+def schema_kind(path: str, kind: str) -> str | None:
+    """
+    Returns the schema a pack file is checked against, or None.
+    Args:
+        path (str): The file path.
+        kind (str): The kind returned by packs.classify().
+    """
+    if kind == "texture_registry" and path.replace("\\", "/").rsplit("/", 1)[-1].startswith("flipbook"):
+        # flipbook_textures.json is a list of animations, not a registry
+        return None
+    return kind if kind in SCHEMA_KINDS else None
+
+
+def load_schema(kind: str) -> dict:
+    """Returns a bundled schema."""
+    text = resources.files("minecorg.templates").joinpath(SCHEMAS_FOLDER).joinpath(f"{kind}.json").read_text()
+    return json.loads(text)
+
+
+class _Compiler:
+    """
+    Turns a JSON schema into the Python source of a validator.
+    Supports type, enum, pattern, minimum, maximum, minItems, maxItems,
+    required, properties, patternProperties, additionalProperties, items,
+    anyOf and '#/definitions/' references. Every definition and anyOf
+    branch becomes a function taking (value, path, errors), everything else
+    is inlined, so validating a document runs no schema interpretation.
+    Paths are only formatted when an error is reported.
+    """
+
+    def __init__(self, schema: dict):
+        self.schema = schema
+        self.functions = []
+        self.constants = []
+        self.counter = 0
+
+    def name(self, prefix: str) -> str:
+        self.counter += 1
+        return f"_{prefix}{self.counter}"
+
+    def compile(self) -> str:
+        for name, definition in self.schema.get("definitions", {}).items():
+            self.function(self.definition_function(name), definition)
+        self.function("_root", self.schema)
+        lines = [_PREAMBLE, *self.constants, ""]
+        for function in self.functions:
+            lines += function + [""]
+        lines += ["def validate(value):", "    errors = []", '    _root(value, "$", errors)', "    return errors", ""]
+        return "\n".join(lines)
+
+    @staticmethod
+    def definition_function(name: str) -> str:
+        return "_def_" + re.sub(r"\W", "_", name)
+
+    def function(self, function_name: str, schema: dict):
+        body = []
+        self.emit(schema, "value", "{path}", body, 1)
+        self.functions.append([f"def {function_name}(value, path, errors):", *(body or ["    pass"])])
+
+    def constant(self, expression: str) -> str:
+        name = self.name("c")
+        self.constants.append(f"{name} = {expression}")
+        return name
+
+    @staticmethod
+    def key_path(path: str, key: str) -> str:
+        # The path is the inside of an f-string, braces in keys must be doubled
+        return path + "." + key.replace("{", "{{").replace("}", "}}")
+
+    def emit(self, schema: dict, value: str, path: str, out: list, depth: int):
+        pad = "    " * depth
+
+        def error(message: str, indent: int = 0):
+            out.append(f"{pad}{'    ' * indent}errors.append((f{path!r}, {message!r}))")
+
+        reference = schema.get("$ref")
+        if reference:
+            name = reference.rsplit("/", 1)[-1]
+            out.append(f"{pad}{self.definition_function(name)}({value}, f{path!r}, errors)")
+            return
+
+        types = schema.get("type")
+        if types:
+            types = [types] if isinstance(types, str) else types
+            out.append(f"{pad}if not ({self.type_check(value, types)}):")
+            error(f"expected {' or '.join(types)}", 1)
+            out.append(f"{pad}else:")
+            pad_before = len(out)
+            self.emit_checks(schema, value, path, out, depth + 1)
+            if len(out) == pad_before:
+                out.append(f"{pad}    pass")
+        else:
+            self.emit_checks(schema, value, path, out, depth)
+
+    def emit_checks(self, schema: dict, value: str, path: str, out: list, depth: int):
+        pad = "    " * depth
+
+        def error(message: str, indent: int = 1):
+            out.append(f"{pad}{'    ' * indent}errors.append((f{path!r}, {message!r}))")
+
+        if "enum" in schema:
+            allowed = self.constant(repr(frozenset(schema["enum"])))
+            out.append(f"{pad}if isinstance({value}, (dict, list)) or {value} not in {allowed}:")
+            error("must be one of " + ", ".join(sorted(map(str, schema["enum"]))))
+        if "pattern" in schema:
+            pattern = self.constant(f"re.compile({schema['pattern']!r})")
+            out.append(f"{pad}if isinstance({value}, str) and not {pattern}.search({value}):")
+            error(f"does not match {schema['pattern']}")
+        for keyword, operator, message in (("minimum", "<", "must be at least"), ("maximum", ">", "must be at most")):
+            if keyword in schema:
+                out.append(f"{pad}if isinstance({value}, (int, float)) and {value} {operator} {schema[keyword]!r}:")
+                error(f"{message} {schema[keyword]}")
+        for keyword, operator, message in (("minItems", "<", "at least"), ("maxItems", ">", "at most")):
+            if keyword in schema:
+                out.append(f"{pad}if isinstance({value}, list) and len({value}) {operator} {schema[keyword]}:")
+                error(f"must have {message} {schema[keyword]} items")
+
+        for key in schema.get("required", []):
+            out.append(f"{pad}if isinstance({value}, dict) and {key!r} not in {value}:")
+            error(f"missing required key '{key}'")
+
+        properties = schema.get("properties", {})
+        for key, subschema in properties.items():
+            child = self.name("v")
+            out.append(f"{pad}{child} = {value}.get({key!r}, _MISSING) if isinstance({value}, dict) else _MISSING")
+            out.append(f"{pad}if {child} is not _MISSING:")
+            self.emit(subschema, child, self.key_path(path, key), out, depth + 1)
+
+        patterns = schema.get("patternProperties", {})
+        additional = schema.get("additionalProperties", True)
+        if patterns or additional is not True:
+            key, child = self.name("k"), self.name("v")
+            out.append(f"{pad}if isinstance({value}, dict):")
+            out.append(f"{pad}    for {key}, {child} in {value}.items():")
+            inner = pad + "        "
+            child_path = path + ".{" + key + "}"
+            if properties:
+                known = self.constant(repr(frozenset(properties)))
+                out.append(f"{inner}if {key} in {known}:")
+                out.append(f"{inner}    continue")
+            if patterns:
+                matched = self.name("m")
+                out.append(f"{inner}{matched} = False")
+                for pattern, subschema in patterns.items():
+                    compiled = self.constant(f"re.compile({pattern!r})")
+                    out.append(f"{inner}if {compiled}.search({key}):")
+                    out.append(f"{inner}    {matched} = True")
+                    self.emit(subschema, child, child_path, out, depth + 3)
+                out.append(f"{inner}if {matched}:")
+                out.append(f"{inner}    continue")
+            if additional is False:
+                out.append(f"{inner}errors.append((f{child_path!r}, 'is not allowed here'))")
+            elif isinstance(additional, dict) and additional:
+                self.emit(additional, child, child_path, out, depth + 2)
+            else:
+                out.append(f"{inner}pass")
+
+        if "items" in schema:
+            index, child = self.name("i"), self.name("v")
+            out.append(f"{pad}if isinstance({value}, list):")
+            out.append(f"{pad}    for {index}, {child} in enumerate({value}):")
+            body_start = len(out)
+            self.emit(schema["items"], child, path + "[{" + index + "}]", out, depth + 2)
+            if len(out) == body_start:
+                out.append(f"{pad}        pass")
+
+        if "anyOf" in schema:
+            branches = []
+            for branch in schema["anyOf"]:
+                branches.append(self.name("any"))
+                self.function(branches[-1], branch)
+            out.append(f"{pad}if not any(_accepts(f, {value}, f{path!r}) for f in ({', '.join(branches)},)):")
+            error("does not match any of the allowed forms")
+
+    @staticmethod
+    def type_check(value: str, types: list) -> str:
+        checks = []
+        for name in types:
+            if name in ("number", "integer"):
+                checks.append(f"(isinstance({value}, {_TYPES[name]}) and not isinstance({value}, bool))")
+            else:
+                checks.append(f"isinstance({value}, {_TYPES[name]})")
+        return " or ".join(checks)
+
+
+def compile_schema(schema: dict) -> str:
+    """
+    Returns the Python source of a validator for a schema.
+    The source defines validate(value), returning (json path, message) tuples.
+    """
+    return _Compiler(schema).compile()
+
+
+# Loaded validators of this process, by kind
+_validators = {}
+
+
+def compiler_version() -> str:
+    """Returns the compiler version and the minecorg version, part of every cache key."""
+    try:
+        package_version = metadata.version("minecorg")
+    except metadata.PackageNotFoundError:
+        package_version = "dev"
+    return f"{COMPILER_VERSION}-{package_version}"
+
+
+def user_cache_folder() -> Path:
+    """
+    Returns the per-user folder of the compiled validators.
+    They are executed, so they are never kept inside a project, where a
+    shared or committed checkout could ship arbitrary code with them.
+    """
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base, "minecorg", "validators")
+
+
+def _trusted(path: Path) -> bool:
+    """Whether a cached file and its folder belong to this user and nobody else can write them."""
+    if os.name == "nt":
+        return True
+    for checked in (path.parent, path):
+        status = os.stat(checked)
+        if status.st_uid != os.getuid() or status.st_mode & 0o022:
+            return False
+    return True
+
+
+def get_validator(kind: str, cache_folder=None):
+    """
+    Returns the validate() function of a bundled schema.
+    Compiled code is marshalled to the user cache folder, keyed by the schema
+    hash, the compiler and minecorg versions and the interpreter cache tag,
+    so a schema is compiled once and every later process only unmarshals it.
+    A cached file another user could have written is compiled again instead.
+    Args:
+        kind (str): One of SCHEMA_KINDS.
+        cache_folder (str or Path | None): Where compiled validators are kept,
+                                           defaults to user_cache_folder().
+    Returns:
+        The validate(value) function.
+    """
+    validator = _validators.get(kind)
+    if validator is not None:
+        return validator
+
+    schema_text = json.dumps(load_schema(kind), sort_keys=True)
+    digest = hashlib.sha256(f"{compiler_version()}:{schema_text}".encode()).hexdigest()[:16]
+    cache_path = Path(cache_folder or user_cache_folder(), f"{kind}-{digest}.{sys.implementation.cache_tag}.marshal")
+    code = None
+    try:
+        if _trusted(cache_path):
+            with open(cache_path, "rb") as file:
+                code = marshal.load(file)
+    except (OSError, EOFError, ValueError, TypeError):
+        code = None
+    if code is None:
+        code = compile(compile_schema(json.loads(schema_text)), f"<minecorg schema {kind}>", "exec")
+        try:
+            cache_path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+            temporary = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+            with open(temporary, "wb") as file:
+                marshal.dump(code, file)
+            os.chmod(temporary, 0o600)
+            os.replace(temporary, cache_path)
+        except OSError:
+            # A read-only home only costs compiling the schema in every process
+            pass
+
+    namespace = {"re": re}
+    exec(code, namespace)
+    validator = _validators[kind] = namespace["validate"]
+    return validator
+
+
+def schemas_digest() -> str:
+    """
+    Returns a hash of every bundled schema and of the compiler version,
+    cached results are dropped when it changes.
+    """
+    digest = hashlib.sha256(compiler_version().encode())
+    for kind in SCHEMA_KINDS:
+        digest.update(json.dumps(load_schema(kind), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
@@ -0,0 +1,202 @@
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from . import state
+
+OBJECTS_FOLDER = "objects"
+SNAPSHOTS_FOLDER = "snapshots"
+
+# Older snapshots are dropped, with the objects only they used
+MAX_SNAPSHOTS = 50
+
+
+def object_path(project_root, digest: str) -> Path:
+    """Returns where the content with a sha256 digest is stored."""
+    return Path(project_root, state.STATE_FOLDER, OBJECTS_FOLDER, digest[:2], digest[2:])
+
+
+def store_object(project_root, path: Path, link: bool = False) -> str:
+    """
+    Stores the content of a file under .minecorg/objects, named by its sha256.
+    Content that is already stored is not written again.
+    Args:
+        project_root (str or Path): The project directory.
+        path (Path): The file to store.
+        link (bool): Hardlink the file instead of copying it. Only safe for a file
+                     that can no longer come back into the project, such as one
+                     a committed delete moved out: a file edited in place would
+                     change the stored content too.
+    Returns:
+        str: The sha256 digest of the content.
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as file:
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    digest = digest.hexdigest()
+    target = object_path(project_root, digest)
+    if not target.exists():
+        target.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            if not link:
+                raise OSError("copy requested")
+            os.link(path, target)
+        except OSError:
+            temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+            shutil.copyfile(path, temporary)
+            os.replace(temporary, target)
+    return digest
+
+
+class Snapshot:
+    """
+    Records the files an operation is about to touch, so it can be undone.
+    Only the recorded files are stored, and their content is deduplicated
+    by hash across every snapshot, so a snapshot costs as much as the change
+    and not as much as the project. A file that did not exist is recorded as
+    None and is deleted again on restore.
+    Usage:
+        with Snapshot(root, "new entity cow") as snapshot:
+            snapshot.record(path)
+            ... write path ...
+    """
+
+    def __init__(self, project_root, label: str):
+        self.root = Path(project_root).resolve()
+        self.label = label
+        self.id = f"{time.strftime('%Y%m%d-%H%M%S')}-{time.time_ns() % 10**9:09d}"
+        self.files = {}
+
+    def record(self, *paths):
+        """
+        Saves the current state of files, the first record of a path wins.
+        Args:
+            *paths (str or Path): Files inside the project, absolute or relative to it.
+        """
+        for path in paths:
+            path = (self.root / path).resolve()
+            relative = os.path.relpath(path, self.root).replace(os.sep, "/")
+            if relative in self.files or relative.startswith(".."):
+                continue
+            self.files[relative] = store_object(self.root, path) if path.is_file() else None
+
+    def record_deleted(self, moved: dict):
+        """
+        Saves files a committed transaction.DeleteTransaction moved out of the
+        project, by hardlinking the moved files instead of copying them.
+        Args:
+            moved (dict): Maps each path, relative to the project, to the moved file.
+        """
+        for relative, path in moved.items():
+            if relative not in self.files:
+                self.files[relative] = store_object(self.root, path, link=True)
+
+    def save(self) -> str | None:
+        """
+        Writes the snapshot manifest.
+        Returns:
+            str | None: The snapshot id, None when nothing was recorded.
+        """
+        if not self.files:
+            return None
+        manifest = {"id": self.id, "label": self.label, "created": time.time(), "files": self.files}
+        state.write_atomic(
+            state.state_path(self.root, SNAPSHOTS_FOLDER, f"{self.id}.json"),
+            json.dumps(manifest, indent=2),
+        )
+        prune(self.root)
+        return self.id
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        # Saved on failures too, a half finished operation is the one most worth undoing
+        self.save()
+        return False
+
+
+def list_snapshots(project_root) -> list:
+    """
+    Returns the snapshot manifests of a project, oldest first.
+    """
+    folder = Path(project_root, state.STATE_FOLDER, SNAPSHOTS_FOLDER)
+    manifests = []
+    for path in folder.glob("*.json") if folder.is_dir() else []:
+        try:
+            with open(path, "r") as file:
+                manifests.append(json.load(file))
+        except (OSError, ValueError):
+            continue
+    return sorted(manifests, key=lambda manifest: manifest.get("created", 0))
+
+
+def load_snapshot(project_root, snapshot_id: str) -> dict:
+    """
+    Returns the manifest of a snapshot.
+    Raises:
+        FileNotFoundError: If there is no such snapshot.
+    """
+    path = Path(project_root, state.STATE_FOLDER, SNAPSHOTS_FOLDER, f"{snapshot_id}.json")
+    with open(path, "r") as file:
+        return json.load(file)
+
+
+def restore(project_root, manifest: dict) -> tuple:
+    """
+    Puts the files of a snapshot back as they were recorded.
+    Files are copied out of the object store, never linked, so later edits
+    of the project can not change the stored content.
+    Args:
+        project_root (str or Path): The project directory.
+        manifest (dict): A snapshot manifest.
+    Returns:
+        tuple: (restored paths, deleted paths)
+    Raises:
+        FileNotFoundError: If a stored object is missing.
+    """
+    root = Path(project_root)
+    restored, deleted = [], []
+    for relative, digest in sorted(manifest["files"].items()):
+        target = root / relative
+        if digest is None:
+            if target.exists():
+                target.unlink()
+                deleted.append(relative)
+            continue
+        target.parent.mkdir(parents=True, exist_ok=True)
+        temporary = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        shutil.copyfile(object_path(root, digest), temporary)
+        os.replace(temporary, target)
+        restored.append(relative)
+    return restored, deleted
+
+
+def delete_snapshot(project_root, snapshot_id: str):
+    """Deletes a snapshot manifest and the objects no other snapshot uses."""
+    path = Path(project_root, state.STATE_FOLDER, SNAPSHOTS_FOLDER, f"{snapshot_id}.json")
+    path.unlink(missing_ok=True)
+    collect_objects(project_root)
+
+
+def prune(project_root, keep: int = MAX_SNAPSHOTS):
+    """Deletes the oldest snapshots beyond the most recent 'keep' ones."""
+    manifests = list_snapshots(project_root)
+    if len(manifests) <= keep:
+        return
+    folder = Path(project_root, state.STATE_FOLDER, SNAPSHOTS_FOLDER)
+    for manifest in manifests[: len(manifests) - keep]:
+        (folder / f"{manifest['id']}.json").unlink(missing_ok=True)
+    collect_objects(project_root)
+
+
+def collect_objects(project_root):
+    """Deletes the stored objects that no snapshot refers to."""
+    used = {digest for manifest in list_snapshots(project_root) for digest in manifest["files"].values()}
+    folder = Path(project_root, state.STATE_FOLDER, OBJECTS_FOLDER)
+    for path in folder.glob("*/*") if folder.is_dir() else []:
+        if path.parent.name + path.name not in used:
+            path.unlink(missing_ok=True)
@@ -0,0 +1,39 @@
+import os
+import threading
+from pathlib import Path
+
+# Folder inside a project where MINECORG keeps its caches, indexes and journals
+STATE_FOLDER = ".minecorg"
+
+
+def state_path(project_root, *parts: str) -> Path:
+    """
+    Returns a path inside the project state folder, creating its parent folders.
+    Args:
+        project_root (str or Path): The project directory.
+        *parts (str): Path components below the state folder.
+    Returns:
+        Path: The requested path.
+    Example:
+        >>> state_path('/path/to/project', 'cache', 'models.json')
+        PosixPath('/path/to/project/.minecorg/cache/models.json')
+    """
+    path = Path(project_root, STATE_FOLDER, *parts)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def write_atomic(path, data: str | bytes):
+    """
+    Writes a file through a temporary file and an atomic rename.
+    Readers see either the old or the new content, never a partial write.
+    Args:
+        path (str or Path): The file to write.
+        data (str or bytes): The new content, text is written as UTF-8.
+    """
+    path = Path(path)
+    temporary = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    mode = "wb" if isinstance(data, bytes) else "w"
+    with open(temporary, mode, **({} if mode == "wb" else {"encoding": "utf-8"})) as file:
+        file.write(data)
+    os.replace(temporary, path)
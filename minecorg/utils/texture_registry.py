@@ -0,0 +1,330 @@
+import json
+import os
+import re
+from pathlib import Path
+from . import asset_index
+from . import json_handler
+from . import locks
+from . import state
+
+STATE_FILE = "texture_registry.json"
+STATE_VERSION = 2
+
+# Registry file -> (texture folder it lists, atlas name)
+REGISTRIES = {
+    "item_texture.json": ("items", "atlas.items"),
+    "terrain_texture.json": ("blocks", "atlas.terrain"),
+}
+
+
+def registry_paths(value) -> list:
+    """
+    Returns the texture paths an entry of 'texture_data' points at.
+    'textures' can be a path, an object with a 'path', or a list of either.
+    """
+    textures = value.get("textures") if isinstance(value, dict) else None
+    items = textures if isinstance(textures, list) else [textures]
+    paths = []
+    for item in items:
+        if isinstance(item, dict):
+            item = item.get("path")
+        if isinstance(item, str):
+            paths.append(item)
+    return paths
+
+
+# Whitespace and comments between JSON tokens, and one JSON string
+_GAP = re.compile(r"(?:\s+|//[^\n]*|/\*.*?\*/)*", re.S)
+_STRING = re.compile(r'"(?:\\.|[^"\\])*"')
+_BLANK = re.compile(r"\s*")
+_SCALAR = re.compile(r"[^\s,:\]}/]+")
+
+
+def _skip(text: str, position: int) -> int:
+    return _GAP.match(text, position).end()
+
+
+def _value_end(text: str, position: int) -> int:
+    """Returns the offset just past the JSON value starting at position."""
+    if text[position] == '"':
+        return _STRING.match(text, position).end()
+    if text[position] not in "{[":
+        return _SCALAR.match(text, position).end()
+    depth = 0
+    while True:
+        position = _skip(text, position)
+        character = text[position]
+        if character == '"':
+            position = _STRING.match(text, position).end()
+            continue
+        if character in "{[":
+            depth += 1
+        elif character in "}]":
+            depth -= 1
+        position += 1
+        if depth == 0:
+            return position
+
+
+def _members(text: str, opening: int) -> tuple:
+    """
+    Locates the members of the JSON object whose '{' is at opening.
+    Returns:
+        tuple: (offset of the closing '}', [(key, key start, value start, value end)])
+    """
+    members = []
+    position = opening + 1
+    while True:
+        position = _skip(text, position)
+        if text[position] == "}":
+            return position, members
+        if text[position] == ",":
+            position += 1
+            continue
+        key = _STRING.match(text, position)
+        value_start = _skip(text, _skip(text, key.end()) + 1)
+        value_end = _value_end(text, value_start)
+        members.append((json.loads(key.group()), position, value_start, value_end))
+        position = value_end
+
+
+def _line_indent(text: str, position: int) -> str:
+    """Returns the text between the start of the line and position, the indent when it is blank."""
+    return text[text.rfind("\n", 0, position) + 1 : position]
+
+
+def _insert_members(text: str, opening: int, new: dict) -> str:
+    """Adds members at the end of an object, formatted like the members already in it."""
+    closing, members = _members(text, opening)
+    outer = _line_indent(text, opening)
+    outer = outer[: len(outer) - len(outer.lstrip())]
+    if members:
+        _, key_start, value_start, value_end = members[-1]
+        indent = _line_indent(text, key_start)
+        one_line = bool(indent.strip())
+        if one_line:
+            indent = outer + "    "
+        unit = max(len(indent) - len(outer), 1)
+        multiline = "\n" in text[value_start:value_end]
+        separator = ", " if one_line else ",\n" + indent
+        added = "".join(
+            f"{separator}{json.dumps(key)}: "
+            + (json.dumps(value, indent=unit).replace("\n", "\n" + indent) if multiline else json.dumps(value))
+            for key, value in new.items()
+        )
+        return text[:value_end] + added + text[value_end:]
+    indent = outer + "    "
+    body = ",\n".join(f"{indent}{json.dumps(key)}: {json.dumps(value)}" for key, value in new.items())
+    return text[:opening] + "{\n" + body + "\n" + outer + "}" + text[closing + 1 :]
+
+
+def _remove_member(text: str, opening: int, name: str) -> str:
+    """Removes one member of an object with its separator, leaving the rest of the text as it was."""
+    _, members = _members(text, opening)
+    index = next(i for i, member in enumerate(members) if member[0] == name)
+    _, key_start, _, value_end = members[index]
+    if index > 0:
+        # From the end of the previous value, the comma and the comments above the member go with it
+        return text[: members[index - 1][3]] + text[value_end:]
+    if len(members) > 1:
+        # The first member, through its comma and the blank space after it
+        after = _BLANK.match(text, _skip(text, value_end) + 1).end()
+        return text[:key_start] + text[after:]
+    return text[: opening + 1] + text[value_end:]
+
+
+def edit_registry(text: str, removed: list, added: dict) -> str:
+    """
+    Removes and adds 'texture_data' entries in the text of a registry.
+    Only the edited entries change: comments, key order, indentation and
+    the formatting of every other entry are kept, so a sync of a hand
+    written registry produces a diff of the changed lines only.
+    Args:
+        text (str): The registry text, comments are allowed.
+        removed (list): Names of the entries to remove.
+        added (dict): The entries to add, by name.
+    Returns:
+        str: The new text.
+    """
+    top = _skip(text, 1 if text.startswith("\ufeff") else 0)
+
+    def texture_data_opening():
+        _, members = _members(text, top)
+        return next((member[2] for member in members if member[0] == "texture_data"), None)
+
+    opening = texture_data_opening()
+    if opening is None:
+        return _insert_members(text, top, {"texture_data": added}) if added else text
+    for name in removed:
+        text = _remove_member(text, opening, name)
+    if added:
+        text = _insert_members(text, opening, added)
+    return text
+
+
+def _entry_name(path: str, taken: dict) -> str:
+    """Names a new entry after its file, prefixed with its sub folders if the name is used."""
+    parts = path.split("/")[2:]
+    for start in range(len(parts) - 1, -1, -1):
+        name = "_".join(parts[start:])
+        if name not in taken:
+            return name
+    return "_".join(parts) + f"_{len(taken)}"
+
+
+def _synced_path(name: str, value, folder: str) -> str | None:
+    """
+    Returns the texture path of an entry written in the form the sync
+    writes, None for any other entry.
+    That is a lone 'textures' path inside the texture folder of the
+    registry, under a name _entry_name() can give that path.
+    """
+    if not isinstance(value, dict) or value.keys() != {"textures"} or not isinstance(value["textures"], str):
+        return None
+    path = value["textures"]
+    if not path.startswith(f"textures/{folder}/"):
+        return None
+    parts = path.split("/")[2:]
+    if name in {"_".join(parts[start:]) for start in range(len(parts))}:
+        return path
+    return path if re.fullmatch(re.escape("_".join(parts)) + r"_\d+", name) else None
+
+
+class RegistrySync:
+    """
+    Keeps item_texture.json and terrain_texture.json in step with the
+    textures/items and textures/blocks folders of each resource pack.
+    Only entries for new textures are added, and only entries in the form
+    the sync writes (see _synced_path()) are removed when their texture
+    disappears. Ownership is read from the registry itself, so a fresh
+    clone prunes the same entries as the machine that added them, while
+    aliases, entries with more than a path and references outside the
+    pack folder, such as vanilla textures, are never touched.
+    A registry whose texture folders and file kept their mtimes is skipped
+    without being read, the mtimes are the only local state.
+    """
+
+    def __init__(self, project_root):
+        self.root = Path(project_root)
+        self.state_path = state.state_path(self.root, STATE_FILE)
+        try:
+            with open(self.state_path, "r") as file:
+                data = json.load(file)
+            self.records = data["registries"] if data.get("version") == STATE_VERSION else {}
+        except (OSError, ValueError, KeyError):
+            self.records = {}
+
+    def registries(self, assets) -> list:
+        """Returns (registry path, resource pack folder, texture folder, atlas) of every pack."""
+        found = []
+        resource_packs = {
+            path.split("/textures/", 1)[0]
+            for path in assets.files()
+            if path.startswith("resource_packs/") and "/textures/" in path
+        }
+        for pack in sorted(resource_packs):
+            for file_name, (folder, atlas) in REGISTRIES.items():
+                registry = f"{pack}/textures/{file_name}"
+                if registry in assets.files("texture_registry") or any(
+                    path.startswith(f"{pack}/textures/{folder}/") for path in assets.files("texture")
+                ):
+                    found.append((registry, pack, folder, atlas))
+        return found
+
+    def sync(self, dry_run: bool = False) -> list:
+        """
+        Adds and removes the registry entries of added and removed textures.
+        Args:
+            dry_run (bool): Compute the changes without writing anything.
+        Returns:
+            list: One dict per registry that changed, with the added and removed entry names.
+        """
+        assets = asset_index.get_index(self.root)
+        directories = assets.directories()
+        textures = assets.files("texture")
+        changes, records = [], {}
+        for registry, pack, folder, atlas in self.registries(assets):
+            prefix = f"{pack}/textures/{folder}"
+            folder_mtimes = {d: m for d, m in directories.items() if d == prefix or d.startswith(prefix + "/")}
+            try:
+                registry_mtime = os.stat(self.root / registry).st_mtime_ns
+            except FileNotFoundError:
+                registry_mtime = None
+            record = self.records.get(registry, {})
+            if record.get("folders") == folder_mtimes and record.get("mtime") == registry_mtime and registry_mtime:
+                records[registry] = record
+                continue
+
+            # Locked from the read to the write, so concurrent syncs and edits are not lost
+            with locks.asset_lock(self.root, registry):
+                text, data = self._read(registry, pack, atlas)
+                texture_data = data.setdefault("texture_data", {})
+                if not isinstance(texture_data, dict):
+                    raise ValueError(f"{registry}: 'texture_data' must be an object")
+                on_disk = {
+                    path[len(pack) + 1 :].rsplit(".", 1)[0]
+                    for path in textures
+                    if path.startswith(prefix + "/")
+                }
+                referenced = {path for value in texture_data.values() for path in registry_paths(value)}
+
+                removed = []
+                for name, value in sorted(texture_data.items()):
+                    path = _synced_path(name, value, folder)
+                    if path is not None and path not in on_disk:
+                        del texture_data[name]
+                        removed.append(name)
+                added = []
+                for path in sorted(on_disk - referenced):
+                    name = _entry_name(path, texture_data)
+                    texture_data[name] = {"textures": path}
+                    added.append(name)
+
+                if (added or removed or registry_mtime is None) and not dry_run:
+                    if text is None:
+                        text = json.dumps(data, indent=4) + "\n"
+                    else:
+                        text = edit_registry(text, removed, {name: texture_data[name] for name in added})
+                    state.write_atomic(self.root / registry, text.encode("utf-8"))
+                    registry_mtime = os.stat(self.root / registry).st_mtime_ns
+            if added or removed:
+                changes.append({"registry": registry, "added": added, "removed": removed})
+            records[registry] = {"folders": folder_mtimes, "mtime": registry_mtime}
+
+        if not dry_run:
+            self.records = records
+            state.write_atomic(self.state_path, json.dumps({"version": STATE_VERSION, "registries": records}))
+        return changes
+
+    def _read(self, registry: str, pack: str, atlas: str) -> tuple:
+        """
+        Reads a registry, an empty or missing file starts a new one.
+        Returns:
+            tuple: (the text, None for a new registry, and the parsed data)
+        """
+        try:
+            with open(self.root / registry, "rb") as file:
+                content = file.read()
+        except FileNotFoundError:
+            content = b""
+        if content.strip():
+            data = json_handler.loads_lenient(content)
+            if isinstance(data, dict):
+                # The byte order mark, if any, is kept by editing the text around it
+                return content.decode("utf-8"), data
+            raise ValueError(f"{registry} is not a texture registry")
+        return None, {"resource_pack_name": pack.rsplit("/", 1)[-1], "texture_name": atlas, "texture_data": {}}
+
+
+def sync_registries(project_root, dry_run: bool = False) -> list:
+    """
+    Brings the texture registries of a project up to date.
+    Args:
+        project_root (str or Path): The project directory.
+        dry_run (bool): Compute the changes without writing anything.
+    Returns:
+        list: See RegistrySync.sync().
+    Raises:
+        ValueError: If a registry file is not valid JSON or its 'texture_data' is not an object.
+    """
+    return RegistrySync(project_root).sync(dry_run)
@@ -0,0 +1,199 @@
+import fnmatch
+from . import json_handler
+
+RULES_TEMPLATE = "tick_rules.json"
+
+
+def load_rules(path=None) -> dict:
+    """
+    Loads a tick cost rule table.
+    Args:
+        path (str or Path | None): A rule table file, None loads the bundled one.
+    Returns:
+        dict: The table, with its 'rules' list in matching order.
+    Raises:
+        ValueError: If the file is not a valid rule table.
+    """
+    if path is None:
+        table = json_handler.import_data_from_json_file_template(RULES_TEMPLATE)
+    else:
+        with open(path, "rb") as file:
+            table = json_handler.loads_lenient(file.read())
+    problem = rules_problem(table)
+    if problem:
+        raise ValueError(f"{path or RULES_TEMPLATE}: {problem}")
+    return table
+
+
+def _is_number(value) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def rules_problem(table) -> str | None:
+    """
+    Checks the shape of a rule table, so a bad table fails once when it is
+    loaded instead of in every worker.
+    Args:
+        table: The parsed rule table.
+    Returns:
+        str | None: The first problem found, None if the table is valid.
+    """
+    if not isinstance(table, dict) or not isinstance(table.get("rules"), list):
+        return "there is no 'rules' list"
+    if not _is_number(table.get("group_weight", 1.0)):
+        return "'group_weight' must be a number"
+    for index, rule in enumerate(table["rules"]):
+        where = f"rules[{index}]"
+        if not isinstance(rule, dict):
+            return f"{where} must be an object"
+        if not isinstance(rule.get("component"), str):
+            return f"{where} needs a 'component' pattern"
+        if not _is_number(rule.get("cost", 0)):
+            return f"{where}.cost must be a number"
+        if not isinstance(rule.get("description", ""), str):
+            return f"{where}.description must be a string"
+        scales = rule.get("scale", [])
+        if not isinstance(scales, list):
+            return f"{where}.scale must be a list"
+        entries = [(f"{where}.scale[{i}]", scale, "per") for i, scale in enumerate(scales)]
+        if rule.get("frequency"):
+            entries.append((f"{where}.frequency", rule["frequency"], "default"))
+        for entry_where, entry, number_key in entries:
+            if not isinstance(entry, dict):
+                return f"{entry_where} must be an object"
+            if not isinstance(entry.get("field"), str):
+                return f"{entry_where} needs a 'field' path"
+            for key in ("cost", number_key):
+                if not _is_number(entry.get(key, 1)):
+                    return f"{entry_where}.{key} must be a number"
+            if number_key == "per" and entry.get("per", 1) == 0:
+                return f"{entry_where}.per can not be 0"
+    return None
+
+
+def field_values(data, field: str) -> list:
+    """
+    Returns the numbers found at a dotted field path, '[*]' walks every list item.
+    Example:
+        >>> field_values({"entity_types": [{"max_dist": 16}, {"max_dist": 48}]}, "entity_types[*].max_dist")
+        [16, 48]
+    """
+    values = [data]
+    for part in field.split("."):
+        walk_list = part.endswith("[*]")
+        name = part[:-3] if walk_list else part
+        values = [value.get(name) for value in values if isinstance(value, dict)]
+        if walk_list:
+            values = [item for value in values if isinstance(value, list) for item in value]
+    numbers = []
+    for value in values:
+        # Ranges such as [min, max] count with their bounds
+        for number in value if isinstance(value, list) else [value]:
+            if isinstance(number, (int, float)) and not isinstance(number, bool):
+                numbers.append(number)
+    return numbers
+
+
+def match_rule(rules: list, component: str) -> dict | None:
+    """Returns the first rule whose 'component' pattern matches the component name."""
+    for rule in rules:
+        if fnmatch.fnmatchcase(component, rule.get("component", "")):
+            return rule
+    return None
+
+
+def component_cost(rule: dict, body) -> float:
+    """
+    Estimates the tick cost of one component.
+    The cost is the rule base 'cost', plus for each 'scale' entry
+    cost * value / per using the largest value of its field, plus for the
+    'frequency' entry cost / value using the smallest value of its field,
+    so ranges make a component dearer and short intervals too.
+    Args:
+        rule (dict): The matching rule.
+        body: The component JSON.
+    Returns:
+        float: The estimated cost.
+    """
+    cost = float(rule.get("cost", 0))
+    for scale in rule.get("scale", []):
+        values = field_values(body, scale["field"])
+        if values:
+            cost += scale.get("cost", 1) * max(values) / scale.get("per", 1)
+    frequency = rule.get("frequency")
+    if frequency:
+        values = field_values(body, frequency["field"]) or [frequency.get("default", 1)]
+        cost += frequency.get("cost", 1) / max(min(values), 0.05)
+    return cost
+
+
+def entity_cost(data, table: dict) -> dict:
+    """
+    Scores the estimated server tick cost of a behavior entity.
+    The score adds the cost of every component plus the dearest component
+    group, weighted by the table 'group_weight', since groups are only
+    active after the events that add them.
+    Args:
+        data: The parsed behavior entity file.
+        table (dict): A rule table returned by load_rules().
+    Returns:
+        dict: The identifier, the score and every costed component sorted by cost.
+    Raises:
+        ValueError: If the entity, its components or its component groups are not objects.
+    """
+    body = data.get("minecraft:entity", {}) if isinstance(data, dict) else {}
+    if not isinstance(body, dict):
+        raise ValueError("'minecraft:entity' must be an object")
+    rules = table.get("rules", [])
+    items = []
+
+    def add(components, group):
+        if components is None:
+            return 0.0
+        if not isinstance(components, dict):
+            raise ValueError(f"the components of {group or 'the entity'} must be an object")
+        total = 0.0
+        for name, component in components.items():
+            rule = match_rule(rules, name)
+            if rule is None:
+                continue
+            cost = component_cost(rule, component)
+            total += cost
+            items.append(
+                {
+                    "component": name,
+                    "group": group,
+                    "cost": round(cost, 2),
+                    "description": rule.get("description", ""),
+                }
+            )
+        return total
+
+    score = add(body.get("components"), None)
+    groups = body.get("component_groups")
+    if groups is None:
+        groups = {}
+    elif not isinstance(groups, dict):
+        raise ValueError("'component_groups' must be an object")
+    dearest = max((add(components, name) for name, components in groups.items()), default=0.0)
+    score += dearest * table.get("group_weight", 1.0)
+    description = body.get("description")
+    return {
+        "identifier": description.get("identifier") if isinstance(description, dict) else None,
+        "score": round(score, 2),
+        "components": sorted(items, key=lambda item: -item["cost"]),
+    }
+
+
+def score_entity_file(file_path: str, table: dict) -> dict:
+    """
+    Scores one behavior entity file, runs on the worker processes.
+    Returns:
+        dict: The entity_cost() result and the parse error if any.
+    """
+    try:
+        with open(file_path, "rb") as file:
+            data = json_handler.loads_lenient(file.read())
+        return {**entity_cost(data, table), "error": None}
+    except (OSError, ValueError) as e:
+        return {"identifier": None, "score": 0, "components": [], "error": str(e)}
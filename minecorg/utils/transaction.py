@@ -0,0 +1,116 @@
+import json
+import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from . import state
+
+TRANSACTIONS_FOLDER = "transactions"
+JOURNAL_FILE = "journal.json"
+
+
+class DeleteTransaction:
+    """
+    Deletes a group of files as one unit.
+    The planned deletions are journaled under .minecorg/transactions first,
+    then every file is moved (renamed) into the transaction folder in
+    parallel. If any move fails the moved files are put back, so the project
+    never keeps a half deleted group. Once every move succeeded the journal
+    is marked committed and the folder is purged. recover() finishes or
+    rolls back transactions interrupted by a crash.
+    """
+
+    def __init__(self, project_root, paths: list, label: str = ""):
+        self.root = Path(project_root)
+        self.paths = sorted(set(paths))
+        self.label = label
+        # Two removes of one process (the daemon) can start within the same second
+        self.id = f"{time.strftime('%Y%m%d%H%M%S')}-{time.time_ns() % 10**9:09d}-{os.getpid()}"
+        self.folder = state.state_path(self.root, TRANSACTIONS_FOLDER, self.id, JOURNAL_FILE).parent
+
+    def _write_journal(self, status: str):
+        journal = {"label": self.label, "status": status, "paths": self.paths}
+        state.write_atomic(self.folder / JOURNAL_FILE, json.dumps(journal, indent=2))
+
+    def _move_out(self, relative: str):
+        target = self.folder / "files" / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.root / relative, target)
+
+    def run(self, committed=None):
+        """
+        Deletes every file or none of them.
+        Args:
+            committed: Called once every file is moved out and the journal is
+                       committed, before the moved files are purged, with a dict
+                       mapping each path to the moved file. Lets a snapshot
+                       hardlink the files it keeps, which is only safe once
+                       they can no longer come back into the project.
+        Raises:
+            OSError: If a file could not be deleted, after the others were restored.
+        """
+        self._write_journal("pending")
+        try:
+            with ThreadPoolExecutor() as pool:
+                # Consume every result so the first failure is raised here
+                for _ in pool.map(self._move_out, self.paths):
+                    pass
+        except OSError:
+            rollback(self.root, self.folder)
+            raise
+        self._write_journal("committed")
+        try:
+            if committed is not None:
+                committed({path: self.folder / "files" / path for path in self.paths})
+        finally:
+            shutil.rmtree(self.folder, ignore_errors=True)
+
+
+def rollback(project_root, folder: Path) -> list:
+    """
+    Puts back the files of an unfinished transaction and removes its folder.
+    Args:
+        project_root (str or Path): The project directory.
+        folder (Path): The transaction folder.
+    Returns:
+        list: The restored paths, relative to the project root.
+    """
+    restored = []
+    moved = Path(folder) / "files"
+    for dirpath, _, filenames in os.walk(moved):
+        for filename in filenames:
+            source = Path(dirpath) / filename
+            relative = source.relative_to(moved)
+            target = Path(project_root) / relative
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(source, target)
+            restored.append(relative.as_posix())
+    shutil.rmtree(folder, ignore_errors=True)
+    return sorted(restored)
+
+
+def recover(project_root) -> list:
+    """
+    Finishes committed transactions and rolls back the pending ones.
+    Args:
+        project_root (str or Path): The project directory.
+    Returns:
+        list: (transaction id, 'purged' or 'rolled back', restored paths) tuples.
+    """
+    results = []
+    folder = Path(project_root) / state.STATE_FOLDER / TRANSACTIONS_FOLDER
+    if not folder.is_dir():
+        return results
+    for transaction in sorted(folder.iterdir()):
+        try:
+            with open(transaction / JOURNAL_FILE, "r") as file:
+                status = json.load(file).get("status")
+        except (OSError, ValueError):
+            status = "pending"
+        if status == "committed":
+            shutil.rmtree(transaction, ignore_errors=True)
+            results.append((transaction.name, "purged", []))
+        else:
+            results.append((transaction.name, "rolled back", rollback(project_root, transaction)))
+    return results
@@ -0,0 +1,97 @@
+import difflib
+import functools
+import mmap
+from importlib import resources
+from pathlib import Path
+
+INDEX_FILE = "vanilla_identifiers.txt"
+_HEADER_PREFIX = b"# minecorg-vanilla-index "
+
+
+class VanillaIndex:
+    """
+    Sorted table of vanilla 'minecraft:' identifiers, Molang queries and math functions.
+    The table is a newline separated, byte-sorted text file whose first line
+    carries the game version it was generated from. It is memory mapped and
+    searched in place, so opening it costs nothing until the first lookup,
+    and every answer is remembered so repeated references cost one dict hit.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        with open(self.path, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self._map.find(b"\n")
+        header = self._map[:header_end]
+        if not header.startswith(_HEADER_PREFIX):
+            raise ValueError(f"{self.path} is not a vanilla identifier index")
+        self.version = header[len(_HEADER_PREFIX) :].decode().strip()
+        self._start = header_end + 1
+        self._known = {}
+        self._candidates = None
+        self._suggestions = {}
+
+    def __contains__(self, identifier: str) -> bool:
+        known = self._known.get(identifier)
+        if known is None:
+            known = self._known[identifier] = self._search(identifier.encode())
+        return known
+
+    def _search(self, key: bytes) -> bool:
+        lo, hi = self._start, len(self._map)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = max(self._map.rfind(b"\n", self._start, mid) + 1, self._start)
+            line_end = self._map.find(b"\n", line_start)
+            if line_end == -1:
+                line_end = len(self._map)
+            line = self._map[line_start:line_end]
+            if line == key:
+                return True
+            if line < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return False
+
+    def __iter__(self):
+        return iter(self._map[self._start :].decode().split())
+
+    def suggest(self, identifier: str) -> str | None:
+        """
+        Returns the closest vanilla identifier, meant for error messages only.
+        The identifiers are decoded once per index and every answer is remembered.
+        Args:
+            identifier (str): An identifier that is not in the index.
+        Returns:
+            str | None: The closest match, or None when nothing is close.
+        """
+        if identifier not in self._suggestions:
+            if self._candidates is None:
+                self._candidates = list(self)
+            matches = difflib.get_close_matches(identifier, self._candidates, n=1, cutoff=0.8)
+            self._suggestions[identifier] = matches[0] if matches else None
+        return self._suggestions[identifier]
+
+
+@functools.lru_cache(maxsize=None)
+def load_index() -> VanillaIndex:
+    """
+    Returns the index bundled in the templates directory, opened once per process.
+    """
+    return VanillaIndex(resources.files("minecorg.templates").joinpath(INDEX_FILE))
+
+
+def write_index(path: Path, identifiers, version: str):
+    """
+    Writes an index file that VanillaIndex can read.
+    Used to regenerate the bundled index from a new version of the vanilla packs.
+    Args:
+        path (Path): Where to write the index.
+        identifiers: The identifiers to store, in any order.
+        version (str): The game version the identifiers were collected from.
+    """
+    with open(path, "wb") as file:
+        file.write(_HEADER_PREFIX + version.encode() + b"\n")
+        for identifier in sorted({i.encode() for i in identifiers}):
+            file.write(identifier + b"\n")
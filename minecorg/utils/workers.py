@@ -0,0 +1,27 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+# Below this many items the cost of starting worker processes is not worth it
+PROCESS_POOL_THRESHOLD = 64
+
+
+def map_parallel(function, items, workers: int | None = None):
+    """
+    Applies a function to every item, on a process pool when there is enough work.
+    The function must be defined at module level so it can be sent to the workers.
+    Results are yielded in the order of the items.
+    Args:
+        function: The function to call with each item.
+        items: The items to process.
+        workers (int | None): Number of worker processes, defaults to the CPU count.
+    Yields:
+        The result of function(item) for each item.
+    """
+    items = list(items)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(items) < PROCESS_POOL_THRESHOLD:
+        yield from map(function, items)
+        return
+    chunksize = max(1, len(items) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        yield from pool.map(function, items, chunksize=chunksize)
@@ -0,0 +1,76 @@
+import json
+import os
+from pathlib import Path
+
+WORKSPACE_FILE = "minecorg-workspace.json"
+PROJECT_FILE = "minecorg.json"
+
+
+def find_workspace_file(start=None) -> Path | None:
+    """
+    Returns the closest minecorg-workspace.json in a directory or its parents.
+    Args:
+        start (str or Path | None): Where to start looking, defaults to the current directory.
+    """
+    directory = Path(start or os.getcwd()).resolve()
+    for folder in (directory, *directory.parents):
+        candidate = folder / WORKSPACE_FILE
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def discover_projects(root) -> list:
+    """
+    Finds every directory holding a minecorg.json below a root.
+    The search does not descend into projects, hidden folders or node_modules.
+    Args:
+        root (str or Path): The directory to search.
+    Returns:
+        list: The sorted project directories.
+    """
+    found = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        if PROJECT_FILE in filenames:
+            found.append(Path(dirpath))
+            dirnames[:] = []
+            continue
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
+    return sorted(found)
+
+
+def load_workspace(start=None) -> tuple:
+    """
+    Lists the projects of the workspace around a directory.
+    A minecorg-workspace.json lists them as glob patterns relative to itself:
+        {"projects": ["addons/*", "tools/debug_pack"], "exclude": ["addons/old_*"]}
+    Without the file every project below the directory is used.
+    Args:
+        start (str or Path | None): Where to start looking, defaults to the current directory.
+    Returns:
+        tuple: (workspace root, sorted project directories)
+    Raises:
+        ValueError: If the workspace file is not valid.
+    """
+    workspace_file = find_workspace_file(start)
+    if workspace_file is None:
+        root = Path(start or os.getcwd()).resolve()
+        return root, discover_projects(root)
+
+    root = workspace_file.parent
+    try:
+        with open(workspace_file, "r") as file:
+            data = json.load(file)
+    except json.JSONDecodeError as e:
+        raise ValueError(f"{workspace_file} is not valid JSON: {e}")
+    patterns = data.get("projects", ["**"])
+    if not isinstance(patterns, list):
+        raise ValueError(f"'projects' in {workspace_file} must be a list of patterns")
+
+    excluded = {path.resolve() for pattern in data.get("exclude", []) for path in root.glob(pattern)}
+    projects = set()
+    for pattern in patterns:
+        for path in root.glob(pattern):
+            if path.is_dir() and (path / PROJECT_FILE).is_file() and path.resolve() not in excluded:
+                projects.add(path.resolve())
+    return root, sorted(projects)
@@ -0,0 +1,69 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from minecorg.commands import analyze
+from minecorg.commands import project
+
+
+def cow_model(cubes: int) -> dict:
+    return {
+        "minecraft:geometry": [
+            {
+                "description": {"identifier": "geometry.cow", "texture_width": 64, "texture_height": 64},
+                "bones": [{"name": "body", "cubes": [{"uv": [0, 0]}] * cubes}],
+            }
+        ]
+    }
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(project, "PROJECT_DIRECTORY", str(tmp_path))
+    models = tmp_path / "resource_packs" / "mod" / "models" / "entity"
+    models.mkdir(parents=True)
+    (models / "cow.geo.json").write_text(json.dumps(cow_model(3)))
+    return tmp_path
+
+
+def run_models(*args):
+    result = CliRunner().invoke(analyze.models, ["--json", *args])
+    return result.exit_code, json.loads(result.output)
+
+
+def test_models_within_budget(root):
+    exit_code, report = run_models()
+    assert exit_code == 0
+    [model] = report["models"]
+    assert (model["file"], model["cubes"], model["over_budget"]) == (
+        "resource_packs/mod/models/entity/cow.geo.json",
+        3,
+        {},
+    )
+    assert report["budgets"] == analyze.DEFAULT_MODEL_BUDGETS
+
+
+def test_budgets_from_the_config_and_the_command_line(root):
+    (root / "minecorg.json").write_text(json.dumps({"budgets": {"models": {"cubes": 2, "bones": 0}}}))
+    exit_code, report = run_models("--max-bones", "5")
+    assert exit_code == 1
+    assert report["budgets"]["cubes"] == 2 and report["budgets"]["bones"] == 5
+    assert report["models"][0]["over_budget"] == {"cubes": 3}
+
+
+def test_a_malformed_model_is_an_error_row(root):
+    models = root / "resource_packs" / "mod" / "models" / "entity"
+    broken = cow_model(1)
+    broken["minecraft:geometry"][0]["bones"][0]["cubes"] = None
+    (models / "broken.geo.json").write_text(json.dumps(broken))
+
+    exit_code, report = run_models()
+    assert exit_code == 1
+    assert [model["file"] for model in report["models"]] == ["resource_packs/mod/models/entity/cow.geo.json"]
+    assert report["errors"] == [
+        {
+            "file": "resource_packs/mod/models/entity/broken.geo.json",
+            "error": "'cubes' of geometry.cow bone body must be a list",
+        }
+    ]
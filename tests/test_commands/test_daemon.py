@@ -0,0 +1,74 @@
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from minecorg import client
+from minecorg import server
+from minecorg.commands import daemon
+from minecorg.commands import project
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    # The daemon points the project context at its root, put it back afterwards
+    for name in ("PROJECT_DIRECTORY", "MOD_NAME", "NAMESPACE"):
+        monkeypatch.setattr(project, name, getattr(project, name, None))
+    (tmp_path / "minecorg.json").write_text(json.dumps({"name": "mod", "namespace": "ns"}))
+    (tmp_path / "behavior_packs" / "mod" / "entities").mkdir(parents=True)
+    (tmp_path / "behavior_packs" / "mod" / "entities" / "cow.json").write_text(
+        json.dumps({"minecraft:entity": {"description": {"identifier": "ns:cow"}, "components": {}}})
+    )
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+@pytest.fixture
+def running(root):
+    thread = threading.Thread(target=server.serve, args=(root,), daemon=True)
+    thread.start()
+    for _ in range(100):
+        if daemon.send({"ping": True}) is not None:
+            break
+        time.sleep(0.02)
+    yield root
+    daemon.send({"stop": True})
+    thread.join(5)
+
+
+def test_the_project_root_is_found_from_a_subdirectory(root):
+    subdirectory = root / "behavior_packs" / "mod"
+    assert client.find_project_root(str(subdirectory)) == str(root)
+    assert client.socket_path(str(subdirectory)) == ".minecorg/daemon.sock"
+
+
+def test_no_project_no_socket(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert client.find_project_root() is None
+    assert client.forward(["lint", "refs"]) is None
+
+
+def test_without_a_daemon_commands_run_in_process(root):
+    assert client.forward(["lint", "refs"]) is None
+
+
+def test_commands_are_forwarded_from_a_subdirectory(running, monkeypatch, capsys):
+    monkeypatch.chdir(running / "behavior_packs" / "mod")
+    # The relative target is resolved from the directory the command was typed in
+    assert client.forward(["lint", "refs", "--json", "../.."]) == 0
+    report = json.loads(capsys.readouterr().out)
+    assert report["files"] == 1 and report["unknown"] == []
+    assert daemon.send({"ping": True})["pid"]
+
+
+def test_run_command_restores_the_directory(root):
+    output, exit_code = server.run_command(["lint", "refs", "--json", ".."], cwd=str(root / "behavior_packs"))
+    assert exit_code == 0 and json.loads(output)["files"] == 1
+    assert os.getcwd() == str(root)
+    output, exit_code = server.run_command(["lint", "refs", "--json", "missing"])
+    assert exit_code == 2 and "does not exist" in output
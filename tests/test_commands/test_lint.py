@@ -0,0 +1,105 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from minecorg.commands import lint
+
+FILES = {
+    "behavior_packs/mod/blocks/ruby_block.json": {
+        "format_version": "1.21.50",
+        "minecraft:block": {
+            "description": {"identifier": "mod:ruby_block"},
+            "components": {
+                "minecraft:destructible_by_mining": {"seconds_to_destroy": 1},
+                "minecraft:light_emission": 4,
+                "minecraft:map_color": "#ff0000",
+                "minecraft:geometry": "minecraft:geometry.full_block",
+                "minecraft:material_instances": {"*": {"texture": "ruby_block"}},
+            },
+        },
+    },
+    "behavior_packs/mod/items/ruby.json": {
+        "format_version": "1.21.50",
+        "minecraft:item": {
+            "description": {"identifier": "mod:ruby"},
+            "components": {
+                "minecraft:icon": "ruby",
+                "minecraft:display_name": {"value": "Ruby"},
+                "minecraft:max_stack_size": 64,
+            },
+        },
+    },
+    "behavior_packs/mod/spawn_rules/cow.json": {
+        "format_version": "1.21.50",
+        "minecraft:spawn_rules": {
+            "description": {"identifier": "mod:cow", "population_control": "animal"},
+            "conditions": [
+                {
+                    "minecraft:spawns_on_surface": {},
+                    "minecraft:brightness_filter": {"min": 7, "max": 15},
+                    "minecraft:weight": {"default": 8},
+                    "minecraft:herd": {"min_size": 2, "max_size": 3},
+                    "minecraft:biome_filter": {"test": "has_biome_tag", "value": "animal"},
+                }
+            ],
+        },
+    },
+    "behavior_packs/mod/entities/cow.json": {
+        "format_version": "1.21.50",
+        "minecraft:entity": {
+            "description": {"identifier": "mod:cow"},
+            "components": {
+                "minecraft:health": {"value": 10},
+                "minecraft:physics": {},
+                "minecraft:type_family": {"family": ["cow"]},
+            },
+        },
+    },
+}
+
+
+@pytest.fixture
+def project(tmp_path):
+    for relative, data in FILES.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data))
+    return tmp_path
+
+
+def run_references(root):
+    result = CliRunner().invoke(lint.references, [str(root), "--json"])
+    return result.exit_code, json.loads(result.output)
+
+
+def test_valid_blocks_items_and_spawn_rules_pass(project):
+    exit_code, report = run_references(project)
+    assert exit_code == 0
+    assert report["files"] == 1 and report["unknown"] == [] and report["errors"] == []
+
+
+def test_an_unknown_entity_component_is_reported(project):
+    path = project / "behavior_packs/mod/entities/cow.json"
+    data = json.loads(path.read_text())
+    data["minecraft:entity"]["components"]["minecraft:helth"] = {"value": 10}
+    path.write_text(json.dumps(data))
+
+    exit_code, report = run_references(project)
+    assert exit_code == 1
+    assert report["unknown"] == [
+        {
+            "file": str(path),
+            "path": "$.minecraft:entity.components.minecraft:helth",
+            "identifier": "minecraft:helth",
+            "suggestion": "minecraft:health",
+        }
+    ]
+
+
+def test_split_reference():
+    assert lint.split_reference("minecraft:zombie<minecraft:entity_born>") == [
+        "minecraft:zombie",
+        "minecraft:entity_born",
+    ]
+    assert lint.split_reference("minecraft:log[axis=y]") == ["minecraft:log"]
@@ -0,0 +1,137 @@
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from minecorg.commands import entity
+from minecorg.commands import project
+
+CLIENT_ENTITY = """{
+  "format_version": "1.10.0",
+  "minecraft:client_entity": {
+    "description": {
+      "identifier": "old:cow", // keeps its comment
+      "geometry": {"default": "geometry.cow"},
+      "textures": {"default": "textures/entity/cow"},
+      "animations": {"walk": "animation.cow.walk"},
+      "render_controllers": ["controller.render.cow"]
+    }
+  }
+}
+"""
+
+FILES = {
+    "behavior_packs/mod/entities/cow.json": {"minecraft:entity": {"description": {"identifier": "old:cow"}}},
+    "behavior_packs/mod/spawn_rules/cow.json": {
+        "minecraft:spawn_rules": {"description": {"identifier": "old:cow"}},
+        "note": "minecraft:cow",
+    },
+    "resource_packs/mod/models/entity/cow.geo.json": {
+        "minecraft:geometry": [{"description": {"identifier": "geometry.cow"}}]
+    },
+}
+
+
+@pytest.fixture
+def root(tmp_path, monkeypatch):
+    monkeypatch.setattr(project, "PROJECT_DIRECTORY", str(tmp_path))
+    monkeypatch.setattr(project, "MOD_NAME", "mod")
+    monkeypatch.setattr(project, "NAMESPACE", "")
+    for relative, data in FILES.items():
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(data))
+    client = tmp_path / "resource_packs/mod/entity/cow.entity.json"
+    client.parent.mkdir(parents=True)
+    client.write_text(CLIENT_ENTITY)
+    texts = tmp_path / "resource_packs/mod/texts"
+    texts.mkdir()
+    (texts / "en_US.lang").write_text("entity.old:cow.name=Cow\nitem.spawn_egg.entity.old:cow.name=Cow Spawn Egg\n")
+    return tmp_path
+
+
+def rename(*args):
+    return CliRunner().invoke(entity.rename, list(args))
+
+
+def assert_renamed(root):
+    assert not (root / "behavior_packs/mod/entities/cow.json").exists()
+    assert json.loads((root / "behavior_packs/mod/entities/bull.json").read_text()) == {
+        "minecraft:entity": {"description": {"identifier": "new:bull"}}
+    }
+    spawn_rule = json.loads((root / "behavior_packs/mod/spawn_rules/cow.json").read_text())
+    assert spawn_rule["minecraft:spawn_rules"]["description"]["identifier"] == "new:bull"
+    assert spawn_rule["note"] == "minecraft:cow"
+    assert (root / "resource_packs/mod/entity/bull.entity.json").read_text() == (
+        CLIENT_ENTITY.replace("old:cow", "new:bull")
+        .replace("geometry.cow", "geometry.bull")
+        .replace("textures/entity/cow", "textures/entity/bull")
+        .replace("animation.cow.walk", "animation.bull.walk")
+        .replace("controller.render.cow", "controller.render.bull")
+    )
+    assert (root / "resource_packs/mod/models/entity/bull.geo.json").exists()
+    assert (root / "resource_packs/mod/texts/en_US.lang").read_text() == (
+        "entity.new:bull.name=Bull\nitem.spawn_egg.entity.new:bull.name=Bull Spawn Egg\n"
+    )
+    assert not (root / ".minecorg/jobs/rename-entity.jsonl").exists()
+
+
+def test_references_are_rewritten_in_place():
+    text = '{"a": "old:cow", "b": "minecraft:cow", "c": "geometry.cow", "d": "animation.cow.walk", "e": "cowboy"}'
+    new_text, count = entity.rename_entity_references(text, {"cow": ("old", "new", "bull")})
+    assert count == 3
+    assert new_text == (
+        '{"a": "new:bull", "b": "minecraft:cow", "c": "geometry.bull", "d": "animation.bull.walk", "e": "cowboy"}'
+    )
+
+
+def test_the_longest_name_wins():
+    renames = {"cow": ("ns", "ns", "bull"), "cow_baby": ("ns", "ns", "calf")}
+    assert entity.rename_entity_references('["ns:cow_baby", "geometry.cow"]', renames) == (
+        '["ns:calf", "geometry.bull"]',
+        2,
+    )
+
+
+def test_rename_with_a_new_namespace(root):
+    result = rename("cow", "new:bull")
+    assert result.exit_code == 0, result.output
+    assert_renamed(root)
+
+
+def test_a_resumed_rename_keeps_the_first_plan(root, monkeypatch):
+    move_file = entity.move_file
+
+    def interrupted(root_path, source, target):
+        if source.endswith("cow.geo.json"):
+            raise OSError("disk full")
+        move_file(root_path, source, target)
+
+    monkeypatch.setattr(entity, "move_file", interrupted)
+    result = rename("cow", "new:bull")
+    assert result.exit_code == 1 and "Run the same rename again" in result.output
+    # The behavior file already says new:bull, the old namespace can only come from the journal
+    assert "new:bull" in (root / "behavior_packs/mod/entities/bull.json").read_text()
+
+    monkeypatch.setattr(entity, "move_file", move_file)
+    result = rename("--resume")
+    assert result.exit_code == 0, result.output
+    assert "Resuming the interrupted rename" in result.output
+    assert_renamed(root)
+
+
+def disk_full(*move):
+    raise OSError("disk full")
+
+
+def test_another_rename_is_refused_while_one_is_pending(root, monkeypatch):
+    monkeypatch.setattr(entity, "move_file", disk_full)
+    assert rename("cow", "new:bull").exit_code == 1
+
+    result = rename("bull", "ox")
+    assert result.exit_code == 1 and "--resume" in result.output
+
+
+def test_a_missing_entity_is_an_error(root):
+    result = rename("pig", "hog")
+    assert result.exit_code == 1 and "Entity pig not found" in result.output
@@ -0,0 +1,53 @@
+import os
+import time
+
+import pytest
+
+from minecorg.commands import workspace
+
+PROJECTS = ("alpha", "beta", "crash", "delta", "gamma")
+
+
+def crash_in_one(task: tuple) -> dict:
+    directory, _, _ = task
+    if directory.endswith("crash"):
+        os._exit(3)
+    # Still running when the crash breaks the pool
+    time.sleep(0.2)
+    return {"project": directory, "output": "done\n", "exit_code": 0, "seconds": 0}
+
+
+def raise_in_one(task: tuple) -> dict:
+    directory, _, _ = task
+    if directory.endswith("crash"):
+        raise RuntimeError("boom")
+    return {"project": directory, "output": "done\n", "exit_code": 0, "seconds": 0}
+
+
+@pytest.fixture
+def projects(tmp_path, monkeypatch):
+    for name in PROJECTS:
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "minecorg.json").write_text("{}")
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
+
+def exit_codes(results: list) -> dict:
+    return {result["project"]: result["exit_code"] for result in results}
+
+
+def test_a_crashing_worker_only_fails_its_project(projects):
+    results = workspace.run_across_projects(crash_in_one, None, 2, as_json=True, quiet=False)
+
+    assert exit_codes(results) == {"alpha": 0, "beta": 0, "crash": 1, "delta": 0, "gamma": 0}
+    crashed = next(result for result in results if result["project"] == "crash")
+    assert "crashed" in crashed["output"]
+    assert all(result["output"] == "done\n" for result in results if result["project"] != "crash")
+
+
+def test_an_exception_only_fails_its_project(projects):
+    results = workspace.run_across_projects(raise_in_one, None, 2, as_json=True, quiet=False)
+
+    assert exit_codes(results) == {"alpha": 0, "beta": 0, "crash": 1, "delta": 0, "gamma": 0}
+    assert next(result for result in results if result["project"] == "crash")["output"] == "RuntimeError: boom\n"
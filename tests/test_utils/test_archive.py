@@ -0,0 +1,126 @@
+import io
+import json
+import zipfile
+
+import pytest
+
+from minecorg.utils import archive
+
+BEHAVIOR_MANIFEST = json.dumps({"header": {"name": "Mod BP"}, "modules": [{"type": "data"}]})
+RESOURCE_MANIFEST = json.dumps({"header": {"name": "Mod RP"}, "modules": [{"type": "resources"}]})
+COW = json.dumps({"minecraft:entity": {"description": {"identifier": "ns:cow"}, "components": {"a": 1}}})
+
+
+def zip_bytes(files: dict, compression=zipfile.ZIP_DEFLATED) -> bytes:
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w", compression) as zip_file:
+        for name, data in files.items():
+            zip_file.writestr(name, data)
+    return buffer.getvalue()
+
+
+def behavior_pack(cow: str = COW) -> dict:
+    return {"manifest.json": BEHAVIOR_MANIFEST, "entities/cow.json": cow}
+
+
+@pytest.mark.parametrize("compression", [zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED])
+def test_nested_packs_are_listed_and_read(tmp_path, compression):
+    path = tmp_path / "mod.mcaddon"
+    path.write_bytes(
+        zip_bytes(
+            {
+                "mod_bp.mcpack": zip_bytes(behavior_pack()),
+                "mod_rp.mcpack": zip_bytes({"manifest.json": RESOURCE_MANIFEST, "textures/cow.png": b"png"}),
+            },
+            compression,
+        )
+    )
+    with archive.open_source(path) as source:
+        assert set(source.entries()) == {
+            "behavior/manifest.json",
+            "behavior/entities/cow.json",
+            "resource/manifest.json",
+            "resource/textures/cow.png",
+        }
+        assert source.read("behavior/entities/cow.json") == COW.encode()
+        assert source.entries()["resource/textures/cow.png"] == 3
+
+
+def test_packs_with_the_same_folder_name_keep_their_files(tmp_path):
+    files = {}
+    for folder in ("a/BP", "b/BP"):
+        for name, data in behavior_pack(COW.replace("cow", folder[0])).items():
+            files[f"{folder}/{name}"] = data
+    path = tmp_path / "mod.mcaddon"
+    path.write_bytes(zip_bytes(files))
+
+    with archive.open_source(path) as source:
+        assert sorted(source.entries()) == [
+            "behavior:BP#2/entities/cow.json",
+            "behavior:BP#2/manifest.json",
+            "behavior:BP/entities/cow.json",
+            "behavior:BP/manifest.json",
+        ]
+        assert b"ns:b" in source.read("behavior:BP#2/entities/cow.json")
+
+
+@pytest.mark.parametrize(
+    "manifest, root, kind",
+    [
+        (RESOURCE_MANIFEST, "x", "resource"),
+        (json.dumps({"modules": None}), "My BP", "behavior"),
+        (json.dumps({"modules": [None, {"type": ["data"]}]}), "stuff", "stuff"),
+        ("[]", "resource_packs/mod", "resource"),
+        ("{broken", "pack_rp", "resource"),
+    ],
+)
+def test_pack_kind(manifest, root, kind):
+    assert archive._pack_kind(root, manifest.encode()) == kind
+
+
+def test_a_build_compares_with_its_source_tree(tmp_path):
+    source_tree = tmp_path / "project"
+    for name, data in behavior_pack(COW.replace('"a": 1', '"a": 2')).items():
+        path = source_tree / "behavior_packs" / "mod" / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(data)
+    build = tmp_path / "mod.mcpack"
+    build.write_bytes(zip_bytes(behavior_pack()))
+
+    with archive.open_source(build) as old, archive.open_source(source_tree) as new:
+        report = archive.diff_sources(old, new)
+    assert report["files"] == {"added": [], "removed": [], "changed": ["behavior/entities/cow.json"], "unchanged": 1}
+    assert report["definitions"]["changed"] == [
+        {
+            "identifier": "ns:cow",
+            "file": "behavior/entities/cow.json",
+            "components": {"added": [], "removed": [], "changed": ["a"]},
+        }
+    ]
+
+
+def test_summary_per_pack(tmp_path):
+    path = tmp_path / "mod.mcpack"
+    path.write_bytes(zip_bytes(behavior_pack()))
+    with archive.open_source(path) as source:
+        summary = archive.summarize_source(source)
+    assert summary["behavior"]["name"] == "Mod BP"
+    assert summary["behavior"]["files"] == 2
+    assert summary["behavior"]["kinds"] == {"manifest": 1, "behavior_entity": 1}
+
+
+@pytest.mark.parametrize("content", [b"", b"not a zip"])
+def test_a_file_that_is_not_a_zip_is_refused(tmp_path, content):
+    path = tmp_path / "broken.mcaddon"
+    path.write_bytes(content)
+    with pytest.raises(zipfile.BadZipFile):
+        archive.open_source(path)
+
+
+def test_a_large_deflated_nested_pack_is_spooled_to_disk(tmp_path, monkeypatch):
+    monkeypatch.setattr(archive, "NESTED_SPOOL_SIZE", 16)
+    path = tmp_path / "mod.mcaddon"
+    path.write_bytes(zip_bytes({"mod_bp.mcpack": zip_bytes(behavior_pack())}))
+    with archive.open_source(path) as source:
+        assert source._spools[0]._rolled
+        assert source.read("behavior/entities/cow.json") == COW.encode()
@@ -0,0 +1,65 @@
+import os
+
+from minecorg.utils import asset_index
+
+
+def touch(root, relative: str):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text("{}")
+    return path
+
+
+def bump(path):
+    # Directory mtimes can be equal within one clock tick, move them forward explicitly
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+
+def test_files_are_indexed_and_classified(tmp_path):
+    touch(tmp_path, "behavior_packs/mod/entities/cow.json")
+    touch(tmp_path, "resource_packs/mod/entity/cow.entity.json")
+    touch(tmp_path, "resource_packs/mod/textures/entity/cow.png")
+    touch(tmp_path, "resource_packs/mod/.hidden/cow.json")
+    touch(tmp_path, "scripts/main.js")
+    index = asset_index.AssetIndex(tmp_path)
+    assert index.refresh()
+
+    assert index.files() == [
+        "behavior_packs/mod/entities/cow.json",
+        "resource_packs/mod/entity/cow.entity.json",
+        "resource_packs/mod/textures/entity/cow.png",
+        "scripts/main.js",
+    ]
+    assert index.kind("resource_packs/mod/entity/cow.entity.json") == "client_entity"
+    assert index.find("cow", "texture") == ["resource_packs/mod/textures/entity/cow.png"]
+    assert index.kind("missing.json") is None
+
+
+def test_a_refresh_only_notices_changed_directories(tmp_path):
+    touch(tmp_path, "behavior_packs/mod/entities/cow.json")
+    index = asset_index.AssetIndex(tmp_path)
+    index.refresh()
+    assert not index.refresh()
+
+    touch(tmp_path, "behavior_packs/mod/entities/pig.json")
+    bump(tmp_path / "behavior_packs/mod/entities")
+    assert index.refresh()
+    assert index.find("pig") == ["behavior_packs/mod/entities/pig.json"]
+
+    (tmp_path / "behavior_packs/mod/entities/cow.json").unlink()
+    bump(tmp_path / "behavior_packs/mod/entities")
+    assert index.refresh()
+    assert index.find("cow") == []
+
+
+def test_a_saved_index_is_reused_by_the_next_process(tmp_path):
+    touch(tmp_path, "behavior_packs/mod/entities/cow.json")
+    index = asset_index.get_index(tmp_path)
+    assert (tmp_path / ".minecorg" / asset_index.INDEX_FILE).exists()
+
+    reloaded = asset_index.AssetIndex(tmp_path)
+    assert reloaded.directories() == index.directories()
+    # Nothing moved, the saved listing is trusted
+    assert not reloaded.refresh()
+    assert reloaded.files() == ["behavior_packs/mod/entities/cow.json"]
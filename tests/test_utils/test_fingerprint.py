@@ -0,0 +1,139 @@
+import json
+import os
+
+import pytest
+from click.testing import CliRunner
+
+from minecorg.commands import fingerprint as fingerprint_command
+from minecorg.commands import project
+from minecorg.utils import fingerprint
+
+
+def write(root, relative: str, text: str):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    # Directory mtimes can be equal within one clock tick, move the parent forward explicitly
+    stat = os.stat(path.parent)
+    os.utime(path.parent, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    return path
+
+
+@pytest.fixture
+def root(tmp_path):
+    write(tmp_path, "behavior_packs/mod/entities/cow.json", "{}")
+    write(tmp_path, "resource_packs/mod/entity/cow.entity.json", "{}")
+    write(tmp_path, "scripts/main.js", "")
+    return tmp_path
+
+
+@pytest.fixture
+def hashed(monkeypatch):
+    calls = []
+    hash_file = fingerprint.hash_file
+
+    def counting(path):
+        calls.append(os.path.basename(path))
+        return hash_file(path)
+
+    monkeypatch.setattr(fingerprint, "hash_file", counting)
+    return calls
+
+
+def test_an_edit_changes_the_hashes_on_its_path_only(root):
+    before = fingerprint.build_tree(root)
+    write(root, "behavior_packs/mod/entities/cow.json", '{"edited": true}')
+    after = fingerprint.build_tree(root)
+
+    assert after["hash"] != before["hash"]
+    old, new = fingerprint.subtree_hashes(before), fingerprint.subtree_hashes(after)
+    assert old.keys() == new.keys() == {"behavior_packs/mod", "resource_packs/mod", "scripts"}
+    assert old["behavior_packs/mod"] != new["behavior_packs/mod"]
+    assert old["resource_packs/mod"] == new["resource_packs/mod"] and old["scripts"] == new["scripts"]
+    assert fingerprint.diff_trees(before, after) == [("changed", "behavior_packs/mod/entities/cow.json")]
+
+
+def test_the_same_content_gives_the_same_hash(tmp_path, root):
+    other = tmp_path / "other"
+    for relative in ("behavior_packs/mod/entities/cow.json", "resource_packs/mod/entity/cow.entity.json", "scripts/main.js"):
+        write(other, relative, (root / relative).read_text())
+    assert fingerprint.build_tree(other)["hash"] == fingerprint.build_tree(root)["hash"]
+
+
+def test_added_and_removed_folders_are_one_entry(root):
+    before = fingerprint.build_tree(root)
+    write(root, "behavior_packs/mod/items/ruby.json", "{}")
+    (root / "scripts" / "main.js").unlink()
+    os.rmdir(root / "scripts")
+    assert fingerprint.diff_trees(before, fingerprint.build_tree(root)) == [
+        ("added", "behavior_packs/mod/items/"),
+        ("removed", "scripts/"),
+    ]
+
+
+def test_file_hashes_are_cached_by_mtime_and_size(root, hashed):
+    fingerprint.build_tree(root)
+    assert sorted(hashed) == ["cow.entity.json", "cow.json", "main.js"]
+
+    hashed.clear()
+    fingerprint.build_tree(root)
+    assert hashed == []
+
+    path = root / "behavior_packs/mod/entities/cow.json"
+    stat = os.stat(path)
+    # Same size and mtime, the cached hash is trusted
+    path.write_text("[]")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    fingerprint.build_tree(root)
+    assert hashed == []
+
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1))
+    fingerprint.build_tree(root)
+    assert hashed == ["cow.json"]
+
+    hashed.clear()
+    stat = os.stat(path)
+    path.write_text("[1]")
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+    fingerprint.build_tree(root)
+    assert hashed == ["cow.json"]
+
+
+def test_stored_trees_are_found_by_prefix(root):
+    tree = fingerprint.build_tree(root)
+    fingerprint.save_tree(root, tree)
+    assert fingerprint.load_tree(root, tree["hash"][:8]) == tree
+    with pytest.raises(ValueError, match="is not a stored fingerprint"):
+        fingerprint.load_tree(root, "0" * 64)
+
+
+def test_exported_trees_are_checked(tmp_path):
+    path = tmp_path / "tree.json"
+    path.write_text(json.dumps({"hash": "x", "files": {}, "dirs": {"a": {"hash": "y", "files": [], "dirs": {}}}}))
+    with pytest.raises(ValueError, match="is not a fingerprint tree"):
+        fingerprint.read_tree(path)
+
+
+def test_since_an_exported_tree_from_another_machine(tmp_path, root, monkeypatch):
+    monkeypatch.setattr(project, "PROJECT_DIRECTORY", str(root))
+    exported = tmp_path / "ci" / "tree.json"
+    exported.parent.mkdir()
+    result = CliRunner().invoke(fingerprint_command.fingerprint, ["--quiet", "--export", str(exported)])
+    key = result.output.strip()
+    assert json.loads(exported.read_text())["hash"] == key
+
+    def fresh_clone():
+        for stored in (root / ".minecorg" / fingerprint.TREES_FOLDER).iterdir():
+            stored.unlink()
+
+    fresh_clone()
+    result = CliRunner().invoke(fingerprint_command.fingerprint, ["--json", "--since", key])
+    assert json.loads(result.output)["changes"] == []
+
+    fresh_clone()
+    write(root, "scripts/main.js", "run()")
+    result = CliRunner().invoke(fingerprint_command.fingerprint, ["--json", "--since", key])
+    assert result.exit_code == 1 and "--export" in result.output
+    result = CliRunner().invoke(fingerprint_command.fingerprint, ["--json", "--since", str(exported)])
+    report = json.loads(result.output)
+    assert report["since"] == key and report["changes"] == [{"status": "changed", "path": "scripts/main.js"}]
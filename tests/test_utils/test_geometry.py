@@ -0,0 +1,64 @@
+import pytest
+
+from minecorg.utils import geometry
+
+MODEL = {
+    "format_version": "1.12.0",
+    "minecraft:geometry": [
+        {
+            "description": {"identifier": "geometry.cow", "texture_width": 64, "texture_height": 32},
+            "bones": [
+                {"name": "body", "cubes": [{"uv": [0, 0]}, {"uv": {"north": {}, "up": {}}}]},
+                {"name": "head", "parent": "body", "cubes": [{"uv": [0, 0]}]},
+                {"name": "horn", "parent": "head"},
+                {"name": "leg", "parent": "body", "cubes": [{"uv": [0, 0]}, "junk"]},
+            ],
+        }
+    ],
+}
+
+
+def test_metrics_of_a_geometry():
+    assert geometry.geometry_metrics(MODEL) == [
+        {
+            "identifier": "geometry.cow",
+            "texture_width": 64,
+            "texture_height": 32,
+            "bones": 4,
+            "cubes": 4,
+            "uv_faces": 6 + 2 + 6 + 6,
+            "depth": 3,
+        }
+    ]
+
+
+def test_legacy_geometries():
+    data = {"format_version": "1.8.0", "geometry.pig": {"texturewidth": 16, "textureheight": 16, "bones": []}}
+    [metrics] = geometry.geometry_metrics(data)
+    assert (metrics["identifier"], metrics["texture_width"], metrics["bones"], metrics["depth"]) == ("geometry.pig", 16, 0, 0)
+
+
+def test_cyclic_and_missing_parents_are_roots():
+    bones = [{"name": "a", "parent": "b"}, {"name": "b", "parent": "a"}, {"name": "c", "parent": "gone"}]
+    assert geometry.bone_depth(bones) == 2
+    assert geometry.bone_depth([{"name": ["x"], "parent": {}}, {"name": "y", "parent": ["x"]}]) == 1
+
+
+@pytest.mark.parametrize(
+    "geometry_body, message",
+    [
+        ({"description": {"identifier": "geometry.x"}, "bones": None}, "'bones' of geometry.x must be a list"),
+        (
+            {"description": {"identifier": "geometry.x"}, "bones": [{"name": "body", "cubes": None}]},
+            "'cubes' of geometry.x bone body must be a list",
+        ),
+    ],
+)
+def test_malformed_members_are_errors(geometry_body, message):
+    with pytest.raises(ValueError, match=message):
+        geometry.geometry_metrics({"minecraft:geometry": [geometry_body]})
+
+
+def test_a_declared_size_that_is_not_a_number_is_ignored():
+    data = {"minecraft:geometry": [{"description": {"identifier": "geometry.x", "texture_width": {}}}]}
+    assert geometry.geometry_metrics(data)[0]["texture_width"] is None
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from minecorg.utils import jobs
+
+
+def fail_on(bad: set):
+    def work(item):
+        if item in bad:
+            raise ValueError(f"bad {item}")
+        return item * 2
+
+    return work
+
+
+def journal(root) -> list:
+    return (root / ".minecorg" / "jobs" / "demo.jsonl").read_text().splitlines()
+
+
+def test_a_finished_job_leaves_no_journal(tmp_path):
+    with jobs.Job(tmp_path, "demo", plan="a") as job:
+        assert job.run([1, 2, 3], fail_on(set())) == {"1": 2, "2": 4, "3": 6}
+    assert not (tmp_path / ".minecorg" / "jobs" / "demo.jsonl").exists()
+    assert jobs.pending_job(tmp_path, "demo") is None
+
+
+def test_a_failed_job_resumes_where_it_stopped(tmp_path):
+    with pytest.raises(jobs.JobError) as error:
+        with jobs.Job(tmp_path, "demo", plan="a", details={"items": [1, 2, 3]}) as job:
+            job.run([1, 2, 3], fail_on({2}))
+    assert error.value.failures.keys() == {"2"}
+    assert str(error.value) == "1 items failed, first 2: bad 2"
+
+    pending = jobs.pending_job(tmp_path, "demo")
+    assert pending["done"] == 2 and pending["details"] == {"items": [1, 2, 3]}
+
+    ran = []
+    with jobs.Job(tmp_path, "demo", plan="a") as job:
+        assert job.resumed and job.done == {"1", "3"}
+        job.run([1, 2, 3], lambda item: ran.append(item))
+    assert ran == [2]
+
+
+def test_a_cut_short_last_line_is_ignored(tmp_path):
+    with pytest.raises(jobs.JobError):
+        with jobs.Job(tmp_path, "demo", plan="a") as job:
+            job.run([1, 2], fail_on({2}))
+    path = tmp_path / ".minecorg" / "jobs" / "demo.jsonl"
+    with open(path, "a") as file:
+        file.write('{"done": "2')
+
+    with jobs.Job(tmp_path, "demo", plan="a") as job:
+        assert job.done == {"1"}
+
+
+def test_a_pending_job_with_another_plan_is_refused(tmp_path):
+    with pytest.raises(jobs.JobError):
+        with jobs.Job(tmp_path, "demo", plan="a", label="demo a") as job:
+            job.run([1, 2], fail_on({2}))
+    before = journal(tmp_path)
+
+    with pytest.raises(jobs.PendingJobError) as error:
+        with jobs.Job(tmp_path, "demo", plan="b"):
+            pass
+    assert error.value.done == 1 and error.value.header["plan"] == "a"
+    assert str(error.value) == "An interrupted 'demo a' is pending, 1 items were done"
+    assert journal(tmp_path) == before
+
+
+def test_discard_replaces_a_pending_job(tmp_path):
+    with pytest.raises(jobs.JobError):
+        with jobs.Job(tmp_path, "demo", plan="a") as job:
+            job.run([1, 2], fail_on({2}))
+
+    with pytest.raises(jobs.JobError):
+        with jobs.Job(tmp_path, "demo", plan="b", discard=True) as job:
+            assert not job.resumed
+            job.run([1, 2], fail_on({1}))
+    lines = journal(tmp_path)
+    assert json.loads(lines[0])["plan"] == "b"
+    assert [json.loads(line) for line in lines[1:]] == [{"done": "2"}]
+
+
+def test_a_journal_without_done_items_is_replaced(tmp_path):
+    path = tmp_path / ".minecorg" / "jobs" / "demo.jsonl"
+    path.parent.mkdir(parents=True)
+    path.write_text(json.dumps({"name": "demo", "plan": "a"}) + "\n")
+
+    with jobs.Job(tmp_path, "demo", plan="b") as job:
+        job.run([1], fail_on(set()))
+    assert not path.exists()
@@ -0,0 +1,128 @@
+import pytest
+
+from minecorg.utils import jsonpath
+
+ENTITY = {
+    "format_version": "1.21.50",
+    "minecraft:entity": {
+        "description": {"identifier": "ns:cow", "is_spawnable": True},
+        "components": {
+            "minecraft:health": {"value": 150, "max": 150},
+            "minecraft:movement": {"value": 0.25},
+            "minecraft:type_family": {"family": ["cow", "mob"]},
+        },
+        "component_groups": {
+            "ns:baby": {"minecraft:health": {"value": 5}},
+            "ns:tamed": {"minecraft:is_tamed": {}},
+        },
+    },
+}
+
+RENDER_CONTROLLERS = {
+    "render_controllers": {
+        "controller.render.zombie": {"textures": ["Texture.default", "Texture.zombie_eyes"]},
+        "controller.render.cow": {"textures": ["Texture.default"]},
+    }
+}
+
+
+def values(expression: str, data=ENTITY) -> list:
+    return [value for _, value in jsonpath.find(expression, data)]
+
+
+@pytest.mark.parametrize(
+    "expression, expected",
+    [
+        ("$.format_version", ["1.21.50"]),
+        ("format_version", ["1.21.50"]),
+        ("$.minecraft:entity.description.identifier", ["ns:cow"]),
+        ("$['minecraft:entity']['description']['identifier']", ["ns:cow"]),
+        ("$..family[0]", ["cow"]),
+        ("$..family[-1]", ["mob"]),
+        ("$..family[0,1]", ["cow", "mob"]),
+        ("$..family[5]", []),
+        ("$.minecraft:entity.components['minecraft:health', 'minecraft:movement'].value", [150, 0.25]),
+        ("$.minecraft:entity.description.*", ["ns:cow", True]),
+        ("$..['minecraft:health'].value", [150, 5]),
+        ("$.missing.key", []),
+    ],
+)
+def test_selectors(expression, expected):
+    assert values(expression) == expected
+
+
+def test_matches_carry_their_normalized_path():
+    assert jsonpath.find("$..family[1]", ENTITY) == [
+        ("$['minecraft:entity']['components']['minecraft:type_family']['family'][1]", "mob")
+    ]
+
+
+def test_descendants_include_every_depth_in_document_order():
+    assert [path for path, _ in jsonpath.find("$..value", ENTITY)] == [
+        "$['minecraft:entity']['components']['minecraft:health']['value']",
+        "$['minecraft:entity']['components']['minecraft:movement']['value']",
+        "$['minecraft:entity']['component_groups']['ns:baby']['minecraft:health']['value']",
+    ]
+
+
+def test_a_filter_on_an_object_tests_the_object_itself():
+    matches = jsonpath.find("$..components[?(@['minecraft:health'].value > 100)]", ENTITY)
+    assert [path for path, _ in matches] == ["$['minecraft:entity']['components']"]
+    assert values("$..components[?(@['minecraft:health'].value > 1000)]") == []
+
+
+def test_a_filter_on_a_list_tests_each_item():
+    expression = "$.render_controllers.*.textures[?(@ =~ 'zombie')]"
+    assert values(expression, RENDER_CONTROLLERS) == ["Texture.zombie_eyes"]
+
+
+@pytest.mark.parametrize(
+    "condition, expected",
+    [
+        ("@ == 'cow'", ["cow"]),
+        ("@ != 'cow'", ["mob"]),
+        ("!(@ == 'cow')", ["mob"]),
+        ("@ == 'cow' || @ == 'mob'", ["cow", "mob"]),
+        ("@ == 'cow' && $.format_version == '1.21.50'", ["cow"]),
+        ("@ < 'd'", ["cow"]),
+        ("@ > 1", []),
+    ],
+)
+def test_filter_operators(condition, expected):
+    assert values(f"$..family[?({condition})]") == expected
+
+
+def test_a_bare_path_tests_existence():
+    data = {"items": [{"flag": False}, {"other": 1}, {"flag": 0}]}
+    assert values("$.items[?(@.flag)]", data) == [{"flag": 0}]
+
+
+def test_booleans_are_not_numbers():
+    data = {"items": [True, 1]}
+    assert values("$.items[?(@ == 1)]", data) == [1]
+    assert values("$.items[?(@ == true)]", data) == [True]
+
+
+def test_parses_are_shared():
+    assert jsonpath.compile_path("$..value") is jsonpath.compile_path("$..value")
+
+
+@pytest.mark.parametrize(
+    "expression, message, offset",
+    [
+        ("$.a[", "Expected a quoted key or an index", 4),
+        ("$.a.", "Expected a key", 4),
+        ("$.a b", "Unexpected token", 4),
+        ("$..#", "Unexpected character '#'", 3),
+        ('$[1,"a"]', "Keys and indexes can not be mixed", 1),
+        ("$[?(@.x >)]", "Expected a value, '@' or '$'", 9),
+        ("$[?(@.a == 1]", "Expected ')'", 12),
+        ("$[?(@ =~ 3)]", "'=~' needs a quoted regular expression", 6),
+        ("$[?(@ =~ '(')]", "Invalid regular expression: missing ), unterminated subpattern", 9),
+    ],
+)
+def test_errors_report_their_offset(expression, message, offset):
+    with pytest.raises(jsonpath.JsonPathError) as error:
+        jsonpath.compile_path(expression)
+    assert error.value.offset == offset
+    assert str(error.value) == f"{message} at position {offset}"
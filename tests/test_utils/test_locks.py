@@ -0,0 +1,81 @@
+import multiprocessing
+import threading
+
+import pytest
+
+from minecorg.utils import locks
+
+fcntl = pytest.importorskip("fcntl")
+
+
+def held(root, relative: str, exclusive: bool = True) -> bool:
+    """Whether another holder keeps the lock of a path from being taken now."""
+    with locks._lock_file(root, locks._asset_lock_name(relative)) as file:
+        try:
+            fcntl.flock(file, (fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH) | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return True
+        fcntl.flock(file, fcntl.LOCK_UN)
+        return False
+
+
+def take_exclusive(root, marker):
+    with locks.project_lock(root, exclusive=True):
+        marker.write_text("done")
+
+
+def test_the_project_lock_excludes_other_processes(tmp_path):
+    marker = tmp_path / "marker"
+    context = multiprocessing.get_context("spawn")
+    with locks.project_lock(tmp_path):
+        process = context.Process(target=take_exclusive, args=(tmp_path, marker))
+        process.start()
+        process.join(1)
+        assert process.is_alive() and not marker.exists()
+    process.join(10)
+    assert marker.read_text() == "done"
+
+
+def test_the_project_lock_nests_in_one_process(tmp_path):
+    with locks.project_lock(tmp_path, exclusive=True):
+        with locks.project_lock(tmp_path):
+            with locks.project_lock(tmp_path, exclusive=True):
+                pass
+    assert locks._held == {}
+
+
+def test_a_shared_project_lock_is_not_upgraded(tmp_path):
+    with locks.project_lock(tmp_path):
+        with pytest.raises(RuntimeError):
+            with locks.project_lock(tmp_path, exclusive=True):
+                pass
+
+
+def test_an_asset_lock_holds_its_folders_shared(tmp_path):
+    with locks.asset_lock(tmp_path, "packs/entities/cow.json"):
+        assert held(tmp_path, "packs/entities/cow.json", exclusive=False)
+        assert held(tmp_path, "packs/entities") and held(tmp_path, "packs")
+        assert not held(tmp_path, "packs/entities", exclusive=False)
+        assert not held(tmp_path, "packs/entities/pig.json")
+    assert not held(tmp_path, "packs")
+
+
+def test_a_folder_lock_waits_for_the_assets_inside(tmp_path):
+    entered = threading.Event()
+
+    def lock_folder():
+        with locks.asset_lock(tmp_path, "packs"):
+            entered.set()
+
+    with locks.asset_lock(tmp_path, tmp_path / "packs" / "entities" / "cow.json"):
+        thread = threading.Thread(target=lock_folder)
+        thread.start()
+        assert not entered.wait(0.3)
+    thread.join(5)
+    assert entered.is_set()
+
+
+def test_write_locked(tmp_path):
+    (tmp_path / "packs").mkdir()
+    locks.write_locked(tmp_path, "packs/a.json", "{}")
+    assert (tmp_path / "packs" / "a.json").read_text() == "{}"
@@ -0,0 +1,175 @@
+import pytest
+
+from minecorg.utils import molang
+
+
+def test_aliases_are_expanded_and_lowercased():
+    assert molang.parse("Q.Is_Baby") == ("name", "query.is_baby")
+    assert molang.parse("v.speed") == ("name", "variable.speed")
+    assert molang.parse("t.x") == ("name", "temp.x")
+
+
+def test_literals():
+    assert molang.parse("1.5f") == ("num", 1.5)
+    assert molang.parse(".5") == ("num", 0.5)
+    assert molang.parse("'minecraft:cow'") == ("str", "minecraft:cow")
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("1 + 2 * 3", ("binary", "+", ("num", 1.0), ("binary", "*", ("num", 2.0), ("num", 3.0)))),
+        ("1 - 2 - 3", ("binary", "-", ("binary", "-", ("num", 1.0), ("num", 2.0)), ("num", 3.0))),
+        ("-1 * 2", ("binary", "*", ("unary", "-", ("num", 1.0)), ("num", 2.0))),
+        (
+            "!q.a && q.b || q.c",
+            (
+                "binary",
+                "||",
+                ("binary", "&&", ("unary", "!", ("name", "query.a")), ("name", "query.b")),
+                ("name", "query.c"),
+            ),
+        ),
+        ("(1 + 2) * 3", ("binary", "*", ("binary", "+", ("num", 1.0), ("num", 2.0)), ("num", 3.0))),
+        ("t.x ?? 2", ("binary", "??", ("name", "temp.x"), ("num", 2.0))),
+        ("q.a -> v.b", ("binary", "->", ("name", "query.a"), ("name", "variable.b"))),
+        ("v.a[0]", ("index", ("name", "variable.a"), ("num", 0.0))),
+    ],
+)
+def test_precedence_and_associativity(text, expected):
+    assert molang.parse(text) == expected
+
+
+def test_ternaries_nest_to_the_right():
+    assert molang.parse("q.a ? 1 : q.b ? 2 : 3") == (
+        "ternary",
+        ("name", "query.a"),
+        ("num", 1.0),
+        ("ternary", ("name", "query.b"), ("num", 2.0), ("num", 3.0)),
+    )
+
+
+def test_binary_conditional_has_no_else():
+    assert molang.parse("q.a ? 1") == ("ternary", ("name", "query.a"), ("num", 1.0), None)
+
+
+def test_assignment_takes_a_whole_ternary():
+    assert molang.parse("v.x = q.a ? 1 : 2") == (
+        "assign",
+        "variable.x",
+        ("ternary", ("name", "query.a"), ("num", 1.0), ("num", 2.0)),
+    )
+
+
+def test_ternary_branches_can_assign():
+    assert molang.parse("q.c ? v.y = 2 : v.y = 3") == (
+        "ternary",
+        ("name", "query.c"),
+        ("assign", "variable.y", ("num", 2.0)),
+        ("assign", "variable.y", ("num", 3.0)),
+    )
+
+
+def test_statements_blocks_and_keywords():
+    assert molang.parse("v.a = 1; return v.a;") == (
+        "block",
+        (("assign", "variable.a", ("num", 1.0)), ("return", ("name", "variable.a"))),
+    )
+    assert molang.parse("loop(2, {break;})") == ("call", "loop", (("num", 2.0), ("block", (("break",),))))
+
+
+def test_calls():
+    assert molang.parse("math.clamp(v.a, 0, 1)") == (
+        "call",
+        "math.clamp",
+        (("name", "variable.a"), ("num", 0.0), ("num", 1.0)),
+    )
+
+
+@pytest.mark.parametrize(
+    "text, message, offset",
+    [
+        ("", "empty expression", 0),
+        ("1 +", "unexpected end of expression", 3),
+        ("1 + * 2", "unexpected '*'", 4),
+        ("v.a = 1 v.b", "expected ';'", 8),
+        ("q.x(1,", "unexpected end of expression", 6),
+        ("foo.bar", "unknown name 'foo.bar'", 0),
+        ("1 = 2", "only variables can be assigned", 2),
+        ("q.a = 2", "only variables can be assigned", 4),
+        ("v.a # 1", "unexpected character '#'", 4),
+        ("(1 + 2", "expected ')' but found end of expression", 6),
+        ("v.a = loop", "unexpected keyword 'loop'", 6),
+    ],
+)
+def test_errors_report_their_offset(text, message, offset):
+    with pytest.raises(molang.MolangError) as error:
+        molang.parse(text)
+    assert error.value.offset == offset
+    assert str(error.value) == f"{message} at column {offset + 1}"
+
+
+def test_errors_are_remembered_too():
+    with pytest.raises(molang.MolangError):
+        molang.parse("1 +")
+    with pytest.raises(molang.MolangError):
+        molang.parse("1 +")
+
+
+def test_repeated_subexpressions_share_one_node():
+    first = molang.parse("v.speed * 2 + 1")
+    second = molang.parse("(v.speed * 2) - 1")
+    assert first[2] is second[2]
+
+
+def test_analyze_reads_writes_and_calls():
+    result = molang.analyze(molang.parse("v.walk = q.modified_distance_moved * v.speed"))
+    assert result["reads"] == {"variable.speed"}
+    assert result["writes"] == {"variable.walk"}
+    assert result["calls"] == {"query.modified_distance_moved"}
+    assert not result["loops"] and not result["random"]
+
+
+def test_analyze_costs():
+    assert molang.analyze(molang.parse("1"))["cost"] == 1
+    assert molang.analyze(molang.parse("q.get_nearby_entities(8)"))["cost"] == 41
+    assert molang.analyze(molang.parse("math.random(0, 1)"))["random"]
+
+
+def test_analyze_multiplies_loop_bodies():
+    literal = molang.analyze(molang.parse("loop(3, {v.i = v.i + 1;})"))
+    unknown = molang.analyze(molang.parse("loop(v.n, {v.i = v.i + 1;})"))
+    assert literal["loops"]
+    # The block body costs 5, the loop node, the count and one pass of the body are 1 + 1 + 5
+    assert literal["cost"] == 7 + 5 * 2
+    assert unknown["cost"] == 7 + 5 * (molang.UNKNOWN_ITERATIONS - 1)
+
+
+def test_expressions_of_a_client_entity():
+    data = {
+        "minecraft:client_entity": {
+            "description": {
+                "scripts": {
+                    "variables": {"v.decl": "public"},
+                    "initialize": ["v.speed = 1;"],
+                    "pre_animation": ["v.walk = q.modified_distance_moved;"],
+                    "animate": ["walk", {"look": "q.has_target"}],
+                },
+                "render_controllers": [{"controller.render.cow": "q.is_baby"}],
+            }
+        }
+    }
+    base = "$.minecraft:client_entity.description"
+    assert molang.expressions("client_entity", data) == [
+        (f"{base}.scripts.initialize[0]", "v.speed = 1;", False),
+        (f"{base}.scripts.pre_animation[0]", "v.walk = q.modified_distance_moved;", True),
+        (f"{base}.scripts.animate[1].look", "q.has_target", True),
+        (f"{base}.render_controllers[0].controller.render.cow", "q.is_baby", True),
+    ]
+
+
+def test_expressions_skip_commands_and_events():
+    data = {"animation_controllers": {"c": {"states": {"s": {"on_entry": ["/say hi", "@s ns:event", "v.a = 1;"]}}}}}
+    assert molang.expressions("animation_controller", data) == [
+        ("$.animation_controllers.c.states.s.on_entry[2]", "v.a = 1;", False)
+    ]
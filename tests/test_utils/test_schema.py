@@ -0,0 +1,109 @@
+import marshal
+import os
+import sys
+
+import pytest
+
+from minecorg.utils import schema
+
+SCHEMA = {
+    "definitions": {"vector": {"type": "array", "items": {"type": "number"}, "minItems": 3, "maxItems": 3}},
+    "type": "object",
+    "required": ["name"],
+    "properties": {
+        "name": {"type": "string", "pattern": "^[a-z_]+:[a-z_]+$"},
+        "size": {"type": "integer", "minimum": 1, "maximum": 64},
+        "kind": {"enum": ["mob", "item"]},
+        "pivot": {"$ref": "#/definitions/vector"},
+        "value": {"anyOf": [{"type": "string"}, {"type": "object", "required": ["id"]}]},
+    },
+    "patternProperties": {"^minecraft:": {"type": "object"}},
+    "additionalProperties": False,
+}
+
+
+def compiled(definition: dict):
+    namespace = {}
+    exec(compile(schema.compile_schema(definition), "<test>", "exec"), namespace)
+    return namespace["validate"]
+
+
+@pytest.fixture
+def isolated(tmp_path, monkeypatch):
+    monkeypatch.setattr(schema, "_validators", {})
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    return tmp_path
+
+
+def test_a_valid_document_has_no_errors():
+    document = {"name": "ns:cow", "size": 3, "kind": "mob", "pivot": [0, 1.5, 0], "minecraft:x": {}, "value": "a"}
+    assert compiled(SCHEMA)(document) == []
+
+
+@pytest.mark.parametrize(
+    "document, errors",
+    [
+        ([], [("$", "expected object")]),
+        ({}, [("$", "missing required key 'name'")]),
+        ({"name": "Cow"}, [("$.name", "does not match ^[a-z_]+:[a-z_]+$")]),
+        ({"name": "ns:cow", "size": 0}, [("$.size", "must be at least 1")]),
+        ({"name": "ns:cow", "size": True}, [("$.size", "expected integer")]),
+        ({"name": "ns:cow", "kind": "block"}, [("$.kind", "must be one of item, mob")]),
+        ({"name": "ns:cow", "pivot": [0, "1"]}, [("$.pivot", "must have at least 3 items"), ("$.pivot[1]", "expected number")]),
+        ({"name": "ns:cow", "value": {"x": 1}}, [("$.value", "does not match any of the allowed forms")]),
+        ({"name": "ns:cow", "minecraft:x": 1}, [("$.minecraft:x", "expected object")]),
+        ({"name": "ns:cow", "extra": 1}, [("$.extra", "is not allowed here")]),
+    ],
+)
+def test_errors_carry_the_json_path(document, errors):
+    assert compiled(SCHEMA)(document) == errors
+
+
+def test_keys_with_braces_are_reported_verbatim():
+    validate = compiled({"properties": {"a{b}": {"type": "string"}}})
+    assert validate({"a{b}": 1}) == [("$.a{b}", "expected string")]
+
+
+def test_bundled_behavior_entity(isolated):
+    validate = schema.get_validator("behavior_entity")
+    valid = {
+        "format_version": "1.21.50",
+        "minecraft:entity": {"description": {"identifier": "ns:cow"}, "components": {"minecraft:health": {"value": 10}}},
+    }
+    assert validate(valid) == []
+    invalid = {"minecraft:entity": {"description": {"identifier": "Cow"}, "components": {}}}
+    assert [path for path, _ in validate(invalid)] == ["$", "$.minecraft:entity.description.identifier"]
+
+
+def cached_files(root) -> list:
+    return sorted(path.name for path in (root / "cache" / "minecorg" / "validators").iterdir())
+
+
+def test_validators_are_cached_per_user_and_per_compiler_version(isolated, monkeypatch):
+    schema.get_validator("manifest")
+    first = cached_files(isolated)
+    assert len(first) == 1 and first[0].endswith(f".{sys.implementation.cache_tag}.marshal")
+
+    monkeypatch.setattr(schema, "_validators", {})
+    monkeypatch.setattr(schema, "COMPILER_VERSION", schema.COMPILER_VERSION + 1)
+    schema.get_validator("manifest")
+    assert len(cached_files(isolated)) == 2
+
+
+def test_results_are_dropped_when_the_compiler_changes(monkeypatch):
+    before = schema.schemas_digest()
+    monkeypatch.setattr(schema, "COMPILER_VERSION", schema.COMPILER_VERSION + 1)
+    assert schema.schemas_digest() != before
+
+
+@pytest.mark.skipif(os.name == "nt", reason="file modes are not checked on Windows")
+def test_a_cache_file_others_can_write_is_not_executed(isolated, monkeypatch):
+    schema.get_validator("manifest")
+    cache_path = isolated / "cache" / "minecorg" / "validators" / cached_files(isolated)[0]
+    planted = compile("def validate(value):\n    return [('$', 'planted')]\n", "<planted>", "exec")
+    cache_path.write_bytes(marshal.dumps(planted))
+    os.chmod(cache_path, 0o666)
+
+    monkeypatch.setattr(schema, "_validators", {})
+    assert schema.get_validator("manifest")({}) != [("$", "planted")]
+    assert cache_path.stat().st_mode & 0o777 == 0o600
@@ -0,0 +1,58 @@
+import os
+
+from minecorg.utils import snapshot
+from minecorg.utils import transaction
+
+
+def write(root, relative, text):
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+    return path
+
+
+def test_record_copies_the_live_files(tmp_path):
+    path = write(tmp_path, "bp/entities/cow.json", "cow")
+    taken = snapshot.Snapshot(tmp_path, "edit cow")
+    taken.record("bp/entities/cow.json", "bp/entities/new.json")
+    taken.save()
+
+    stored = snapshot.object_path(tmp_path, taken.files["bp/entities/cow.json"])
+    assert taken.files["bp/entities/new.json"] is None
+    assert os.stat(path).st_nlink == 1
+    # Editing the project in place leaves the snapshot alone
+    path.write_text("edited")
+    assert stored.read_text() == "cow"
+
+
+def test_a_committed_delete_is_linked_and_restored(tmp_path):
+    write(tmp_path, "bp/entities/cow.json", "cow")
+    taken = snapshot.Snapshot(tmp_path, "remove cow")
+
+    def keep(moved):
+        taken.record_deleted(moved)
+        taken.save()
+
+    transaction.DeleteTransaction(tmp_path, ["bp/entities/cow.json"]).run(committed=keep)
+    stored = snapshot.object_path(tmp_path, taken.files["bp/entities/cow.json"])
+    # The moved file was purged, the object holds the only link left
+    assert os.stat(stored).st_nlink == 1
+
+    restored, _ = snapshot.restore(tmp_path, snapshot.load_snapshot(tmp_path, taken.id))
+    assert restored == ["bp/entities/cow.json"]
+    assert (tmp_path / "bp/entities/cow.json").read_text() == "cow"
+    assert os.stat(tmp_path / "bp/entities/cow.json").st_nlink == 1
+
+
+def test_a_failed_delete_leaves_no_link_and_no_snapshot(tmp_path):
+    path = write(tmp_path, "bp/entities/cow.json", "cow")
+    taken = snapshot.Snapshot(tmp_path, "remove cow")
+    try:
+        transaction.DeleteTransaction(tmp_path, ["bp/entities/cow.json", "missing.json"]).run(
+            committed=taken.record_deleted
+        )
+    except OSError:
+        pass
+    assert path.read_text() == "cow"
+    assert os.stat(path).st_nlink == 1
+    assert snapshot.list_snapshots(tmp_path) == []
@@ -0,0 +1,127 @@
+import json
+import shutil
+
+import pytest
+
+from minecorg.utils import json_handler
+from minecorg.utils import texture_registry
+
+HAND_WRITTEN = """{
+  // Item atlas, the sync only touches entries in its own form
+  "resource_pack_name": "mod",
+  "texture_name": "atlas.items",
+  "texture_data": {
+    "ruby": {
+      "textures": "textures/items/ruby" // the gem
+    },
+    /* a vanilla texture, not in this pack */
+    "vanilla_stick": { "textures": "textures/items/stick" }
+  }
+}
+"""
+
+REGISTRY = "resource_packs/mod/textures/item_texture.json"
+
+
+def texture(root, name):
+    path = root / "resource_packs/mod/textures/items" / f"{name}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(b"png")
+    return path
+
+
+def test_a_hand_formatted_registry_round_trips(tmp_path):
+    texture(tmp_path, "ruby")
+    registry = tmp_path / REGISTRY
+    registry.write_text(HAND_WRITTEN)
+
+    pear = texture(tmp_path, "pear")
+    changes = texture_registry.sync_registries(tmp_path)
+    assert changes == [{"registry": REGISTRY, "added": ["pear"], "removed": []}]
+    assert registry.read_text() == HAND_WRITTEN.replace(
+        '"textures/items/stick" }\n',
+        '"textures/items/stick" },\n    "pear": { "textures": "textures/items/pear" }\n',
+    ).replace('{ "textures": "textures/items/pear" }', '{"textures": "textures/items/pear"}')
+
+    pear.unlink()
+    changes = texture_registry.sync_registries(tmp_path)
+    assert changes == [{"registry": REGISTRY, "added": [], "removed": ["pear"]}]
+    assert registry.read_text() == HAND_WRITTEN
+
+
+def test_hand_written_entries_are_never_removed(tmp_path):
+    ruby = texture(tmp_path, "ruby")
+    (tmp_path / REGISTRY).write_text(
+        HAND_WRITTEN.replace(
+            '"vanilla_stick"',
+            '"gem": { "textures": "textures/items/ruby" },\n'
+            '    "ruby_glint": { "textures": "textures/items/ruby", "overlay_color": "#ff0000" },\n'
+            '    "ruby_frames": { "textures": ["textures/items/ruby"] },\n'
+            '    "vanilla_stick"',
+        )
+    )
+    ruby.unlink()
+    texture(tmp_path, "other")
+
+    changes = texture_registry.sync_registries(tmp_path)
+    assert changes == [{"registry": REGISTRY, "added": ["other"], "removed": ["ruby"]}]
+    data = json_handler.loads_lenient((tmp_path / REGISTRY).read_text())
+    assert set(data["texture_data"]) == {"gem", "ruby_glint", "ruby_frames", "vanilla_stick", "other"}
+
+
+def test_a_fresh_clone_prunes_removed_textures(tmp_path):
+    texture(tmp_path, "ruby")
+    pear = texture(tmp_path, "tools/pear")
+    texture(tmp_path, "pear")
+    texture_registry.sync_registries(tmp_path)
+    registry = tmp_path / REGISTRY
+    assert set(json.loads(registry.read_text())["texture_data"]) == {"ruby", "pear", "tools_pear"}
+
+    # Nothing is known locally about who added the entries
+    shutil.rmtree(tmp_path / ".minecorg")
+    pear.unlink()
+    changes = texture_registry.sync_registries(tmp_path)
+    assert changes == [{"registry": REGISTRY, "added": [], "removed": ["tools_pear"]}]
+
+
+@pytest.mark.parametrize("texture_data", ["[]", "null", '"ruby"'])
+def test_texture_data_must_be_an_object(tmp_path, texture_data):
+    texture(tmp_path, "ruby")
+    (tmp_path / REGISTRY).write_text(f'{{"texture_data": {texture_data}}}')
+    with pytest.raises(ValueError, match="'texture_data' must be an object"):
+        texture_registry.sync_registries(tmp_path)
+
+
+def test_a_missing_registry_is_created(tmp_path):
+    texture(tmp_path, "ruby")
+    texture_registry.sync_registries(tmp_path)
+    assert json.loads((tmp_path / REGISTRY).read_text()) == {
+        "resource_pack_name": "mod",
+        "texture_name": "atlas.items",
+        "texture_data": {"ruby": {"textures": "textures/items/ruby"}},
+    }
+
+
+def test_edit_a_one_line_registry():
+    text = '{"texture_data": {"a": {"textures": "x"}, "b": {"textures": "y"}}}'
+    edited = texture_registry.edit_registry(text, ["a"], {"c": {"textures": "z"}})
+    assert edited == '{"texture_data": {"b": {"textures": "y"}, "c": {"textures": "z"}}}'
+
+
+def test_edit_an_empty_texture_data():
+    text = '{\n    "texture_data": {}\n}\n'
+    edited = texture_registry.edit_registry(text, [], {"c": {"textures": "z"}})
+    assert edited == '{\n    "texture_data": {\n        "c": {"textures": "z"}\n    }\n}\n'
+
+
+def test_edit_removes_the_comments_above_an_entry():
+    text = '{"texture_data": {\n  "a": 1,\n  // about b\n  "b": 2,\n  "c": 3\n}}'
+    assert texture_registry.edit_registry(text, ["b"], {}) == '{"texture_data": {\n  "a": 1,\n  "c": 3\n}}'
+    assert texture_registry.edit_registry(text, ["a"], {}) == '{"texture_data": {\n  // about b\n  "b": 2,\n  "c": 3\n}}'
+    assert texture_registry.edit_registry(text, ["c"], {}) == '{"texture_data": {\n  "a": 1,\n  // about b\n  "b": 2\n}}'
+
+
+def test_edit_adds_texture_data_when_missing():
+    text = '{\n  "resource_pack_name": "x"\n}'
+    edited = texture_registry.edit_registry(text, [], {"c": {"textures": "z"}})
+    assert edited == '{\n  "resource_pack_name": "x",\n  "texture_data": {"c": {"textures": "z"}}\n}'
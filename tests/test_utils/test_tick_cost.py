@@ -0,0 +1,101 @@
+import json
+
+import pytest
+
+from minecorg.utils import tick_cost
+
+TABLE = {
+    "group_weight": 0.5,
+    "rules": [
+        {
+            "component": "minecraft:behavior.nearest_attackable_target",
+            "cost": 6,
+            "description": "scans for targets",
+            "scale": [{"field": "entity_types[*].max_dist", "per": 8, "cost": 2}],
+            "frequency": {"field": "scan_interval", "default": 10, "cost": 20},
+        },
+        {"component": "minecraft:behavior.*", "cost": 1},
+    ],
+}
+
+
+def entity(components=None, groups=None) -> dict:
+    return {
+        "minecraft:entity": {
+            "description": {"identifier": "ns:zombie"},
+            "components": components or {},
+            "component_groups": groups or {},
+        }
+    }
+
+
+def test_field_values_walk_lists_and_ranges():
+    data = {"entity_types": [{"max_dist": 16}, {"max_dist": [4, 48]}, {"max_dist": True}]}
+    assert tick_cost.field_values(data, "entity_types[*].max_dist") == [16, 4, 48]
+    assert tick_cost.field_values(data, "missing.field") == []
+
+
+def test_scale_and_frequency():
+    rule = TABLE["rules"][0]
+    body = {"entity_types": [{"max_dist": 16}, {"max_dist": 32}], "scan_interval": 5}
+    assert tick_cost.component_cost(rule, body) == 6 + 2 * 32 / 8 + 20 / 5
+    # Without a scan interval the rule default is used
+    assert tick_cost.component_cost(rule, {}) == 6 + 20 / 10
+
+
+def test_the_first_matching_rule_wins():
+    assert tick_cost.match_rule(TABLE["rules"], "minecraft:behavior.nearest_attackable_target")["cost"] == 6
+    assert tick_cost.match_rule(TABLE["rules"], "minecraft:behavior.float")["cost"] == 1
+    assert tick_cost.match_rule(TABLE["rules"], "minecraft:health") is None
+
+
+def test_entity_score_adds_the_dearest_group_weighted():
+    data = entity(
+        {"minecraft:behavior.float": {}, "minecraft:health": {}},
+        {"ns:a": {"minecraft:behavior.float": {}}, "ns:b": {"minecraft:behavior.nearest_attackable_target": {}}},
+    )
+    result = tick_cost.entity_cost(data, TABLE)
+    assert result["identifier"] == "ns:zombie"
+    assert result["score"] == 1 + (6 + 2) * 0.5
+    assert [item["component"] for item in result["components"]][0] == "minecraft:behavior.nearest_attackable_target"
+
+
+@pytest.mark.parametrize(
+    "data, message",
+    [
+        ({"minecraft:entity": []}, "'minecraft:entity' must be an object"),
+        ({"minecraft:entity": {"components": ["x"]}}, "the components of the entity must be an object"),
+        ({"minecraft:entity": {"component_groups": []}}, "'component_groups' must be an object"),
+        ({"minecraft:entity": {"component_groups": {"ns:a": 1}}}, "the components of ns:a must be an object"),
+    ],
+)
+def test_malformed_entities_are_file_errors(tmp_path, data, message):
+    path = tmp_path / "zombie.json"
+    path.write_text(json.dumps(data))
+    result = tick_cost.score_entity_file(str(path), TABLE)
+    assert result["error"] == message and result["score"] == 0
+
+
+def test_the_bundled_table_is_valid():
+    assert tick_cost.rules_problem(tick_cost.load_rules()) is None
+
+
+@pytest.mark.parametrize(
+    "table, problem",
+    [
+        ([], "there is no 'rules' list"),
+        ({"rules": [], "group_weight": "1"}, "'group_weight' must be a number"),
+        ({"rules": ["x"]}, "rules[0] must be an object"),
+        ({"rules": [{"cost": 1}]}, "rules[0] needs a 'component' pattern"),
+        ({"rules": [{"component": "*", "cost": "2"}]}, "rules[0].cost must be a number"),
+        ({"rules": [{"component": "*", "scale": [{"per": 8}]}]}, "rules[0].scale[0] needs a 'field' path"),
+        ({"rules": [{"component": "*", "scale": [{"field": "a", "per": 0}]}]}, "rules[0].scale[0].per can not be 0"),
+        ({"rules": [{"component": "*", "frequency": {"field": "a", "default": None}}]}, "rules[0].frequency.default must be a number"),
+    ],
+)
+def test_invalid_rule_tables_are_refused_when_loaded(tmp_path, table, problem):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(table))
+    with pytest.raises(ValueError) as error:
+        tick_cost.load_rules(path)
+    assert str(error.value) == f"{path}: {problem}"
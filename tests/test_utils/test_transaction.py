@@ -0,0 +1,93 @@
+import json
+
+import pytest
+
+from minecorg.utils import transaction
+
+PATHS = ["bp/entities/cow.json", "rp/entity/cow.entity.json", "rp/textures/cow.png"]
+
+
+@pytest.fixture
+def project(tmp_path):
+    for relative in PATHS:
+        path = tmp_path / relative
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(relative)
+    return tmp_path
+
+
+def test_run_deletes_every_file(project):
+    transaction.DeleteTransaction(project, PATHS).run()
+    assert not any((project / path).exists() for path in PATHS)
+    assert transaction.recover(project) == []
+
+
+def test_failed_move_restores_the_moved_files(project):
+    with pytest.raises(OSError):
+        transaction.DeleteTransaction(project, PATHS + ["bp/entities/missing.json"]).run()
+    assert all((project / path).read_text() == path for path in PATHS)
+    assert transaction.recover(project) == []
+
+
+def test_recover_rolls_back_a_pending_transaction(project):
+    # A crash after the journal and the first move, before the commit
+    pending = transaction.DeleteTransaction(project, PATHS)
+    pending._write_journal("pending")
+    pending._move_out(PATHS[0])
+
+    results = transaction.recover(project)
+
+    assert results == [(pending.id, "rolled back", [PATHS[0]])]
+    assert all((project / path).read_text() == path for path in PATHS)
+    assert not pending.folder.exists()
+
+
+def test_recover_purges_a_committed_transaction(project):
+    # A crash after the commit, before the folder was purged
+    committed = transaction.DeleteTransaction(project, PATHS)
+    committed._write_journal("pending")
+    for path in PATHS:
+        committed._move_out(path)
+    committed._write_journal("committed")
+
+    assert transaction.recover(project) == [(committed.id, "purged", [])]
+    assert not any((project / path).exists() for path in PATHS)
+    assert not committed.folder.exists()
+
+
+def test_unreadable_journal_counts_as_pending(project):
+    pending = transaction.DeleteTransaction(project, PATHS)
+    pending._move_out(PATHS[1])
+    (pending.folder / transaction.JOURNAL_FILE).write_text("{cut sh")
+
+    assert transaction.recover(project)[0][1] == "rolled back"
+    assert (project / PATHS[1]).exists()
+
+
+def test_transactions_of_one_process_get_distinct_ids(project):
+    ids = {transaction.DeleteTransaction(project, []).id for _ in range(200)}
+    assert len(ids) == 200
+
+
+def test_journal_lists_the_paths(project):
+    pending = transaction.DeleteTransaction(project, PATHS, label="remove entity cow")
+    pending._write_journal("pending")
+    journal = json.loads((pending.folder / transaction.JOURNAL_FILE).read_text())
+    assert journal == {"label": "remove entity cow", "status": "pending", "paths": PATHS}
+
+
+def test_committed_gets_the_moved_files_before_the_purge(project):
+    seen = {}
+
+    def committed(moved):
+        seen.update({path: moved_path.read_text() for path, moved_path in moved.items()})
+
+    transaction.DeleteTransaction(project, PATHS).run(committed=committed)
+    assert seen == {path: path for path in PATHS}
+
+
+def test_committed_is_not_called_when_the_delete_fails(project):
+    calls = []
+    with pytest.raises(OSError):
+        transaction.DeleteTransaction(project, PATHS + ["missing.json"]).run(committed=calls.append)
+    assert calls == []